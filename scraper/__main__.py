@@ -0,0 +1,42 @@
+import argparse
+import importlib
+import sys
+
+
+# subcomando -> (módulo com main(argv), argumentos fixos, ajuda); cada módulo
+# só é importado quando escolhido, e o Playwright só quando um modo com
+# navegador começa a rodar
+COMANDOS = {
+    "scrape": ("scripts.run_scraper", [], "produto, lote, links ou modo incremental (ver --help)"),
+    "crawl": ("scripts.run_scraper", ["--crawl"], "crawl completo da loja com frontier retomável"),
+    "fleet": ("scripts.run_fleet", [], "frota de workers numa fila compartilhada"),
+    "export": ("scripts.exportar", [], "converte resultados entre .csv, .jsonl, .db e .parquet"),
+    "normalize": ("scripts.normalizar_precos", [], "normaliza os preços de um CSV de produtos"),
+    "history": ("scripts.historico_precos", [], "histórico de preços: importar, ultimo, faixa, quedas"),
+    "bench": ("scripts.benchmark", [], "benchmark offline contra a loja fake (inclui tempo de import)"),
+}
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m scraper",
+        description="Scraper de produtos (Shopee, Mercado Livre)",
+        epilog="\n".join(f"  {nome:<10} {ajuda}" for nome, (_, _, ajuda) in COMANDOS.items())
+               + "\n\n'python -m scraper <comando> --help' mostra as opções de cada comando",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("comando", choices=COMANDOS, metavar="comando",
+                        help="um dos comandos abaixo")
+    parser.add_argument("argumentos", nargs=argparse.REMAINDER,
+                        help="opções repassadas ao comando")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    modulo, fixos, _ = COMANDOS[args.comando]
+    if argv is None:
+        # o argparse do comando usa sys.argv[0] no "usage:" das mensagens
+        sys.argv[0] = f"python -m scraper {args.comando}"
+    return importlib.import_module(modulo).main(fixos + args.argumentos)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,335 @@
+import asyncio
+import random
+import time
+from typing import Dict, List, Optional
+
+from scraper.marketplaces import Marketplace, marketplace_do_link
+from scraper.shopee_scraper import _HREFS_JS, dedupe_links, salvar_csv
+from scraper.site_shopee import Shopee
+from scraper.extraction import (
+    NOME_NAO_ENCONTRADO,
+    PRECO_NAO_ENCONTRADO,
+    extrair_em_uma_passada_async,
+)
+from scraper.metricas import METRICAS, contar_bytes_resposta
+from scraper.movimento import MODO_PADRAO, mover_mouse_async, rolar_async
+from scraper.screenshots import ScreenshotManager
+
+
+async def human_pause(min_s: float = 0.3, max_s: float = 1.2) -> None:
+    """
+    Versão assíncrona de human_pause: cede o event loop em vez de bloquear o processo.
+    """
+    duracao = random.uniform(min_s, max_s)
+    await asyncio.sleep(duracao)
+    METRICAS.observar("humano_pausa", duracao)
+
+
+async def human_move_mouse(page, start: tuple, end: tuple, steps: int = 20, modo: str = MODO_PADRAO) -> None:
+    """
+    Versão assíncrona de human_move_mouse (mesma curva ease-in-out e jitter).
+
+    Args:
+        page: Objeto page do Playwright (API assíncrona)
+        start: Tupla (x, y) com coordenadas iniciais
+        end: Tupla (x, y) com coordenadas finais
+        steps: Número de passos intermediários
+        modo: passo, agrupado ou pagina (ver scraper.movimento)
+
+    Os comandos saem em pipeline: cada um parte no seu horário sem esperar
+    a resposta do anterior.
+    """
+    inicio = time.perf_counter()
+    await mover_mouse_async(page, start, end, steps, modo)
+    METRICAS.observar("humano_mouse", time.perf_counter() - inicio)
+
+
+async def human_scroll(page, distance: int = 500, modo: str = MODO_PADRAO) -> None:
+    """
+    Versão assíncrona de human_scroll (passos de 50-200px com pausas de 50-250ms).
+
+    Args:
+        page: Objeto page do Playwright (API assíncrona)
+        distance: Distância total em pixels (positivo = para baixo, negativo = para cima)
+        modo: passo, agrupado ou pagina (ver scraper.movimento)
+    """
+    inicio = time.perf_counter()
+    await rolar_async(page, distance, modo)
+    METRICAS.observar("humano_scroll", time.perf_counter() - inicio)
+
+
+class AsyncShopeeScraper:
+    """
+    Motor assíncrono: várias páginas trabalhando em paralelo sobre uma fila de URLs.
+
+    Cada worker tem seu próprio contexto/página e mantém o ritmo humano
+    (pausas, scroll, mouse), mas as esperas cedem o event loop, então o
+    processo como um todo atende `concorrencia` páginas ao mesmo tempo.
+    Como no ShopeeScraper, o que é do site vem do adaptador Marketplace
+    registrado para o domínio de cada URL.
+    """
+
+    def __init__(self, concorrencia: int = 4, ritmo: float = 1.0, salvar: bool = True,
+                 marketplace: Optional[Marketplace] = None):
+        """Inicializa o scraper assíncrono
+
+        Args:
+            concorrencia: Número máximo de páginas trabalhando ao mesmo tempo
+            ritmo: Multiplicador das pausas humanas (1.0 = mesmo ritmo do scraper síncrono)
+            salvar: Se True, grava cada resultado (no sink, ou em produtos.csv sem sink)
+            marketplace: Adaptador padrão (contexto do navegador e URLs sem adaptador); padrão Shopee
+        """
+        self.marketplace = marketplace if marketplace is not None else Shopee()
+        self.proxy = None
+        self.concorrencia = max(1, concorrencia)
+        self.ritmo = ritmo
+        self.movimento = MODO_PADRAO  # passo, agrupado ou pagina (scraper.movimento)
+        self.salvar = salvar
+        self.sink = None
+        self.screenshots = ScreenshotManager()
+        self.interceptor = None  # RequestInterceptor opcional (estatísticas somadas entre workers)
+        self.captura = None  # CapturaApi opcional, compartilhada pelas páginas (itens por itemid, último item por página)
+
+    def _site(self, url: str) -> Marketplace:
+        """Adaptador de url: o padrão se ele atende o domínio, senão o do registro."""
+        if self.marketplace.atende(url):
+            return self.marketplace
+        return marketplace_do_link(url) or self.marketplace
+
+    async def _pausa(self, min_s: float, max_s: float) -> None:
+        """Pausa humana escalada pelo ritmo configurado."""
+        await human_pause(min_s * self.ritmo, max_s * self.ritmo)
+
+    async def _abrir_navegador(self, p):
+        """Lança o Firefox em modo headless, usando o proxy se configurado."""
+        with METRICAS.etapa("launch"):
+            if self.proxy:
+                return await p.firefox.launch(headless=True, slow_mo=50, proxy=self.proxy)
+            return await p.firefox.launch(headless=True, slow_mo=50)
+
+    async def _nova_pagina(self, browser):
+        """
+        Cria o contexto do marketplace padrão (locale, fuso, script anti-detecção) e abre uma página nova.
+
+        Returns:
+            Tupla (context, page)
+        """
+        with METRICAS.etapa("contexto"):
+            context = await browser.new_context(**self.marketplace.context_args)
+        context.on("response", contar_bytes_resposta)
+        if self.marketplace.init_script:
+            await context.add_init_script(self.marketplace.init_script)
+        if self.interceptor is not None:
+            await self.interceptor.instalar_async(context)
+        page = await context.new_page()
+        if self.marketplace.extra_headers:
+            await page.set_extra_http_headers(self.marketplace.extra_headers)
+        if self.captura is not None:
+            self.captura.instalar_async(page)
+        return context, page
+
+    async def _coletar_links(self, page, url: str) -> List[str]:
+        """
+        Abre a loja e coleta os links de produtos da listagem, sem repetições.
+
+        Args:
+            page: Objeto page do Playwright (API assíncrona)
+            url: URL da loja
+
+        Returns:
+            Lista de URLs absolutas de produtos
+        """
+        print(f"---> Acessando loja: {url}")
+        with METRICAS.etapa("goto", pagina="loja"):
+            await page.goto(url, timeout=60000, wait_until="domcontentloaded")
+        await self._pausa(3, 6)
+        await human_scroll(page, distance=random.randint(300, 800), modo=self.movimento)
+        await self._pausa(1, 2)
+
+        for selector in self._site(url).listing_selectors:
+            try:
+                hrefs = await page.eval_on_selector_all(selector, _HREFS_JS)
+            except Exception:
+                continue
+            hrefs = [h for h in hrefs if h]
+            if hrefs:
+                print(f"Encontrados {len(hrefs)} produtos com seletor: {selector}")
+                return dedupe_links(hrefs, base_url=page.url)
+        return []
+
+    async def _extrair_dados(self, page) -> Dict[str, str]:
+        """
+        Na página do produto: rola, captura screenshot e extrai nome, preço e link.
+
+        Args:
+            page: Objeto page do Playwright já na página do produto
+
+        Returns:
+            Dicionário com as chaves nome, preco e link
+        """
+        site = self._site(page.url)
+        await human_scroll(page, distance=random.randint(200, 500), modo=self.movimento)
+        await self._pausa(1, 2)
+
+        await self.screenshots.capturar_async(page, site.elemento_produto_selectors)
+
+        try:
+            with METRICAS.etapa("nome_preco"):
+                dados = await extrair_em_uma_passada_async(page, site.nome_selectors, site.preco_selectors)
+        except Exception as e:
+            print(f"Erro na extração: {e}")
+            dados = {}
+        nome = dados.get("nome") or NOME_NAO_ENCONTRADO
+        preco = dados.get("preco") or PRECO_NAO_ENCONTRADO
+
+        return {"nome": nome, "preco": preco, "link": page.url}
+
+    async def _dados_da_api(self, page, url: str) -> Optional[Dict[str, object]]:
+        """
+        Devolve o produto assim que o payload XHR chega (None sem captura, site sem XHR conhecido ou se não chegou).
+
+        Args:
+            page: Página do produto com a captura instalada
+            url: URL do produto (define o itemid esperado)
+        """
+        site = self._site(url)
+        if self.captura is None or not site.captura_xhr:
+            return None
+        dados = await self.captura.aguardar_async(page, url)
+        if dados is None:
+            return None
+        await self.screenshots.capturar_async(page, site.elemento_produto_selectors)
+        dados["link"] = page.url
+        return dados
+
+    async def _worker(self, n: int, page, fila: asyncio.Queue, resultados: List[Dict[str, str]]) -> None:
+        """
+        Consome URLs da fila compartilhada até ser cancelado.
+
+        Args:
+            n: Índice do worker
+            page: Página exclusiva deste worker
+            fila: Fila compartilhada de URLs
+            resultados: Lista onde cada resultado é acrescentado
+        """
+        while True:
+            url = await fila.get()
+            try:
+                print(f"---> [w{n}] {url}")
+                with METRICAS.etapa("goto", pagina="produto"):
+                    await page.goto(url, timeout=60000, wait_until="domcontentloaded")
+                dados = await self._dados_da_api(page, url)
+                if dados is None:
+                    await self._pausa(3, 5)
+                    dados = await self._extrair_dados(page)
+                resultados.append(dados)
+                if self.salvar:
+                    with METRICAS.etapa("gravacao"):
+                        if self.sink is not None:
+                            self.sink.escrever(dados)
+                        else:
+                            salvar_csv(dados)
+                print(f"[w{n}] {dados['nome']} | {dados['preco']}")
+            except Exception as e:
+                print(f"[w{n}] Erro ao processar {url}: {e}")
+            finally:
+                fila.task_done()
+
+    async def _processar_fila(self, paginas: list, urls: List[str]) -> List[Dict[str, str]]:
+        """
+        Distribui as URLs entre as páginas e espera a fila esvaziar.
+
+        Args:
+            paginas: Uma página por worker (o tamanho da lista é o limite de concorrência)
+            urls: URLs de produtos a visitar
+
+        Returns:
+            Lista de resultados na ordem em que ficaram prontos
+        """
+        fila = asyncio.Queue()
+        for url in urls:
+            fila.put_nowait(url)
+
+        resultados = []
+        workers = [
+            asyncio.create_task(self._worker(n, page, fila, resultados))
+            for n, page in enumerate(paginas)
+        ]
+        try:
+            await fila.join()
+        finally:
+            for w in workers:
+                w.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        return resultados
+
+    async def scrape_urls(self, urls: List[str]) -> List[Dict[str, str]]:
+        """
+        Visita uma lista de URLs de produto com até `concorrencia` páginas em paralelo.
+
+        Args:
+            urls: URLs de produtos
+
+        Returns:
+            Lista de dicionários (nome, preco, link)
+        """
+        from playwright.async_api import async_playwright
+
+        urls = dedupe_links(urls)
+        if not urls:
+            return []
+        async with async_playwright() as p:
+            browser = await self._abrir_navegador(p)
+            try:
+                paginas = []
+                for _ in range(min(self.concorrencia, len(urls))):
+                    _, page = await self._nova_pagina(browser)
+                    paginas.append(page)
+                return await self._processar_fila(paginas, urls)
+            finally:
+                await browser.close()
+                if self.sink is not None:
+                    self.sink.flush()
+                if self.interceptor is not None:
+                    self.interceptor.imprimir_relatorio()
+                if self.captura is not None:
+                    self.captura.imprimir_relatorio()
+
+    async def scrape_loja(self, url: str = "https://shopee.com.ar/topick_global_ar.ar", limit: Optional[int] = None) -> List[Dict[str, str]]:
+        """
+        Coleta os links da loja e visita os produtos em paralelo.
+
+        Args:
+            url: URL da loja
+            limit: Número máximo de produtos (None = todos)
+
+        Returns:
+            Lista de dicionários (nome, preco, link)
+        """
+        from playwright.async_api import async_playwright
+
+        async with async_playwright() as p:
+            browser = await self._abrir_navegador(p)
+            try:
+                context, page = await self._nova_pagina(browser)
+                links = await self._coletar_links(page, url)
+                if not links:
+                    print("Nenhum produto encontrado! Verifique os seletores.")
+                    return []
+                if limit is not None:
+                    links = links[:limit]
+
+                paginas = [page]
+                for _ in range(min(self.concorrencia, len(links)) - 1):
+                    _, extra = await self._nova_pagina(browser)
+                    paginas.append(extra)
+                print(f"---> Visitando {len(links)} produtos com {len(paginas)} páginas em paralelo...")
+                return await self._processar_fila(paginas, links)
+            finally:
+                await browser.close()
+                if self.sink is not None:
+                    self.sink.flush()
+                if self.interceptor is not None:
+                    self.interceptor.imprimir_relatorio()
+                if self.captura is not None:
+                    self.captura.imprimir_relatorio()
@@ -0,0 +1,432 @@
+import os
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+from scraper.metricas import METRICAS, contar_bytes_resposta
+from scraper.sessoes import SEM_PROXY
+
+
+def _descendentes(raiz: int) -> List[int]:
+    """PIDs de todos os processos descendentes de raiz (lidos de /proc/<pid>/stat)."""
+    # mapa pai -> filhos a partir de /proc/<pid>/stat
+    filhos: Dict[int, List[int]] = {}
+    for nome in os.listdir("/proc"):
+        if not nome.isdigit():
+            continue
+        try:
+            with open(f"/proc/{nome}/stat") as f:
+                stat = f.read()
+            # o campo comm pode conter espaços, então parte-se do último ')'
+            ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        filhos.setdefault(ppid, []).append(int(nome))
+
+    descendentes = []
+    pendentes = list(filhos.get(raiz, []))
+    while pendentes:
+        atual = pendentes.pop()
+        descendentes.append(atual)
+        pendentes.extend(filhos.get(atual, []))
+    return descendentes
+
+
+def rss_descendentes_mb(pid: Optional[int] = None) -> float:
+    """
+    Soma a memória residente (RSS) de todos os processos descendentes de `pid`.
+
+    Args:
+        pid: Processo raiz (padrão: o processo atual)
+
+    Returns:
+        RSS total em MB dos processos filhos (driver do Playwright e navegadores).
+        Retorna 0.0 fora do Linux, onde /proc não existe.
+
+    O Playwright não expõe o PID do navegador, então mede-se a árvore
+    inteira de processos criados pelo worker.
+    """
+    if not os.path.isdir("/proc"):
+        return 0.0
+    pagina_kb = os.sysconf("SC_PAGE_SIZE") / 1024
+    total_kb = 0.0
+    for atual in _descendentes(pid or os.getpid()):
+        try:
+            with open(f"/proc/{atual}/statm") as f:
+                total_kb += int(f.read().split()[1]) * pagina_kb
+        except (OSError, IndexError, ValueError):
+            continue
+    return total_kb / 1024
+
+
+def cpu_descendentes_s(pid: Optional[int] = None) -> float:
+    """
+    Tempo de CPU (usuário + sistema) já consumido pelos processos descendentes de `pid`.
+
+    Returns:
+        Segundos de CPU dos filhos ainda vivos (0.0 fora do Linux)
+    """
+    if not os.path.isdir("/proc"):
+        return 0.0
+    ticks = 0
+    for atual in _descendentes(pid or os.getpid()):
+        try:
+            with open(f"/proc/{atual}/stat") as f:
+                campos = f.read().rsplit(")", 1)[1].split()
+            # utime e stime: campos 14 e 15 do stat (11 e 12 depois do comm)
+            ticks += int(campos[11]) + int(campos[12])
+        except (OSError, IndexError, ValueError):
+            continue
+    return ticks / os.sysconf("SC_CLK_TCK")
+
+
+class _Slot:
+    """Um navegador aquecido com seu contexto reutilizável."""
+
+    def __init__(self, browser, context, proxy=None):
+        self.browser = browser
+        self.context = context
+        self.proxy = proxy
+        self.paginas = 0
+        self.em_uso = False
+        self.bloqueado = False
+
+
+class BrowserPool:
+    """
+    Pool de navegadores Firefox aquecidos com contextos reutilizáveis.
+
+    Cada slot mantém um navegador e um contexto já configurado (locale,
+    script anti-detecção e cabeçalhos HTTP). O custo de iniciar o Firefox
+    é pago uma vez por worker; cada produto faz apenas checkout de um
+    contexto, abre uma página e devolve o contexto ao pool.
+
+    Um slot é reciclado (navegador fechado e relançado) quando atinge
+    `max_paginas` páginas, quando a árvore de processos passa de
+    `max_rss_mb` por navegador, ou quando falha no health check.
+
+    Com um PoolProxies, cada contexto sai por um proxy sorteado do pool;
+    quando o proxy do slot entra em resfriamento, o contexto é trocado
+    por outro (com outro proxy) na devolução, sem relançar o navegador.
+
+    Com um ArmazemSessoes, cada contexto nasce com a sessão salva da sua
+    identidade (o proxy) e a devolve ao armazém periodicamente; um
+    contexto bloqueado descarta a sessão e é trocado por um limpo.
+    """
+
+    def __init__(
+        self,
+        tamanho: int = 1,
+        proxy: Optional[Dict[str, str]] = None,
+        max_paginas: int = 50,
+        max_rss_mb: float = 1024,
+        headless: bool = True,
+        slow_mo: int = 50,
+        context_args: Optional[dict] = None,
+        init_script: Optional[str] = None,
+        extra_headers: Optional[Dict[str, str]] = None,
+        interceptor=None,
+        proxies=None,
+        sessoes=None,
+    ):
+        """Inicializa o pool (os navegadores só são lançados em iniciar())
+
+        Args:
+            tamanho: Número de navegadores mantidos aquecidos
+            proxy: Proxy repassado para firefox.launch
+            max_paginas: Recicla o navegador depois de K páginas
+            max_rss_mb: Recicla quando o RSS dos navegadores passa de M MB por navegador
+            headless: Rodar sem interface gráfica
+            slow_mo: Atraso (ms) aplicado pelo Playwright a cada operação
+            context_args: Argumentos de browser.new_context
+            init_script: Script instalado em todo contexto (anti-detecção)
+            extra_headers: Cabeçalhos HTTP aplicados ao contexto
+            interceptor: RequestInterceptor instalado em todo contexto (opcional)
+            proxies: PoolProxies que escolhe o proxy de cada contexto (opcional)
+            sessoes: ArmazemSessoes com o storage_state de cada identidade (opcional)
+        """
+        self.tamanho = max(1, tamanho)
+        self.proxy = proxy
+        self.max_paginas = max_paginas
+        self.max_rss_mb = max_rss_mb
+        self.headless = headless
+        self.slow_mo = slow_mo
+        self.context_args = context_args or {}
+        self.init_script = init_script
+        self.extra_headers = extra_headers
+        self.interceptor = interceptor
+        self.proxies = proxies
+        self.sessoes = sessoes
+        self._playwright_cm = None
+        self._p = None
+        self._slots: List[_Slot] = []
+
+    def __enter__(self):
+        self.iniciar()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.fechar()
+        return False
+
+    def iniciar(self, p=None) -> None:
+        """
+        Inicia o Playwright (se necessário) e lança todos os navegadores do pool.
+
+        Args:
+            p: Instância de sync_playwright() já aberta (opcional). Se None,
+               o próprio pool abre e fecha o Playwright.
+        """
+        if self._p is None:
+            if p is None:
+                # importado só aqui: modos sem navegador não pagam o import do Playwright
+                from playwright.sync_api import sync_playwright
+                self._playwright_cm = sync_playwright()
+                p = self._playwright_cm.__enter__()
+            self._p = p
+        while len(self._slots) < self.tamanho:
+            self._slots.append(self._novo_slot())
+        print(f"---> Pool com {len(self._slots)} navegador(es) aquecido(s)")
+
+    def _novo_slot(self) -> _Slot:
+        """Lança um navegador e cria o contexto configurado."""
+        launch_args = dict(headless=self.headless, slow_mo=self.slow_mo)
+        if self.proxy:
+            launch_args["proxy"] = self.proxy
+        with METRICAS.etapa("launch"):
+            browser = self._p.firefox.launch(**launch_args)
+        proxy = self.proxies.escolher() if self.proxies is not None else None
+        return _Slot(browser, self._novo_contexto(browser, proxy), proxy)
+
+    def _novo_contexto(self, browser, proxy=None):
+        """Cria contexto com o script anti-detecção e os cabeçalhos já instalados."""
+        context_args = dict(self.context_args)
+        if proxy is not None:
+            context_args["proxy"] = proxy.playwright
+        if self.sessoes is not None:
+            estado = self.sessoes.carregar(self._identidade(proxy))
+            if estado is not None:
+                context_args["storage_state"] = estado
+        with METRICAS.etapa("contexto"):
+            context = browser.new_context(**context_args)
+        context.on("response", contar_bytes_resposta)
+        if self.init_script:
+            context.add_init_script(self.init_script)
+        if self.extra_headers:
+            context.set_extra_http_headers(self.extra_headers)
+        if self.interceptor is not None:
+            self.interceptor.instalar(context)
+        return context
+
+    def _saudavel(self, slot: _Slot) -> bool:
+        """Health check: navegador conectado e contexto ainda utilizável."""
+        try:
+            if not slot.browser.is_connected():
+                return False
+            slot.context.pages
+            return True
+        except Exception:
+            return False
+
+    def _reciclar(self, slot: _Slot) -> None:
+        """Fecha o navegador do slot e lança outro no lugar."""
+        try:
+            slot.browser.close()
+        except Exception:
+            pass
+        novo = self._novo_slot()
+        slot.browser = novo.browser
+        slot.context = novo.context
+        slot.proxy = novo.proxy
+        slot.paginas = 0
+        slot.bloqueado = False
+
+    def _trocar_contexto(self, slot: _Slot) -> None:
+        """Troca o contexto do slot por um novo, com outro proxy se houver pool (o navegador continua)."""
+        try:
+            slot.context.close()
+        except Exception:
+            pass
+        if self.proxies is not None:
+            slot.proxy = self.proxies.escolher(evitar=slot.proxy)
+        slot.context = self._novo_contexto(slot.browser, slot.proxy)
+        slot.bloqueado = False
+
+    def _identidade(self, proxy) -> str:
+        """Chave da sessão de um contexto: o proxy dele (ou o do launch)."""
+        if proxy is not None:
+            return proxy.nome
+        if self.proxy:
+            return self.proxy["server"]
+        return SEM_PROXY
+
+    def _salvar_sessao(self, slot: _Slot, forcar: bool = False) -> None:
+        """Grava o storage_state do contexto se a sessão está para ser renovada."""
+        identidade = self._identidade(slot.proxy)
+        if not forcar and not self.sessoes.precisa_salvar(identidade):
+            return
+        try:
+            estado = slot.context.storage_state()
+        except Exception as e:
+            print(f"Não foi possível ler a sessão de {identidade}: {e}")
+            return
+        self.sessoes.salvar(identidade, estado)
+
+    def _precisa_reciclar(self, slot: _Slot) -> bool:
+        """Verifica limite de páginas e de memória."""
+        if self.max_paginas and slot.paginas >= self.max_paginas:
+            print(f"Reciclando navegador após {slot.paginas} páginas")
+            return True
+        if self.max_rss_mb:
+            rss = rss_descendentes_mb()
+            if rss > self.max_rss_mb * len(self._slots):
+                print(f"Reciclando navegador: RSS {rss:.0f} MB acima do limite")
+                return True
+        return False
+
+    def verificar_saude(self) -> int:
+        """
+        Roda o health check em todos os slots livres e recicla os quebrados.
+
+        Returns:
+            Número de slots reciclados
+        """
+        reciclados = 0
+        for slot in self._slots:
+            if not slot.em_uso and not self._saudavel(slot):
+                self._reciclar(slot)
+                reciclados += 1
+        return reciclados
+
+    def checkout(self):
+        """
+        Retira um contexto aquecido do pool.
+
+        Returns:
+            Contexto do Playwright pronto para new_page()
+
+        Raises:
+            RuntimeError: Se todos os contextos estão em uso
+        """
+        if self._p is None:
+            self.iniciar()
+        for slot in self._slots:
+            if slot.em_uso:
+                continue
+            if not self._saudavel(slot):
+                print("Navegador do pool não respondeu ao health check, relançando...")
+                self._reciclar(slot)
+            slot.em_uso = True
+            return slot.context
+        raise RuntimeError("Nenhum contexto livre no pool")
+
+    def devolver(self, context, paginas: int = 1, saudavel: bool = True) -> None:
+        """
+        Devolve o contexto ao pool, reciclando o navegador se necessário.
+
+        Args:
+            context: Contexto obtido em checkout()
+            paginas: Quantas páginas foram usadas durante o checkout
+            saudavel: False força a reciclagem (ex.: página travou ou foi bloqueada)
+        """
+        for slot in self._slots:
+            if slot.context is context:
+                slot.paginas += paginas
+                if saudavel and not slot.bloqueado and self.sessoes is not None:
+                    self._salvar_sessao(slot)
+                if not saudavel or self._precisa_reciclar(slot):
+                    self._reciclar(slot)
+                elif slot.bloqueado:
+                    print("Contexto bloqueado, trocando por um limpo")
+                    self._trocar_contexto(slot)
+                elif slot.proxy is not None and self.proxies.resfriado(slot.proxy):
+                    print(f"Proxy {slot.proxy.nome} em resfriamento, trocando o contexto")
+                    self._trocar_contexto(slot)
+                slot.em_uso = False
+                return
+
+    def _slot_da_pagina(self, page) -> Optional[_Slot]:
+        for slot in self._slots:
+            if slot.context is page.context:
+                return slot
+        return None
+
+    def limitar(self, page, url: str) -> float:
+        """
+        Espera os limites de taxa do proxy da página e do domínio de url.
+
+        Returns:
+            Segundos esperados (0 sem PoolProxies)
+        """
+        slot = self._slot_da_pagina(page)
+        if slot is None or slot.proxy is None:
+            return 0.0
+        return self.proxies.aguardar(slot.proxy, urlsplit(url).hostname)
+
+    def reportar(self, page, sucesso: bool, latencia_s: Optional[float] = None, bloqueado: bool = False) -> None:
+        """
+        Repassa o resultado de uma navegação para a saúde do proxy da página.
+
+        Um bloqueio também descarta a sessão da identidade e marca o
+        contexto para ser trocado na devolução.
+        """
+        slot = self._slot_da_pagina(page)
+        if slot is None:
+            return
+        if bloqueado:
+            slot.bloqueado = True
+            if self.sessoes is not None:
+                self.sessoes.descartar(self._identidade(slot.proxy))
+        if slot.proxy is not None:
+            self.proxies.registrar(slot.proxy, sucesso, latencia_s, bloqueado)
+
+    @contextmanager
+    def pagina(self):
+        """
+        Context manager que faz checkout, abre uma página e devolve tudo no final.
+
+        Uso:
+            with pool.pagina() as page:
+                page.goto(...)
+        """
+        context = self.checkout()
+        page = None
+        saudavel = True
+        navegacoes = []
+        try:
+            page = context.new_page()
+            # cada navegação conta como uma página para o limite max_paginas
+            page.on("domcontentloaded", lambda _: navegacoes.append(1))
+            yield page
+        except Exception:
+            saudavel = self._saudavel_apos_erro(context)
+            raise
+        finally:
+            if page is not None:
+                try:
+                    page.close()
+                except Exception:
+                    saudavel = False
+            self.devolver(context, paginas=max(1, len(navegacoes)), saudavel=saudavel)
+
+    def _saudavel_apos_erro(self, context) -> bool:
+        """Depois de uma exceção, só reaproveita o contexto se o navegador ainda responde."""
+        for slot in self._slots:
+            if slot.context is context:
+                return self._saudavel(slot)
+        return False
+
+    def fechar(self) -> None:
+        """Fecha todos os navegadores e o Playwright (se foi aberto pelo pool)."""
+        for slot in self._slots:
+            if self.sessoes is not None and not slot.bloqueado:
+                self._salvar_sessao(slot, forcar=True)
+            try:
+                slot.browser.close()
+            except Exception:
+                pass
+        self._slots = []
+        if self._playwright_cm is not None:
+            self._playwright_cm.__exit__(None, None, None)
+            self._playwright_cm = None
+        self._p = None
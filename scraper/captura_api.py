@@ -0,0 +1,226 @@
+import asyncio
+import time
+import weakref
+from collections import OrderedDict
+from functools import partial
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+from scraper.http_fetcher import ids_do_link, parse_item_shopee
+
+
+# rotas XHR que trazem os dados do produto e da loja
+PADROES_ITEM = ("/api/v4/item/get", "/api/v4/pdp/get_pc", "/api/v4/pdp/get")
+PADROES_LOJA = ("/api/v4/shop/get_shop_base", "/api/v4/shop/get_shop_detail")
+
+
+def parse_loja_shopee(payload: dict) -> Optional[Dict[str, object]]:
+    """
+    Interpreta o JSON de loja da Shopee (api/v4/shop/...).
+
+    Returns:
+        Dicionário com shopid e loja (nome), ou None se o payload não trouxer a loja
+    """
+    if not isinstance(payload, dict):
+        return None
+    data = payload.get("data")
+    if not isinstance(data, dict) or not data.get("name"):
+        return None
+    return {"shopid": str(data.get("shopid", "")), "loja": data["name"]}
+
+
+def _tipo_rota(url: str) -> Optional[str]:
+    caminho = urlparse(url).path
+    if any(caminho.startswith(p) for p in PADROES_ITEM):
+        return "item"
+    if any(caminho.startswith(p) for p in PADROES_LOJA):
+        return "loja"
+    return None
+
+
+def _item_id(url: str, payload: dict) -> Optional[str]:
+    """itemid da query da requisição ou, se faltar, do próprio payload."""
+    query = parse_qs(urlparse(url).query)
+    valores = query.get("itemid") or query.get("item_id")
+    if valores:
+        return valores[0]
+    data = payload.get("data") if isinstance(payload, dict) else None
+    if isinstance(data, dict):
+        item = data.get("item") if isinstance(data.get("item"), dict) else data
+        if item.get("itemid") is not None:
+            return str(item["itemid"])
+    return None
+
+
+class CapturaApi:
+    """
+    Captura os dados do produto das respostas XHR da própria página.
+
+    A página do produto da Shopee carrega nome, preço, estoque, avaliação
+    e variantes por chamadas JSON (api/v4/item/get, api/v4/pdp/get_pc).
+    Com o listener de page.on("response") instalado, esses payloads são
+    interpretados assim que chegam; aguardar() devolve o produto sem
+    rolar a página nem depender das classes CSS ofuscadas. Se a resposta
+    não chegar dentro do timeout, o chamador cai para os seletores do DOM.
+
+    Os itens ficam indexados pelo itemid, então uma instância pode ser
+    compartilhada por várias páginas (workers assíncronos). O "último
+    item", usado para links sem ids, é guardado por página: um worker
+    nunca recebe o produto que outra página acabou de capturar.
+    """
+
+    def __init__(self, timeout_ms: int = 5000, intervalo_ms: int = 50, max_itens: int = 200):
+        """Inicializa a captura
+
+        Args:
+            timeout_ms: Tempo máximo esperando o payload do produto
+            intervalo_ms: Intervalo entre verificações enquanto espera
+            max_itens: Itens capturados e ainda não consumidos mantidos em memória
+        """
+        self.timeout_ms = timeout_ms
+        self.intervalo_ms = intervalo_ms
+        self.max_itens = max_itens
+        self.acertos = 0
+        self.fallbacks = 0
+        self.reiniciar()
+
+    def reiniciar(self) -> None:
+        """Descarta tudo o que foi capturado (antes de ir para outro produto)."""
+        self._itens: "OrderedDict[str, Dict[str, object]]" = OrderedDict()
+        self._lojas: Dict[str, str] = {}
+        self._ultimo: Optional[Dict[str, object]] = None
+        # último item por página (fracas: páginas fechadas somem sozinhas)
+        self._ultimo_por_pagina: "weakref.WeakKeyDictionary[object, Dict[str, object]]" = weakref.WeakKeyDictionary()
+
+    def processar(self, url: str, payload: dict, pagina=None) -> Optional[Dict[str, object]]:
+        """
+        Registra um payload JSON de uma rota de item ou loja.
+
+        Args:
+            url: URL da requisição
+            payload: Corpo JSON da resposta
+            pagina: Página que recebeu a resposta (None = último item da instância)
+
+        Returns:
+            Dados interpretados, ou None se a rota/payload não for reconhecido
+        """
+        tipo = _tipo_rota(url)
+        if tipo == "loja":
+            loja = parse_loja_shopee(payload)
+            if loja:
+                self._lojas[loja["shopid"]] = loja["loja"]
+            return loja
+        if tipo != "item":
+            return None
+
+        dados = parse_item_shopee(payload)
+        if dados is None:
+            return None
+        item_id = _item_id(url, payload)
+        if item_id is not None:
+            self._itens[item_id] = dados
+            self._itens.move_to_end(item_id)
+            while len(self._itens) > self.max_itens:
+                self._itens.popitem(last=False)
+        if pagina is None:
+            self._ultimo = dados
+        else:
+            self._ultimo_por_pagina[pagina] = dados
+        return dados
+
+    def _on_response(self, response, pagina=None) -> None:
+        if _tipo_rota(response.url) is None or response.status != 200:
+            return
+        try:
+            payload = response.json()
+        except Exception:
+            return
+        self.processar(response.url, payload, pagina)
+
+    async def _on_response_async(self, response, pagina=None) -> None:
+        if _tipo_rota(response.url) is None or response.status != 200:
+            return
+        try:
+            payload = await response.json()
+        except Exception:
+            return
+        self.processar(response.url, payload, pagina)
+
+    def instalar(self, page) -> None:
+        """Escuta as respostas da página (API síncrona)."""
+        page.on("response", partial(self._on_response, pagina=page))
+
+    def instalar_async(self, page) -> None:
+        """Escuta as respostas da página (API assíncrona)."""
+        page.on("response", partial(self._on_response_async, pagina=page))
+
+    def obter(self, link: Optional[str] = None, pagina=None) -> Optional[Dict[str, object]]:
+        """
+        Retira o produto capturado para o link (ou o último da página, se o link não tiver ids).
+
+        Args:
+            link: URL do produto
+            pagina: Página onde o produto foi aberto (None = último item da instância)
+
+        Returns:
+            Dados do produto (com loja, se capturada) ou None
+        """
+        ids = ids_do_link(link) if link else None
+        if ids is not None:
+            dados = self._itens.pop(ids[1], None)
+            if dados is not None and pagina is not None and self._ultimo_por_pagina.get(pagina) is dados:
+                del self._ultimo_por_pagina[pagina]  # já entregue: não volta como "último" da página
+        elif pagina is not None:
+            dados = self._ultimo_por_pagina.pop(pagina, None)
+        else:
+            dados, self._ultimo = self._ultimo, None
+        if dados is None:
+            return None
+        dados = dict(dados)
+        if ids is not None and ids[0] in self._lojas:
+            dados["loja"] = self._lojas[ids[0]]
+        return dados
+
+    def aguardar(self, page, link: Optional[str] = None, timeout_ms: Optional[int] = None) -> Optional[Dict[str, object]]:
+        """
+        Espera o payload do produto chegar (API síncrona).
+
+        Args:
+            page: Página com a captura instalada
+            link: URL do produto (None = page.url)
+            timeout_ms: Sobrescreve o timeout padrão
+
+        Returns:
+            Dados do produto, ou None se o payload não chegou a tempo
+        """
+        link = link or page.url
+        limite = time.monotonic() + (timeout_ms if timeout_ms is not None else self.timeout_ms) / 1000
+        while True:
+            dados = self.obter(link, page)
+            if dados is not None:
+                self.acertos += 1
+                return dados
+            if time.monotonic() >= limite:
+                self.fallbacks += 1
+                return None
+            # wait_for_timeout deixa o Playwright despachar os eventos de resposta
+            page.wait_for_timeout(self.intervalo_ms)
+
+    async def aguardar_async(self, page, link: Optional[str] = None,
+                             timeout_ms: Optional[int] = None) -> Optional[Dict[str, object]]:
+        """Mesma coisa que aguardar(), para páginas da API assíncrona."""
+        link = link or page.url
+        limite = time.monotonic() + (timeout_ms if timeout_ms is not None else self.timeout_ms) / 1000
+        while True:
+            dados = self.obter(link, page)
+            if dados is not None:
+                self.acertos += 1
+                return dados
+            if time.monotonic() >= limite:
+                self.fallbacks += 1
+                return None
+            await asyncio.sleep(self.intervalo_ms / 1000)
+
+    def imprimir_relatorio(self) -> None:
+        total = self.acertos + self.fallbacks
+        print(f"Captura XHR: {self.acertos}/{total} produtos via API, {self.fallbacks} pelo DOM")
@@ -0,0 +1,151 @@
+from typing import Dict, List, Optional
+
+from scraper.waits import esperar_seletores
+
+
+NOME_NAO_ENCONTRADO = "NOME NÃO ENCONTRADO"
+PRECO_NAO_ENCONTRADO = "PREÇO NÃO ENCONTRADO"
+
+# seletor registrado quando o preço vem da busca por texto ($, AR$, ARS)
+SELETOR_PRECO_TEXTO = "text=/\\$|AR\\$|ARS/"
+
+# Cascata inteira de seletores executada dentro da página, numa única chamada.
+# Mesmas regras da extração sequencial: nome com mais de 3 caracteres, até
+# `maxPorSeletor` candidatos de preço por seletor, e por último qualquer
+# texto renderizado com $, AR$ ou ARS (fora de script/style/noscript/template,
+# como no seletor text= do Playwright).
+_EXTRAIR_JS = r"""
+({nomeSelectors, precoSelectors, maxPorSeletor}) => {
+    const texto = (el) => ((el && (el.innerText || el.textContent)) || "").trim();
+    const parecePreco = (t) => !!t && (t.includes("$") || t.includes("AR") || /\d/.test(t));
+    const consultar = (sel) => {
+        try { return Array.from(document.querySelectorAll(sel)); } catch (e) { return []; }
+    };
+
+    let nome = null, seletorNome = null;
+    for (const sel of nomeSelectors) {
+        const el = consultar(sel)[0];
+        const t = texto(el);
+        if (t.length > 3) { nome = t; seletorNome = sel; break; }
+    }
+
+    let preco = null, seletorPreco = null;
+    busca: for (const sel of precoSelectors) {
+        for (const el of consultar(sel).slice(0, maxPorSeletor)) {
+            const t = texto(el);
+            if (parecePreco(t)) { preco = t; seletorPreco = sel; break busca; }
+        }
+    }
+
+    let viaTexto = false;
+    if (!preco && document.body) {
+        const ignorar = new Set(["SCRIPT", "STYLE", "NOSCRIPT", "TEMPLATE"]);
+        const renderizado = (el) => el.offsetParent !== null || el.getClientRects().length > 0;
+        const walker = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT);
+        const re = /\$|AR\$|ARS/;
+        while (walker.nextNode()) {
+            const no = walker.currentNode;
+            const pai = no.parentElement;
+            if (!pai || ignorar.has(pai.tagName) || !re.test(no.nodeValue) || !renderizado(pai)) continue;
+            const t = texto(pai);
+            if (t) { preco = t; viaTexto = true; break; }
+        }
+    }
+
+    return {nome, preco, seletorNome, seletorPreco, viaTexto};
+}
+"""
+
+
+def extrair_em_uma_passada(
+    page,
+    nome_selectors: List[str],
+    preco_selectors: List[str],
+    max_por_seletor: int = 5,
+) -> Dict[str, Optional[str]]:
+    """
+    Executa a cascata de seletores de nome e preço num único page.evaluate.
+
+    Args:
+        page: Objeto page do Playwright
+        nome_selectors: Seletores CSS do título, em ordem de preferência
+        preco_selectors: Seletores CSS do preço, em ordem de preferência
+        max_por_seletor: Quantos elementos de cada seletor de preço examinar
+
+    Returns:
+        Dicionário com nome, preco, seletor_nome e seletor_preco
+        (None nos campos não encontrados)
+    """
+    r = page.evaluate(_EXTRAIR_JS, _argumentos(nome_selectors, preco_selectors, max_por_seletor))
+    return _interpretar(r)
+
+
+async def extrair_em_uma_passada_async(
+    page,
+    nome_selectors: List[str],
+    preco_selectors: List[str],
+    max_por_seletor: int = 5,
+) -> Dict[str, Optional[str]]:
+    """
+    Versão para a API assíncrona do Playwright (mesmo retorno de extrair_em_uma_passada).
+    """
+    r = await page.evaluate(_EXTRAIR_JS, _argumentos(nome_selectors, preco_selectors, max_por_seletor))
+    return _interpretar(r)
+
+
+def _argumentos(nome_selectors: List[str], preco_selectors: List[str], max_por_seletor: int) -> dict:
+    return {
+        "nomeSelectors": list(nome_selectors),
+        "precoSelectors": list(preco_selectors),
+        "maxPorSeletor": max_por_seletor,
+    }
+
+
+def _interpretar(r: Optional[dict]) -> Dict[str, Optional[str]]:
+    """Converte o retorno do JS para as chaves usadas no Python."""
+    r = r or {}
+    return {
+        "nome": r.get("nome"),
+        "preco": r.get("preco"),
+        "seletor_nome": r.get("seletorNome"),
+        "seletor_preco": SELETOR_PRECO_TEXTO if r.get("viaTexto") else r.get("seletorPreco"),
+    }
+
+
+def extrair_nome_preco(
+    page,
+    nome_selectors: List[str],
+    preco_selectors: List[str],
+    espera_ms: int = 5000,
+) -> Dict[str, Optional[str]]:
+    """
+    Extração em uma passada com no máximo uma espera e uma segunda tentativa.
+
+    Args:
+        page: Objeto page do Playwright
+        nome_selectors: Seletores CSS do título
+        preco_selectors: Seletores CSS do preço
+        espera_ms: Espera única pelos seletores que faltaram antes da segunda passada
+
+    Returns:
+        Dicionário com nome, preco, seletor_nome e seletor_preco. Campos não
+        encontrados recebem NOME_NAO_ENCONTRADO / PRECO_NAO_ENCONTRADO.
+
+    Caso comum: um round-trip. Pior caso: duas avaliações e uma espera de
+    `espera_ms`, no lugar de dezenas de inner_text com timeout cada.
+    """
+    dados = extrair_em_uma_passada(page, nome_selectors, preco_selectors)
+    if not dados["nome"] or not dados["preco"]:
+        faltando = []
+        if not dados["nome"]:
+            faltando += nome_selectors
+        if not dados["preco"]:
+            faltando += preco_selectors
+        if esperar_seletores(page, faltando, "visible", espera_ms):
+            segunda = extrair_em_uma_passada(page, nome_selectors, preco_selectors)
+            for campo in ("nome", "seletor_nome", "preco", "seletor_preco"):
+                dados[campo] = dados[campo] or segunda[campo]
+
+    dados["nome"] = dados["nome"] or NOME_NAO_ENCONTRADO
+    dados["preco"] = dados["preco"] or PRECO_NAO_ENCONTRADO
+    return dados
@@ -0,0 +1,131 @@
+import sqlite3
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+
+PENDENTE = "pendente"
+EM_ANDAMENTO = "em_andamento"
+FEITO = "feito"
+FALHOU = "falhou"
+
+
+class FilaTrabalhos:
+    """
+    Fila durável de URLs em SQLite, compartilhada por vários processos.
+
+    reservar() entrega cada URL a um único worker por vez, com prazo
+    (visibilidade_s): se o worker morrer sem ack/nack, a URL volta a ser
+    entregue quando o prazo vence. nack() devolve a URL para nova
+    tentativa até max_tentativas, depois a marca como falhou. O banco em
+    WAL pode ficar num volume compartilhado entre containers do mesmo host.
+    """
+
+    def __init__(self, caminho: str = "fila.db", visibilidade_s: float = 300.0, max_tentativas: int = 3):
+        """Abre (ou cria) a fila
+
+        Args:
+            caminho: Arquivo SQLite
+            visibilidade_s: Prazo de uma reserva antes de a URL voltar para a fila
+            max_tentativas: Tentativas até a URL ser marcada como falhou
+        """
+        self.caminho = caminho
+        self.visibilidade_s = visibilidade_s
+        self.max_tentativas = max_tentativas
+        # isolation_level=None: transações explícitas (BEGIN IMMEDIATE) na reserva
+        self._conn = sqlite3.connect(caminho, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS trabalhos ("
+            " id INTEGER PRIMARY KEY,"
+            " url TEXT UNIQUE NOT NULL,"
+            " estado TEXT NOT NULL,"
+            " tentativas INTEGER NOT NULL DEFAULT 0,"
+            " worker TEXT,"
+            " reservado_ate REAL,"
+            " erro TEXT,"
+            " atualizado_em REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS trabalhos_estado ON trabalhos (estado, id)")
+
+    def adicionar(self, urls: Iterable[str]) -> int:
+        """
+        Enfileira URLs (as já conhecidas são ignoradas, em qualquer estado).
+
+        Returns:
+            Quantidade de URLs novas
+        """
+        agora = time.time()
+        antes = self._conn.total_changes
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO trabalhos (url, estado, atualizado_em) VALUES (?, ?, ?)",
+                [(url, PENDENTE, agora) for url in urls],
+            )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        return self._conn.total_changes - antes
+
+    def reservar(self, worker: str) -> Optional[Tuple[int, str]]:
+        """
+        Reserva a próxima URL pendente (ou com reserva vencida).
+
+        Args:
+            worker: Identificação do worker (fica registrada no trabalho)
+
+        Returns:
+            Tupla (id, url) ou None se não há nada disponível agora
+        """
+        agora = time.time()
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            linha = self._conn.execute(
+                "SELECT id, url FROM trabalhos WHERE estado = ? "
+                "OR (estado = ? AND reservado_ate < ?) ORDER BY id LIMIT 1",
+                (PENDENTE, EM_ANDAMENTO, agora),
+            ).fetchone()
+            if linha is not None:
+                self._conn.execute(
+                    "UPDATE trabalhos SET estado = ?, worker = ?, reservado_ate = ?, atualizado_em = ? WHERE id = ?",
+                    (EM_ANDAMENTO, worker, agora + self.visibilidade_s, agora, linha[0]),
+                )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        return None if linha is None else (linha[0], linha[1])
+
+    def ack(self, id_trabalho: int) -> None:
+        """Confirma o trabalho como concluído."""
+        self._conn.execute(
+            "UPDATE trabalhos SET estado = ?, reservado_ate = NULL, erro = NULL, atualizado_em = ? WHERE id = ?",
+            (FEITO, time.time(), id_trabalho),
+        )
+
+    def nack(self, id_trabalho: int, erro: str = "") -> None:
+        """Devolve o trabalho para nova tentativa (ou marca falhou após max_tentativas)."""
+        self._conn.execute(
+            "UPDATE trabalhos SET tentativas = tentativas + 1, "
+            "estado = CASE WHEN tentativas + 1 >= ? THEN ? ELSE ? END, "
+            "reservado_ate = NULL, erro = ?, atualizado_em = ? WHERE id = ?",
+            (self.max_tentativas, FALHOU, PENDENTE, erro[:500], time.time(), id_trabalho),
+        )
+
+    def ativos(self) -> int:
+        """Trabalhos ainda não finalizados (pendentes + em andamento)."""
+        return self._conn.execute(
+            "SELECT COUNT(*) FROM trabalhos WHERE estado IN (?, ?)", (PENDENTE, EM_ANDAMENTO)
+        ).fetchone()[0]
+
+    def resumo(self) -> Dict[str, int]:
+        """Contagem de trabalhos por estado."""
+        contagem = {PENDENTE: 0, EM_ANDAMENTO: 0, FEITO: 0, FALHOU: 0}
+        for estado, n in self._conn.execute("SELECT estado, COUNT(*) FROM trabalhos GROUP BY estado"):
+            contagem[estado] = n
+        return contagem
+
+    def fechar(self) -> None:
+        self._conn.close()
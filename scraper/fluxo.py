@@ -0,0 +1,202 @@
+import asyncio
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterator, Optional
+
+from scraper.extraction import NOME_NAO_ENCONTRADO, PRECO_NAO_ENCONTRADO
+from scraper.metricas import METRICAS
+
+
+# capacidade padrão do buffer entre o crawler e o consumidor
+CAPACIDADE_PADRAO = 16
+
+_FIM = object()
+
+
+class _Falha:
+    __slots__ = ("erro",)
+
+    def __init__(self, erro: BaseException):
+        self.erro = erro
+
+
+class Produto:
+    """
+    Resultado de um produto entregue pelo iter_produtos.
+
+    Registro enxuto (__slots__): campos conhecidos como atributos e o que
+    mais a camada de extração devolver em `extras`.
+    """
+
+    __slots__ = ("nome", "preco", "link", "estoque", "preco_original", "extras")
+
+    def __init__(self, nome: str, preco: str, link: str, estoque: Optional[int] = None,
+                 preco_original: Optional[str] = None, extras: Optional[Dict[str, object]] = None):
+        self.nome = nome
+        self.preco = preco
+        self.link = link
+        self.estoque = estoque
+        self.preco_original = preco_original
+        self.extras = extras or {}
+
+    @classmethod
+    def de_dados(cls, dados: Dict[str, object]) -> "Produto":
+        """Cria o registro a partir do dicionário de extrair_produto."""
+        dados = dict(dados)
+        return cls(
+            dados.pop("nome", NOME_NAO_ENCONTRADO),
+            dados.pop("preco", PRECO_NAO_ENCONTRADO),
+            dados.pop("link", ""),
+            dados.pop("estoque", None),
+            dados.pop("preco_original", None),
+            dados,
+        )
+
+    @property
+    def completo(self) -> bool:
+        """True se nome e preço foram encontrados."""
+        return self.nome != NOME_NAO_ENCONTRADO and self.preco != PRECO_NAO_ENCONTRADO
+
+    def como_dict(self) -> Dict[str, object]:
+        """Dicionário no formato aceito pelos sinks (campos vazios omitidos)."""
+        dados = {"nome": self.nome, "preco": self.preco, "link": self.link}
+        if self.estoque is not None:
+            dados["estoque"] = self.estoque
+        if self.preco_original is not None:
+            dados["preco_original"] = self.preco_original
+        dados.update(self.extras)
+        return dados
+
+    def __eq__(self, outro: object) -> bool:
+        return isinstance(outro, Produto) and self.como_dict() == outro.como_dict()
+
+    def __repr__(self) -> str:
+        return f"Produto(nome={self.nome!r}, preco={self.preco!r}, link={self.link!r})"
+
+
+class Esteira:
+    """
+    Buffer limitado entre o crawler e quem consome os resultados.
+
+    O produtor (um gerador de dicionários) roda numa thread própria e
+    entrega cada item numa fila de `capacidade` posições; com a fila cheia
+    ele para até o consumidor retirar algo (contrapressão), então a memória
+    não cresce com o tamanho do catálogo. Serve tanto `for` quanto
+    `async for`; cada esteira é consumida uma única vez.
+
+    Com em_thread=False o produtor roda dentro do próprio `for` (sem buffer):
+    é o modo para objetos do Playwright síncrono presos à thread atual.
+    """
+
+    def __init__(self, produtor: Callable[[], Iterator[Dict[str, object]]], capacidade: int = CAPACIDADE_PADRAO,
+                 converter: Callable[[Dict[str, object]], object] = Produto.de_dados, em_thread: bool = True):
+        """Configura a esteira
+
+        Args:
+            produtor: Função sem argumentos que devolve o gerador de resultados
+            capacidade: Itens no buffer antes de o produtor parar
+            converter: Transforma cada item antes de entregá-lo
+            em_thread: False roda o produtor na thread do consumidor (sem buffer, sem async)
+        """
+        self.produtor = produtor
+        self.capacidade = max(1, capacidade)
+        self.converter = converter
+        self.em_thread = em_thread
+        self._fila: "queue.Queue[object]" = queue.Queue(maxsize=self.capacidade)
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._iniciada = False
+
+    def _iniciar(self) -> None:
+        if self._iniciada:
+            raise ValueError("esteira já consumida")
+        self._iniciada = True
+        if self.em_thread:
+            self._thread = threading.Thread(target=self._produzir, name="esteira-produtos", daemon=True)
+            self._thread.start()
+
+    def _colocar(self, item: object) -> bool:
+        """Põe o item na fila, esperando vaga; False se o consumidor desistiu."""
+        try:
+            self._fila.put_nowait(item)
+            return True
+        except queue.Full:
+            pass
+        inicio = time.perf_counter()
+        while not self._parar.is_set():
+            try:
+                self._fila.put(item, timeout=0.1)
+            except queue.Full:
+                continue
+            METRICAS.observar("esteira_contrapressao", time.perf_counter() - inicio)
+            return True
+        return False
+
+    def _produzir(self) -> None:
+        gerador = None
+        try:
+            gerador = self.produtor()
+            for item in gerador:
+                if not self._colocar(item):
+                    return
+        except BaseException as e:
+            self._colocar(_Falha(e))
+        finally:
+            # fecha o gerador aqui: a sessão do navegador precisa terminar na thread que a abriu
+            if gerador is not None and hasattr(gerador, "close"):
+                gerador.close()
+            self._colocar(_FIM)
+
+    def _proximo(self) -> object:
+        while True:
+            try:
+                return self._fila.get(timeout=0.1)
+            except queue.Empty:
+                if self._parar.is_set() or (self._thread is not None and not self._thread.is_alive()
+                                            and self._fila.empty()):
+                    return _FIM
+
+    def _entregar(self, item: object) -> object:
+        if isinstance(item, _Falha):
+            raise item.erro
+        METRICAS.contar("esteira_itens_total")
+        return self.converter(item)
+
+    def fechar(self) -> None:
+        """Interrompe o produtor e espera a thread terminar (fecha o navegador)."""
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __iter__(self) -> Iterator[object]:
+        self._iniciar()
+        if not self.em_thread:
+            gerador = self.produtor()
+            try:
+                for item in gerador:
+                    yield self._entregar(item)
+            finally:
+                gerador.close()
+            return
+        try:
+            while True:
+                item = self._proximo()
+                if item is _FIM:
+                    return
+                yield self._entregar(item)
+        finally:
+            self.fechar()
+
+    async def __aiter__(self):
+        if not self.em_thread:
+            raise ValueError("async for precisa do produtor em thread (em_thread=True)")
+        self._iniciar()
+        try:
+            while True:
+                item = await asyncio.to_thread(self._proximo)
+                if item is _FIM:
+                    return
+                yield self._entregar(item)
+        finally:
+            await asyncio.to_thread(self.fechar)
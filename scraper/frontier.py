@@ -0,0 +1,149 @@
+import json
+import os
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import parse_qsl, urldefrag, urlencode, urljoin, urlsplit, urlunsplit
+
+
+# parâmetros de rastreamento removidos das URLs de produto
+PARAMETROS_RASTREAMENTO = frozenset({
+    "sp_atk", "xptdk", "gclid", "fbclid", "ref", "from", "publish_id", "is_from_login",
+    "mmp_pid", "uls_trackid", "smtt", "d_id", "tracking_id",
+})
+PREFIXOS_RASTREAMENTO = ("utm_",)
+
+PENDENTE = "pendente"
+FEITO = "feito"
+FALHOU = "falhou"
+
+
+def normalizar_url(href: str, base_url: str = "https://shopee.com.ar") -> str:
+    """
+    URL absoluta e canônica: sem fragmento, sem parâmetros de rastreamento,
+    host em minúsculas e query ordenada.
+
+    Args:
+        href: href relativo ou absoluto
+        base_url: URL usada para resolver hrefs relativos
+
+    Returns:
+        URL normalizada (duas variações do mesmo produto viram a mesma string)
+    """
+    url, _ = urldefrag(urljoin(base_url, href.strip()))
+    partes = urlsplit(url)
+    query = sorted(
+        (k, v) for k, v in parse_qsl(partes.query, keep_blank_values=True)
+        if k not in PARAMETROS_RASTREAMENTO and not k.startswith(PREFIXOS_RASTREAMENTO)
+    )
+    return urlunsplit((partes.scheme, partes.netloc.lower(), partes.path, urlencode(query), ""))
+
+
+class Frontier:
+    """
+    Fronteira de URLs de um crawl, deduplicada e persistida em JSON.
+
+    Cada URL normalizada tem um estado (pendente, feito, falhou). O
+    arquivo guarda também até qual página da listagem o crawl já chegou,
+    então uma execução interrompida retoma de onde parou: a listagem
+    continua da próxima página e só as URLs pendentes são visitadas.
+    """
+
+    def __init__(self, caminho: Optional[str] = "frontier.json", salvar_a_cada: int = 10,
+                 max_tentativas: int = 2):
+        """Inicializa a fronteira, carregando o estado anterior se existir
+
+        Args:
+            caminho: Arquivo JSON do estado (None = só em memória)
+            salvar_a_cada: Salva no disco a cada N mudanças de estado
+            max_tentativas: Falhas até a URL ser marcada como falhou
+        """
+        self.caminho = caminho
+        self.salvar_a_cada = salvar_a_cada
+        self.max_tentativas = max_tentativas
+        self.urls: "OrderedDict[str, Dict[str, object]]" = OrderedDict()
+        self.pagina_listagem = 0
+        self.listagem_concluida = False
+        self._pendentes = 0
+        self.carregar()
+
+    def carregar(self) -> None:
+        """Lê o estado do arquivo (ignora arquivo ausente ou corrompido)."""
+        if not self.caminho:
+            return
+        try:
+            with open(self.caminho, encoding="utf-8") as f:
+                estado = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.urls = OrderedDict((u, dict(info)) for u, info in estado.get("urls", {}).items())
+        self.pagina_listagem = estado.get("pagina_listagem", 0)
+        self.listagem_concluida = estado.get("listagem_concluida", False)
+
+    def salvar(self) -> None:
+        """Grava o estado de forma atômica (arquivo temporário + rename)."""
+        self._pendentes = 0
+        if not self.caminho:
+            return
+        estado = {
+            "pagina_listagem": self.pagina_listagem,
+            "listagem_concluida": self.listagem_concluida,
+            "urls": self.urls,
+        }
+        tmp = f"{self.caminho}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(estado, f, ensure_ascii=False)
+        os.replace(tmp, self.caminho)
+
+    def _mudou(self) -> None:
+        self._pendentes += 1
+        if self.salvar_a_cada and self._pendentes >= self.salvar_a_cada:
+            self.salvar()
+
+    def adicionar(self, hrefs: Iterable[str], base_url: str = "https://shopee.com.ar") -> int:
+        """
+        Acrescenta URLs novas como pendentes (as já conhecidas são ignoradas).
+
+        Returns:
+            Quantidade de URLs novas
+        """
+        novas = 0
+        for href in hrefs:
+            if not href:
+                continue
+            url = normalizar_url(href, base_url)
+            if url not in self.urls:
+                self.urls[url] = {"estado": PENDENTE, "tentativas": 0}
+                novas += 1
+        if novas:
+            self._mudou()
+        return novas
+
+    def __contains__(self, href: str) -> bool:
+        return normalizar_url(href) in self.urls
+
+    def __len__(self) -> int:
+        return len(self.urls)
+
+    def pendentes(self) -> List[str]:
+        """URLs ainda não visitadas, na ordem em que foram descobertas."""
+        return [u for u, info in self.urls.items() if info["estado"] == PENDENTE]
+
+    def concluir(self, url: str) -> None:
+        """Marca a URL como visitada com sucesso."""
+        self.urls[url]["estado"] = FEITO
+        self._mudou()
+
+    def falhar(self, url: str) -> None:
+        """Conta uma falha; depois de max_tentativas a URL não é mais tentada."""
+        info = self.urls[url]
+        info["tentativas"] += 1
+        if info["tentativas"] >= self.max_tentativas:
+            info["estado"] = FALHOU
+        self._mudou()
+
+    def resumo(self) -> Dict[str, int]:
+        """Contagem de URLs por estado."""
+        contagem = {PENDENTE: 0, FEITO: 0, FALHOU: 0}
+        for info in self.urls.values():
+            contagem[info["estado"]] += 1
+        return contagem
@@ -0,0 +1,253 @@
+import sqlite3
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from scraper.frontier import normalizar_url
+from scraper.marketplaces import marketplace_do_link
+from scraper.precos import locale_do_link, normalizar_preco
+
+
+# observações acrescentadas entre duas compactações automáticas (0 = só manual)
+COMPACTAR_A_CADA = 100_000
+
+
+@lru_cache(maxsize=65536)
+def chave_item(link: str) -> str:
+    """
+    Chave estável do produto: "site:id" quando o adaptador reconhece o id,
+    senão a URL normalizada (sem rastreamento, query ordenada).
+    """
+    site = marketplace_do_link(link)
+    if site is not None:
+        item = site.id_item(link)
+        if item:
+            return f"{site.nome}:{item}"
+    return normalizar_url(link)
+
+
+@lru_cache(maxsize=65536)
+def _chave_e_locale(link: str) -> Tuple[str, str]:
+    # o catálogo se repete a cada visita: parse de URL uma vez por link
+    return chave_item(link), locale_do_link(link)
+
+
+def _timestamp(valor: object) -> int:
+    """coletado_em (ISO 8601 ou epoch) em segundos; agora se ausente."""
+    if valor is None or valor == "":
+        return int(time.time())
+    if isinstance(valor, (int, float)):
+        return int(valor)
+    data = datetime.fromisoformat(str(valor).replace("Z", "+00:00"))
+    if data.tzinfo is None:
+        data = data.replace(tzinfo=timezone.utc)
+    return int(data.timestamp())
+
+
+class HistoricoPrecos:
+    """
+    Histórico de preços por produto, em SQLite (WAL).
+
+    Cada visita acrescenta uma observação (item, ts, centavos); a chave
+    primária (item, ts) numa tabela WITHOUT ROWID é o próprio índice
+    temporal, então "o último preço" ou "o preço dentro da janela" de um
+    item são buscas por faixa no índice, sem varrer o resto da tabela.
+    A tabela itens guarda o último preço de cada produto para as
+    consultas que atravessam o catálogo.
+
+    O preço vale até a observação seguinte (função degrau). compactar()
+    apaga observações que repetem o preço anterior (menos a última de cada
+    item, que marca até quando o preço foi visto), sem mudar a resposta de
+    nenhuma consulta: as faixas consideram o preço vigente no início da
+    janela.
+    """
+
+    def __init__(self, caminho: str = "historico.db", compactar_a_cada: int = COMPACTAR_A_CADA):
+        """Abre (ou cria) o banco de histórico
+
+        Args:
+            caminho: Arquivo SQLite
+            compactar_a_cada: Observações novas que disparam compactar() (0 = só manual)
+        """
+        self.caminho = caminho
+        self.compactar_a_cada = compactar_a_cada
+        self.ignoradas = 0
+        self._novas = 0
+        self._conn = sqlite3.connect(caminho, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS itens ("
+            " id INTEGER PRIMARY KEY,"
+            " chave TEXT NOT NULL UNIQUE,"
+            " link TEXT,"
+            " nome TEXT,"
+            " moeda TEXT,"
+            " centavos INTEGER,"
+            " ts INTEGER);"
+            "CREATE TABLE IF NOT EXISTS observacoes ("
+            " item INTEGER NOT NULL,"
+            " ts INTEGER NOT NULL,"
+            " centavos INTEGER NOT NULL,"
+            " PRIMARY KEY (item, ts)) WITHOUT ROWID;"
+        )
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM observacoes").fetchone()[0]
+
+    def registrar(self, dados: Dict[str, object]) -> bool:
+        """Acrescenta uma observação (ver registrar_lote); True se foi gravada."""
+        return self.registrar_lote([dados]) == 1
+
+    def registrar_lote(self, linhas: Iterable[Dict[str, object]]) -> int:
+        """
+        Acrescenta as observações numa única transação.
+
+        Args:
+            linhas: Resultados com link, preco, nome e (opcional) coletado_em
+
+        Returns:
+            Observações gravadas (sem preço reconhecível ou repetidas no mesmo segundo não contam)
+        """
+        registros = []
+        for linha in linhas:
+            link = linha.get("link")
+            if not link:
+                self.ignoradas += 1
+                continue
+            chave, locale = _chave_e_locale(link)
+            preco = normalizar_preco(linha.get("preco"), locale)
+            if preco.centavos is None:
+                self.ignoradas += 1
+                continue
+            registros.append((chave, link, linha.get("nome"), preco.moeda, preco.centavos,
+                              _timestamp(linha.get("coletado_em"))))
+        if not registros:
+            return 0
+
+        with self._conn:
+            # itens: o último preço só avança (observações antigas importadas depois não o sobrescrevem);
+            # no mesmo segundo vale a primeira, como em observacoes (INSERT OR IGNORE)
+            self._conn.executemany(
+                "INSERT INTO itens (chave, link, nome, moeda, centavos, ts) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(chave) DO UPDATE SET link=excluded.link, nome=COALESCE(excluded.nome, nome), "
+                "moeda=COALESCE(excluded.moeda, moeda), centavos=excluded.centavos, ts=excluded.ts "
+                "WHERE excluded.ts > itens.ts",
+                registros,
+            )
+            antes = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO observacoes (item, ts, centavos) "
+                "SELECT id, ?, ? FROM itens WHERE chave = ?",
+                [(ts, centavos, chave) for chave, _, _, _, centavos, ts in registros],
+            )
+            gravadas = self._conn.total_changes - antes
+
+        self._novas += gravadas
+        if self.compactar_a_cada and self._novas >= self.compactar_a_cada:
+            self.compactar()
+        return gravadas
+
+    def compactar(self) -> int:
+        """
+        Apaga observações que repetem o preço anterior do mesmo item.
+
+        Returns:
+            Observações apagadas
+        """
+        with self._conn:
+            apagadas = self._conn.execute(
+                "DELETE FROM observacoes WHERE (item, ts) IN ("
+                " SELECT item, ts FROM ("
+                "  SELECT item, ts, centavos,"
+                "   LAG(centavos) OVER janela AS anterior,"
+                "   LEAD(ts) OVER janela AS seguinte"
+                "  FROM observacoes WINDOW janela AS (PARTITION BY item ORDER BY ts))"
+                " WHERE centavos = anterior AND seguinte IS NOT NULL)"
+            ).rowcount
+        self._novas = 0
+        print(f"Histórico compactado: {apagadas} observações repetidas removidas")
+        return apagadas
+
+    def _item(self, link_ou_chave: str) -> Optional[Tuple[int, str, str, str]]:
+        chave = link_ou_chave if "://" not in link_ou_chave else chave_item(link_ou_chave)
+        return self._conn.execute(
+            "SELECT id, chave, nome, moeda FROM itens WHERE chave = ?", (chave,)
+        ).fetchone()
+
+    def ultimo(self, link_ou_chave: str) -> Optional[Dict[str, object]]:
+        """
+        Último preço observado do produto.
+
+        Returns:
+            Dicionário (chave, nome, centavos, moeda, ts) ou None se o produto não tem histórico
+        """
+        item = self._item(link_ou_chave)
+        if item is None:
+            return None
+        linha = self._conn.execute(
+            "SELECT ts, centavos FROM observacoes WHERE item = ? ORDER BY ts DESC LIMIT 1", (item[0],)
+        ).fetchone()
+        if linha is None:
+            return None
+        return {"chave": item[1], "nome": item[2], "moeda": item[3], "ts": linha[0], "centavos": linha[1]}
+
+    def faixa(self, link_ou_chave: str, desde: float, ate: Optional[float] = None) -> Optional[Dict[str, object]]:
+        """
+        Menor e maior preço do produto em vigor na janela [desde, ate].
+
+        Inclui o preço vigente no início da janela (a última observação antes dela).
+
+        Returns:
+            Dicionário (chave, minimo, maximo, observacoes) ou None se não houve preço na janela
+        """
+        item = self._item(link_ou_chave)
+        if item is None:
+            return None
+        ate = time.time() if ate is None else ate
+        minimo, maximo, observacoes = self._conn.execute(
+            "SELECT MIN(centavos), MAX(centavos), COUNT(*) FROM ("
+            " SELECT centavos FROM observacoes WHERE item = :item AND ts >= :desde AND ts <= :ate"
+            " UNION ALL"
+            " SELECT * FROM (SELECT centavos FROM observacoes WHERE item = :item AND ts < :desde"
+            "  ORDER BY ts DESC LIMIT 1))",
+            {"item": item[0], "desde": int(desde), "ate": int(ate)},
+        ).fetchone()
+        if not observacoes:
+            return None
+        return {"chave": item[1], "nome": item[2], "moeda": item[3],
+                "minimo": minimo, "maximo": maximo, "observacoes": observacoes}
+
+    def maiores_quedas(self, desde: float, limite: int = 20) -> List[Dict[str, object]]:
+        """
+        Produtos cujo preço atual mais caiu em relação ao maior preço desde `desde`.
+
+        Args:
+            desde: Início da janela (epoch)
+            limite: Quantidade de produtos
+
+        Returns:
+            Lista (chave, link, nome, moeda, maximo, atual, queda, queda_pct), da maior queda percentual para a menor
+        """
+        linhas = self._conn.execute(
+            "SELECT chave, link, nome, moeda, maximo, centavos FROM ("
+            " SELECT i.chave, i.link, i.nome, i.moeda, i.centavos, MAX("
+            "  COALESCE((SELECT MAX(o.centavos) FROM observacoes o WHERE o.item = i.id AND o.ts >= :desde), 0),"
+            "  COALESCE((SELECT o.centavos FROM observacoes o WHERE o.item = i.id AND o.ts < :desde"
+            "   ORDER BY o.ts DESC LIMIT 1), 0)) AS maximo"
+            " FROM itens i)"
+            " WHERE centavos < maximo"
+            " ORDER BY (maximo - centavos) * 1.0 / maximo DESC, maximo - centavos DESC"
+            " LIMIT :limite",
+            {"desde": int(desde), "limite": limite},
+        ).fetchall()
+        return [
+            {"chave": chave, "link": link, "nome": nome, "moeda": moeda, "maximo": maximo, "atual": atual,
+             "queda": maximo - atual, "queda_pct": round((maximo - atual) * 100 / maximo, 1)}
+            for chave, link, nome, moeda, maximo, atual in linhas
+        ]
+
+    def fechar(self) -> None:
+        self._conn.close()
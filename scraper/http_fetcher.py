@@ -0,0 +1,286 @@
+import json
+import re
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from lxml import etree
+from lxml import html as lxml_html
+from requests.adapters import HTTPAdapter
+
+from scraper.marketplaces import marketplace_do_link
+# definida em resiliencia (sem depender do requests); reexportada para quem importa daqui
+from scraper.resiliencia import BloqueadoError
+
+
+# a Shopee devolve preços multiplicados por 100000
+FATOR_PRECO_SHOPEE = 100000
+
+# /product/<shopid>/<itemid> ou <slug>-i.<shopid>.<itemid>
+_ID_PRODUTO = (
+    re.compile(r"/product/(\d+)/(\d+)"),
+    re.compile(r"-i\.(\d+)\.(\d+)"),
+)
+
+# códigos de status que indicam bloqueio/anti-bot
+STATUS_BLOQUEIO = (403, 418, 429, 503)
+
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64; rv:128.0) Gecko/20100101 Firefox/128.0"
+
+
+def ids_do_link(link: str) -> Optional[Tuple[str, str]]:
+    """
+    Extrai (shopid, itemid) de uma URL de produto da Shopee.
+
+    Returns:
+        Tupla (shopid, itemid) ou None se a URL não tiver os ids
+    """
+    for padrao in _ID_PRODUTO:
+        m = padrao.search(urlparse(link).path)
+        if m:
+            return m.group(1), m.group(2)
+    return None
+
+
+def formatar_preco_shopee(valor: Optional[int]) -> Optional[str]:
+    """Converte o preço inteiro da API (x100000) no texto "$ 12.999" usado no CSV."""
+    if valor is None:
+        return None
+    centavos = round(valor * 100 / FATOR_PRECO_SHOPEE)
+    inteiro, decimal = divmod(centavos, 100)
+    texto = f"{inteiro:,}".replace(",", ".")
+    return f"$ {texto},{decimal:02d}" if decimal else f"$ {texto}"
+
+
+def parse_item_shopee(payload: dict) -> Optional[Dict[str, object]]:
+    """
+    Interpreta o JSON de item da Shopee (api/v4/item/get ou api/v4/pdp/get_pc).
+
+    Args:
+        payload: Corpo JSON da resposta
+
+    Returns:
+        Dicionário com nome, preco, preco_min, preco_max, estoque, avaliacao e
+        variantes, ou None se o payload não trouxer um item
+    """
+    if not isinstance(payload, dict):
+        return None
+    data = payload.get("data") or {}
+    item = data.get("item") if isinstance(data, dict) and "item" in data else data
+    if not isinstance(item, dict) or not item.get("name"):
+        return None
+
+    preco = item.get("price")
+    preco_min = item.get("price_min", preco)
+    preco_max = item.get("price_max", preco)
+    if preco is None:
+        preco = preco_min
+    texto_preco = formatar_preco_shopee(preco_min)
+    if preco_max is not None and preco_min is not None and preco_max != preco_min:
+        texto_preco = f"{formatar_preco_shopee(preco_min)} - {formatar_preco_shopee(preco_max)}"
+
+    avaliacao = item.get("item_rating") or {}
+    variantes = []
+    for modelo in item.get("models") or []:
+        variantes.append({
+            "nome": modelo.get("name"),
+            "preco": formatar_preco_shopee(modelo.get("price")),
+            "estoque": modelo.get("stock"),
+        })
+
+    return {
+        "nome": item["name"],
+        "preco": texto_preco,
+        "preco_min": formatar_preco_shopee(preco_min),
+        "preco_max": formatar_preco_shopee(preco_max),
+        "estoque": item.get("stock"),
+        "avaliacao": avaliacao.get("rating_star") if isinstance(avaliacao, dict) else None,
+        "variantes": variantes,
+    }
+
+
+def parse_html_produto(texto: str) -> Optional[Dict[str, object]]:
+    """
+    Extrai nome e preço do HTML renderizado no servidor (JSON-LD ou meta tags og/product).
+
+    Returns:
+        Dicionário com nome e preco, ou None se o HTML não tiver os dados
+    """
+    try:
+        doc = lxml_html.fromstring(texto)
+    except (ValueError, etree.ParserError):
+        return None
+
+    for bloco in doc.xpath("//script[@type='application/ld+json']/text()"):
+        try:
+            dados = json.loads(bloco)
+        except ValueError:
+            continue
+        for d in dados if isinstance(dados, list) else [dados]:
+            if isinstance(d, dict) and d.get("@type") == "Product" and d.get("name"):
+                oferta = d.get("offers") or {}
+                if isinstance(oferta, list):
+                    oferta = oferta[0] if oferta else {}
+                preco = oferta.get("price") or oferta.get("lowPrice")
+                if preco is not None:
+                    return {"nome": d["name"], "preco": f"$ {preco}"}
+
+    def meta(prop):
+        valores = doc.xpath(f"//meta[@property='{prop}' or @name='{prop}']/@content")
+        return valores[0].strip() if valores else None
+
+    nome = meta("og:title")
+    preco = meta("product:price:amount")
+    if nome and preco:
+        return {"nome": nome, "preco": f"$ {preco}"}
+    return None
+
+
+class HttpFetcher:
+    """
+    Camada HTTP leve: busca dados do produto sem abrir navegador.
+
+    Usa uma requests.Session com pool de conexões keep-alive. Para cada
+    link tenta a API de item da Shopee e depois o HTML (JSON-LD/meta
+    tags, parseado com lxml). Retorna None quando não consegue
+    interpretar a resposta e levanta BloqueadoError quando o site
+    recusa a requisição; nos dois casos o chamador recorre ao Playwright.
+    """
+
+    def __init__(self, base_url: str = "https://shopee.com.ar", timeout: float = 10.0,
+                 pool_conexoes: int = 10, headers: Optional[Dict[str, str]] = None,
+                 session: Optional[requests.Session] = None, proxies=None):
+        """Inicializa o fetcher
+
+        Args:
+            base_url: Domínio da loja (usado nas rotas da API)
+            timeout: Timeout (s) de cada requisição
+            pool_conexoes: Conexões keep-alive mantidas por host
+            headers: Cabeçalhos extras de todas as requisições
+            session: Sessão já configurada (opcional)
+            proxies: PoolProxies opcional; cada requisição sai por um proxy do pool
+        """
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_conexoes, pool_maxsize=pool_conexoes)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(headers or {})
+        self.session.headers["User-Agent"] = USER_AGENT
+        self.proxies = proxies
+        self.bloqueios = 0
+        self.acertos = 0
+        self.falhas = 0
+
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        if self.proxies is not None:
+            return self._get_via_proxies(url, **kwargs)
+        resp = self.session.get(url, timeout=self.timeout, **kwargs)
+        if resp.status_code in STATUS_BLOQUEIO:
+            self.bloqueios += 1
+            raise BloqueadoError(f"HTTP {resp.status_code} em {url}")
+        return resp
+
+    def _get_via_proxies(self, url: str, **kwargs) -> requests.Response:
+        """
+        GET por um proxy do pool; bloqueio ou erro de conexão tenta o próximo.
+
+        Cada proxy só é tentado uma vez por requisição (até 3), e o
+        resultado de cada tentativa alimenta a saúde do proxy no pool.
+        """
+        dominio = urlparse(url).hostname
+        proxy = None
+        erro: Exception = BloqueadoError(f"nenhum proxy disponível para {url}")
+        for _ in range(min(3, len(self.proxies))):
+            proxy = self.proxies.adquirir(dominio, evitar=proxy)
+            inicio = time.perf_counter()
+            try:
+                resp = self.session.get(url, timeout=self.timeout,
+                                        proxies={"http": proxy.url, "https": proxy.url}, **kwargs)
+            except requests.RequestException as e:
+                self.proxies.registrar(proxy, False)
+                erro = e
+                continue
+            if resp.status_code in STATUS_BLOQUEIO:
+                self.bloqueios += 1
+                self.proxies.registrar(proxy, False, bloqueado=True)
+                erro = BloqueadoError(f"HTTP {resp.status_code} em {url} via {proxy.nome}")
+                continue
+            self.proxies.registrar(proxy, True, time.perf_counter() - inicio)
+            return resp
+        raise erro
+
+    def buscar_api(self, link: str) -> Optional[Dict[str, object]]:
+        """
+        Busca o item pela API JSON (None se o link não tiver ids ou a resposta não servir).
+
+        Links de um marketplace registrado usam a rota e o parser do adaptador;
+        os demais (ex.: a loja local do benchmark) seguem a rota da Shopee em base_url.
+        """
+        site = marketplace_do_link(link)
+        if site is not None:
+            requisicao = site.requisicao_api(link)
+            parse = site.parse_api
+        else:
+            ids = ids_do_link(link)
+            requisicao = None
+            if ids is not None:
+                shopid, itemid = ids
+                requisicao = f"{self.base_url}/api/v4/item/get", {"itemid": itemid, "shopid": shopid}
+            parse = parse_item_shopee
+        if not requisicao:
+            return None
+        url, params = requisicao
+        resp = self._get(
+            url,
+            params=params,
+            headers={"Referer": link, "X-Requested-With": "XMLHttpRequest", "Accept": "application/json"},
+        )
+        if resp.status_code != 200:
+            return None
+        try:
+            payload = resp.json()
+        except ValueError:
+            return None
+        # a API responde 200 com "error" quando a sessão é recusada pelo anti-bot
+        if isinstance(payload, dict) and payload.get("error") and not payload.get("data"):
+            self.bloqueios += 1
+            raise BloqueadoError(f"API respondeu erro {payload.get('error')} para {link}")
+        return parse(payload)
+
+    def buscar_html(self, link: str) -> Optional[Dict[str, object]]:
+        """Busca a página do produto e tenta extrair os dados do HTML."""
+        resp = self._get(link, headers={"Accept": "text/html"})
+        if resp.status_code != 200:
+            return None
+        return parse_html_produto(resp.text)
+
+    def buscar_produto(self, link: str) -> Optional[Dict[str, object]]:
+        """
+        Tenta obter nome e preço de um produto só com HTTP.
+
+        Args:
+            link: URL do produto
+
+        Returns:
+            Dicionário com pelo menos nome, preco e link, ou None para escalar ao navegador
+
+        Raises:
+            BloqueadoError: O site recusou a requisição
+        """
+        try:
+            dados = self.buscar_api(link) or self.buscar_html(link)
+        except requests.RequestException as e:
+            print(f"HTTP falhou para {link}: {e}")
+            dados = None
+        if not dados:
+            self.falhas += 1
+            return None
+        self.acertos += 1
+        dados["link"] = link
+        return dados
+
+    def fechar(self) -> None:
+        self.session.close()
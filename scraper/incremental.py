@@ -0,0 +1,167 @@
+import hashlib
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional
+
+from scraper.precos import locale_do_link, normalizar_preco
+
+
+def impressao_digital(dados: Dict[str, object]) -> str:
+    """
+    Hash de nome + preço normalizado de um resultado.
+
+    O preço entra em centavos (locale do link), então o mesmo preço vindo
+    formatado pela API ou quebrado em linhas pelo DOM dá a mesma impressão;
+    textos sem número reconhecível entram como estão. O estoque fica de
+    fora: nem toda via o informa, e EstadoIncremental o compara à parte.
+    """
+    preco = normalizar_preco(dados.get("preco"), locale_do_link(dados.get("link")))
+    valor = preco.centavos if preco.centavos is not None else dados.get("preco")
+    chave = "\x1f".join(str(v or "") for v in (dados.get("nome"), valor))
+    return hashlib.sha1(chave.encode("utf-8")).hexdigest()
+
+
+class EstadoIncremental:
+    """
+    Última impressão digital e agenda de revisita por URL, em SQLite (WAL).
+
+    Cada URL tem um intervalo de revisita próprio: quando a impressão
+    digital (ou o estoque, quando as duas visitas o conhecem) muda o
+    intervalo cai pela metade, quando não muda cresce 50%,
+    dentro de [intervalo_min_s, intervalo_max_s]. Assim os produtos com
+    preço volátil são visitados com frequência e os estáticos vão ficando
+    para depois. vencidos() devolve primeiro as URLs mais atrasadas.
+    """
+
+    def __init__(self, caminho: str = "estado.db", intervalo_inicial_s: float = 6 * 3600,
+                 intervalo_min_s: float = 15 * 60, intervalo_max_s: float = 7 * 24 * 3600):
+        """Abre (ou cria) o banco de estado
+
+        Args:
+            caminho: Arquivo SQLite
+            intervalo_inicial_s: Intervalo de uma URL recém-vista
+            intervalo_min_s: Menor intervalo (produtos que mudam sempre)
+            intervalo_max_s: Maior intervalo (produtos que nunca mudam)
+        """
+        self.caminho = caminho
+        self.intervalo_inicial_s = intervalo_inicial_s
+        self.intervalo_min_s = intervalo_min_s
+        self.intervalo_max_s = intervalo_max_s
+        self.mudados = 0
+        self.inalterados = 0
+        self._conn = sqlite3.connect(caminho, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS urls ("
+            " link TEXT PRIMARY KEY,"
+            " impressao TEXT,"
+            " estoque INTEGER,"
+            " visitas INTEGER NOT NULL DEFAULT 0,"
+            " mudancas INTEGER NOT NULL DEFAULT 0,"
+            " intervalo_s REAL NOT NULL,"
+            " visto_em REAL,"
+            " mudou_em REAL,"
+            " proxima_visita REAL NOT NULL)"
+        )
+        colunas = {c[1] for c in self._conn.execute("PRAGMA table_info(urls)")}
+        if "estoque" not in colunas:  # bancos criados antes da coluna
+            self._conn.execute("ALTER TABLE urls ADD COLUMN estoque INTEGER")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS urls_proxima ON urls (proxima_visita)")
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM urls").fetchone()[0]
+
+    def adicionar(self, links: Iterable[str]) -> int:
+        """
+        Agenda URLs novas para visita imediata (as conhecidas não mudam).
+
+        Returns:
+            Quantidade de URLs novas
+        """
+        antes = len(self)
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO urls (link, intervalo_s, proxima_visita) VALUES (?, ?, 0)",
+                [(link, self.intervalo_inicial_s) for link in links],
+            )
+        return len(self) - antes
+
+    def vencidos(self, limite: Optional[int] = None, agora: Optional[float] = None) -> List[str]:
+        """
+        URLs cuja próxima visita já passou, das mais atrasadas para as menos.
+
+        Args:
+            limite: Máximo de URLs (None = todas)
+            agora: Timestamp de referência (padrão: time.time())
+        """
+        agora = time.time() if agora is None else agora
+        linhas = self._conn.execute(
+            "SELECT link FROM urls WHERE proxima_visita <= ? ORDER BY proxima_visita LIMIT ?",
+            (agora, -1 if limite is None else limite),
+        ).fetchall()
+        return [l[0] for l in linhas]
+
+    def segundos_ate_proxima(self, agora: Optional[float] = None) -> Optional[float]:
+        """Tempo até a próxima URL vencer (0 se já há vencidas, None se vazio)."""
+        agora = time.time() if agora is None else agora
+        proxima = self._conn.execute("SELECT MIN(proxima_visita) FROM urls").fetchone()[0]
+        return None if proxima is None else max(0.0, proxima - agora)
+
+    def registrar(self, dados: Dict[str, object], agora: Optional[float] = None) -> bool:
+        """
+        Compara o resultado com a última visita e reagenda a URL.
+
+        Args:
+            dados: Resultado com link, nome, preco (e estoque, se houver)
+            agora: Timestamp da visita (padrão: time.time())
+
+        Returns:
+            True se o produto é novo ou mudou (a linha deve ser gravada)
+        """
+        agora = time.time() if agora is None else agora
+        link = dados["link"]
+        impressao = impressao_digital(dados)
+        estoque = dados.get("estoque")
+        anterior = self._conn.execute(
+            "SELECT impressao, intervalo_s, estoque FROM urls WHERE link = ?", (link,)
+        ).fetchone()
+
+        if anterior is None or anterior[0] is None:
+            mudou = True
+            intervalo = anterior[1] if anterior else self.intervalo_inicial_s
+        else:
+            # estoque ausente (ex.: via DOM) é desconhecido, não mudança
+            mudou = anterior[0] != impressao or (estoque is not None and anterior[2] is not None
+                                                 and int(estoque) != anterior[2])
+            intervalo = anterior[1] / 2 if mudou else anterior[1] * 1.5
+        intervalo = min(self.intervalo_max_s, max(self.intervalo_min_s, intervalo))
+
+        with self._conn:
+            self._conn.execute(
+                "INSERT INTO urls (link, impressao, estoque, visitas, mudancas, intervalo_s, visto_em, mudou_em, "
+                "proxima_visita) VALUES (?, ?, ?, 1, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(link) DO UPDATE SET impressao=excluded.impressao, "
+                "estoque=COALESCE(excluded.estoque, estoque), visitas=visitas + 1, "
+                "mudancas=mudancas + excluded.mudancas, intervalo_s=excluded.intervalo_s, "
+                "visto_em=excluded.visto_em, mudou_em=COALESCE(excluded.mudou_em, mudou_em), "
+                "proxima_visita=excluded.proxima_visita",
+                (link, impressao, None if estoque is None else int(estoque), int(mudou), intervalo, agora, agora if mudou else None, agora + intervalo),
+            )
+        if mudou:
+            self.mudados += 1
+        else:
+            self.inalterados += 1
+        return mudou
+
+    def adiar(self, link: str, agora: Optional[float] = None) -> None:
+        """Reagenda uma URL que falhou para daqui a intervalo_min_s (sem mexer no intervalo)."""
+        agora = time.time() if agora is None else agora
+        with self._conn:
+            self._conn.execute(
+                "UPDATE urls SET proxima_visita = ? WHERE link = ?", (agora + self.intervalo_min_s, link)
+            )
+
+    def fechar(self) -> None:
+        self._conn.close()
@@ -0,0 +1,185 @@
+import re
+from typing import Dict, Iterable, Optional
+
+
+# tipos de recurso (request.resource_type) que não influenciam nome/preço
+TIPOS_BLOQUEADOS_PADRAO = ("image", "media", "font")
+
+# rastreadores e analytics: nunca são necessários para extrair dados
+PADROES_BLOQUEADOS_PADRAO = (
+    r"google-analytics\.com",
+    r"googletagmanager\.com",
+    r"doubleclick\.net",
+    r"facebook\.(net|com)/tr",
+    r"connect\.facebook\.net",
+    r"hotjar\.com",
+    r"clarity\.ms",
+    r"analytics\.tiktok\.com",
+    r"/(collect|beacon|track|tracking)(\?|/|$)",
+)
+
+# tamanho médio (bytes) usado para estimar a economia antes de observar respostas reais
+TAMANHO_ESTIMADO_BYTES = {
+    "image": 45_000,
+    "media": 400_000,
+    "font": 35_000,
+    "script": 25_000,
+    "stylesheet": 15_000,
+    "xhr": 3_000,
+    "fetch": 3_000,
+}
+
+
+class RequestInterceptor:
+    """
+    Camada de interceptação de requisições instalada via context.route.
+
+    Aborta requisições por tipo de recurso e por padrão de URL (regex),
+    com uma lista de permissões que sempre vence. Mantém estatísticas de
+    requisições bloqueadas e de bytes baixados/economizados, que o scraper
+    reporta e zera a cada produto.
+
+    O tamanho de uma requisição abortada é desconhecido, então a economia
+    é estimada pela média das respostas já vistas do mesmo tipo (ou por
+    TAMANHO_ESTIMADO_BYTES enquanto não houver amostras).
+    """
+
+    def __init__(
+        self,
+        bloquear_tipos: Iterable[str] = TIPOS_BLOQUEADOS_PADRAO,
+        bloquear_padroes: Iterable[str] = PADROES_BLOQUEADOS_PADRAO,
+        permitir_padroes: Iterable[str] = (),
+        permitir_imagens: bool = False,
+    ):
+        """Inicializa o interceptor
+
+        Args:
+            bloquear_tipos: Tipos de recurso a abortar (image, media, font, ...)
+            bloquear_padroes: Regex de URLs a abortar (analytics, rastreadores)
+            permitir_padroes: Regex de URLs sempre permitidas (vence as regras de bloqueio)
+            permitir_imagens: Libera imagens mesmo se "image" estiver em bloquear_tipos
+                              (necessário quando se quer screenshot)
+        """
+        self.bloquear_tipos = set(bloquear_tipos)
+        self.bloquear_padroes = [re.compile(p) for p in bloquear_padroes]
+        self.permitir_padroes = [re.compile(p) for p in permitir_padroes]
+        self.permitir_imagens = permitir_imagens
+        self._amostras: Dict[str, list] = {}
+        self.reiniciar()
+
+    def reiniciar(self) -> None:
+        """Zera as estatísticas da página atual."""
+        self.bloqueadas = 0
+        self.permitidas = 0
+        self.bytes_baixados = 0
+        self.bytes_economizados = 0
+        self.bloqueadas_por_tipo: Dict[str, int] = {}
+
+    def deve_bloquear(self, tipo: str, url: str) -> bool:
+        """
+        Decide se uma requisição deve ser abortada.
+
+        Args:
+            tipo: request.resource_type (document, image, script, ...)
+            url: URL da requisição
+
+        Returns:
+            True para abortar, False para deixar passar
+        """
+        if tipo == "document":
+            return False
+        if any(p.search(url) for p in self.permitir_padroes):
+            return False
+        if tipo == "image" and self.permitir_imagens:
+            return False
+        if tipo in self.bloquear_tipos:
+            return True
+        return any(p.search(url) for p in self.bloquear_padroes)
+
+    def _tamanho_estimado(self, tipo: str) -> int:
+        """Média das respostas observadas do tipo ou valor da tabela padrão."""
+        amostras = self._amostras.get(tipo)
+        if amostras:
+            return int(sum(amostras) / len(amostras))
+        return TAMANHO_ESTIMADO_BYTES.get(tipo, 5_000)
+
+    def _registrar_bloqueio(self, tipo: str) -> None:
+        self.bloqueadas += 1
+        self.bloqueadas_por_tipo[tipo] = self.bloqueadas_por_tipo.get(tipo, 0) + 1
+        self.bytes_economizados += self._tamanho_estimado(tipo)
+
+    def _registrar_resposta(self, response) -> None:
+        """Soma o content-length da resposta e guarda como amostra do tipo."""
+        try:
+            tamanho = int(response.headers.get("content-length", 0))
+            tipo = response.request.resource_type
+        except Exception:
+            return
+        self.bytes_baixados += tamanho
+        if tamanho:
+            amostras = self._amostras.setdefault(tipo, [])
+            amostras.append(tamanho)
+            if len(amostras) > 200:
+                del amostras[0]
+
+    def _rota(self, route) -> None:
+        request = route.request
+        try:
+            if self.deve_bloquear(request.resource_type, request.url):
+                self._registrar_bloqueio(request.resource_type)
+                route.abort()
+            else:
+                self.permitidas += 1
+                route.continue_()
+        except Exception:
+            pass  # página fechada durante a requisição
+
+    async def _rota_async(self, route) -> None:
+        request = route.request
+        try:
+            if self.deve_bloquear(request.resource_type, request.url):
+                self._registrar_bloqueio(request.resource_type)
+                await route.abort()
+            else:
+                self.permitidas += 1
+                await route.continue_()
+        except Exception:
+            pass
+
+    def instalar(self, context) -> None:
+        """Instala o interceptor num contexto da API síncrona."""
+        context.route("**/*", self._rota)
+        context.on("response", self._registrar_resposta)
+
+    async def instalar_async(self, context) -> None:
+        """Instala o interceptor num contexto da API assíncrona."""
+        await context.route("**/*", self._rota_async)
+        context.on("response", self._registrar_resposta)
+
+    def relatorio(self) -> Dict[str, object]:
+        """
+        Resumo das requisições desde o último reiniciar().
+
+        Returns:
+            Dicionário com bloqueadas, permitidas, bytes_baixados,
+            bytes_economizados (estimativa) e bloqueadas_por_tipo
+        """
+        return {
+            "bloqueadas": self.bloqueadas,
+            "permitidas": self.permitidas,
+            "bytes_baixados": self.bytes_baixados,
+            "bytes_economizados": self.bytes_economizados,
+            "bloqueadas_por_tipo": dict(self.bloqueadas_por_tipo),
+        }
+
+    def imprimir_relatorio(self, reiniciar: bool = True) -> Optional[Dict[str, object]]:
+        """Imprime o resumo da página e opcionalmente zera as estatísticas."""
+        r = self.relatorio()
+        print(
+            f"Interceptação: {r['bloqueadas']} bloqueadas, "
+            f"~{r['bytes_economizados'] / 1024:.0f} KB economizados, "
+            f"{r['bytes_baixados'] / 1024:.0f} KB baixados"
+        )
+        if reiniciar:
+            self.reiniciar()
+        return r
@@ -0,0 +1,119 @@
+import importlib
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+
+class Marketplace:
+    """
+    Adaptador de um marketplace: tudo o que muda de um site para outro.
+
+    O motor (ShopeeScraper) cuida de pool, lote, HTTP, captura, sinks,
+    prazos e métricas; o adaptador só descreve o site: seletores das
+    cascatas, descoberta da listagem, contexto do navegador (locale,
+    fuso, cabeçalhos), rota da API de item, locale dos preços e os
+    overlays/banners. Subclasses sobrescrevem os atributos de classe e,
+    se o site tiver API, requisicao_api()/parse_api().
+    """
+
+    nome = "generico"
+    base_url = ""
+    dominios: Tuple[str, ...] = ()
+    # ex.: "mercadolivre:" separa as estatísticas do SelectorRegistry por site
+    prefixo_cascata = ""
+    locale_preco = "es-AR"
+
+    listing_selectors: List[str] = []
+    nome_selectors: List[str] = []
+    preco_selectors: List[str] = []
+    elemento_produto_selectors: List[str] = ["main"]
+    overlay_selectors: List[str] = []
+    banner_selectors: List[str] = []
+    # clica num banner da vitrine antes de procurar produtos (sites em que a home não lista nada)
+    clicar_banner = False
+    # o site entrega o produto num XHR que a CapturaApi entende (hoje só a Shopee)
+    captura_xhr = False
+
+    context_args: Dict[str, object] = {}
+    extra_headers: Dict[str, str] = {}
+    init_script: Optional[str] = None
+
+    def cascata(self, nome: str) -> str:
+        """Nome da cascata no SelectorRegistry (com o prefixo do site)."""
+        return f"{self.prefixo_cascata}{nome}"
+
+    def absoluto(self, href: str) -> str:
+        """Resolve um href relativo no domínio do site."""
+        return urljoin(self.base_url + "/", href)
+
+    def atende(self, url: str) -> bool:
+        """True se a URL pertence a um dos domínios do site."""
+        host = urlparse(url).hostname or ""
+        return any(host == d or host.endswith("." + d) for d in self.dominios)
+
+    def id_item(self, link: str) -> Optional[str]:
+        """Id estável do produto no site (None = link sem id reconhecível)."""
+        return None
+
+    def requisicao_api(self, link: str) -> Optional[Tuple[str, Dict[str, str]]]:
+        """URL e parâmetros da API de item para o link (None = site sem API conhecida)."""
+        return None
+
+    def parse_api(self, payload: object) -> Optional[Dict[str, object]]:
+        """Converte o JSON da API de item nos campos do produto."""
+        return None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}()"
+
+
+# nome -> ("módulo:Classe", domínios); os módulos só são importados no primeiro uso
+REGISTRO: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "shopee": ("scraper.site_shopee:Shopee", ("shopee.com.ar",)),
+    "mercadolivre": ("scraper.site_mercadolivre:MercadoLivre", ("mercadolivre.com.br",)),
+}
+
+_instancias: Dict[str, Marketplace] = {}
+
+
+def registrar_marketplace(nome: str, alvo: str, dominios: Tuple[str, ...]) -> None:
+    """
+    Registra um adaptador sem importá-lo.
+
+    Args:
+        nome: Nome curto (ex.: "shopee")
+        alvo: "pacote.modulo:Classe" do adaptador
+        dominios: Domínios atendidos (subdomínios incluídos)
+    """
+    REGISTRO[nome] = (alvo, tuple(dominios))
+    _instancias.pop(nome, None)
+
+
+def obter_marketplace(nome: str) -> Marketplace:
+    """
+    Instância (compartilhada) do adaptador registrado com esse nome.
+
+    Raises:
+        KeyError: Marketplace não registrado
+    """
+    instancia = _instancias.get(nome)
+    if instancia is None:
+        if nome not in REGISTRO:
+            raise KeyError(f"marketplace desconhecido: {nome} (registrados: {', '.join(sorted(REGISTRO))})")
+        modulo, classe = REGISTRO[nome][0].split(":")
+        instancia = _instancias[nome] = getattr(importlib.import_module(modulo), classe)()
+    return instancia
+
+
+def nome_do_link(url: str) -> Optional[str]:
+    """Nome do marketplace registrado para o domínio da URL, sem importar nada."""
+    host = urlparse(url).hostname or ""
+    for nome, (_, dominios) in REGISTRO.items():
+        if any(host == d or host.endswith("." + d) for d in dominios):
+            return nome
+    return None
+
+
+def marketplace_do_link(url: str) -> Optional[Marketplace]:
+    """Adaptador do domínio da URL (None se nenhum registrado atende)."""
+    nome = nome_do_link(url)
+    return obter_marketplace(nome) if nome is not None else None
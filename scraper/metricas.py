@@ -0,0 +1,247 @@
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Optional, TextIO, Tuple
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+
+# limites (s) dos buckets do histograma de duração das etapas
+BUCKETS_S = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+PREFIXO = "scraper"
+
+Rotulos = Tuple[Tuple[str, str], ...]
+
+
+def _rotulos(rotulos: Optional[Dict[str, object]]) -> Rotulos:
+    return tuple(sorted((k, str(v)) for k, v in (rotulos or {}).items()))
+
+
+def _escapar(valor: str) -> str:
+    return valor.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _formatar_rotulos(rotulos: Rotulos, extra: Optional[Tuple[str, str]] = None) -> str:
+    pares = list(rotulos) + ([extra] if extra else [])
+    if not pares:
+        return ""
+    return "{" + ",".join(f'{k}="{_escapar(v)}"' for k, v in pares) + "}"
+
+
+class _Histograma:
+    __slots__ = ("contagem", "soma", "maximo", "buckets")
+
+    def __init__(self):
+        self.contagem = 0
+        self.soma = 0.0
+        self.maximo = 0.0
+        self.buckets = [0] * len(BUCKETS_S)
+
+    def observar(self, valor: float) -> None:
+        self.contagem += 1
+        self.soma += valor
+        self.maximo = max(self.maximo, valor)
+        for i, limite in enumerate(BUCKETS_S):
+            if valor <= limite:
+                self.buckets[i] += 1
+
+
+class Metricas:
+    """
+    Tempos por etapa e contadores do scraper, com log JSON e texto Prometheus.
+
+    etapa() mede um bloco (launch, goto, overlay, listagem, clique,
+    screenshot, nome, preco, gravacao, ...) num histograma por etapa;
+    contar() soma contadores com rótulos (timeouts por seletor, bytes
+    recebidos). Com um log configurado, cada etapa vira uma linha JSON.
+    texto_prometheus() é o que o endpoint /metrics serve.
+
+    Seguro para várias threads; uma instância global (METRICAS) é usada
+    pelos módulos do scraper.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._etapas: Dict[Tuple[str, Rotulos], _Histograma] = {}
+        self._contadores: Dict[Tuple[str, Rotulos], float] = {}
+        self.log: Optional[TextIO] = None
+
+    def configurar_log(self, destino: Optional[str]) -> None:
+        """
+        Ativa o log JSON (uma linha por etapa/evento).
+
+        Args:
+            destino: Caminho do arquivo, "-" para stderr, ou None para desativar
+        """
+        if self.log is not None and self.log is not sys.stderr:
+            self.log.close()
+        if destino is None:
+            self.log = None
+        elif destino == "-":
+            self.log = sys.stderr
+        else:
+            self.log = open(destino, "a", encoding="utf-8", buffering=1)
+
+    def registrar_log(self, evento: str, **campos) -> None:
+        """Escreve um evento no log JSON (se ativo)."""
+        if self.log is None:
+            return
+        linha = json.dumps({"ts": round(time.time(), 3), "evento": evento, **campos},
+                           ensure_ascii=False, default=str)
+        with self._lock:
+            self.log.write(linha + "\n")
+
+    def observar(self, etapa: str, segundos: float, **rotulos) -> None:
+        """Registra a duração de uma etapa já medida."""
+        chave = (etapa, _rotulos(rotulos))
+        with self._lock:
+            hist = self._etapas.get(chave)
+            if hist is None:
+                hist = self._etapas[chave] = _Histograma()
+            hist.observar(segundos)
+        self.registrar_log("etapa", etapa=etapa, duracao_ms=round(segundos * 1000, 1), **rotulos)
+
+    @contextmanager
+    def etapa(self, nome: str, **rotulos):
+        """
+        Mede o bloco como uma etapa (registrada mesmo se o bloco levantar exceção).
+
+        Uso:
+            with METRICAS.etapa("goto"):
+                page.goto(url)
+        """
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observar(nome, time.perf_counter() - inicio, **rotulos)
+
+    def contar(self, nome: str, valor: float = 1, **rotulos) -> None:
+        """Soma valor ao contador nome{rotulos}."""
+        chave = (nome, _rotulos(rotulos))
+        with self._lock:
+            self._contadores[chave] = self._contadores.get(chave, 0) + valor
+
+    def contador(self, nome: str, **rotulos) -> float:
+        """Valor atual de um contador (0 se nunca incrementado)."""
+        with self._lock:
+            return self._contadores.get((nome, _rotulos(rotulos)), 0)
+
+    def etapas(self) -> Dict[str, Dict[str, float]]:
+        """
+        Resumo por etapa (somando rótulos): contagem, total_s, media_ms e max_ms,
+        da etapa com mais tempo total para a com menos.
+        """
+        resumo: Dict[str, Dict[str, float]] = {}
+        with self._lock:
+            for (nome, _), hist in self._etapas.items():
+                r = resumo.setdefault(nome, {"contagem": 0, "total_s": 0.0, "max_ms": 0.0})
+                r["contagem"] += hist.contagem
+                r["total_s"] += hist.soma
+                r["max_ms"] = max(r["max_ms"], hist.maximo * 1000)
+        for r in resumo.values():
+            r["media_ms"] = r["total_s"] * 1000 / r["contagem"] if r["contagem"] else 0.0
+        return dict(sorted(resumo.items(), key=lambda item: -item[1]["total_s"]))
+
+    def imprimir_resumo(self) -> None:
+        """Tabela das etapas ordenadas pelo tempo total (a etapa quente no topo)."""
+        etapas = self.etapas()
+        if not etapas:
+            return
+        print("Tempo por etapa:")
+        for nome, r in etapas.items():
+            print(f"  {nome:<16} {r['contagem']:>6}x  total {r['total_s']:8.1f}s  "
+                  f"média {r['media_ms']:8.1f}ms  máx {r['max_ms']:8.1f}ms")
+
+    def texto_prometheus(self) -> str:
+        """Todas as métricas no formato de exposição de texto do Prometheus."""
+        linhas = []
+        with self._lock:
+            etapas = sorted(self._etapas.items())
+            contadores = sorted(self._contadores.items())
+
+        if etapas:
+            nome = f"{PREFIXO}_etapa_segundos"
+            linhas.append(f"# HELP {nome} Duração das etapas do scraper")
+            linhas.append(f"# TYPE {nome} histogram")
+            for (etapa, rotulos), hist in etapas:
+                base = (("etapa", etapa),) + rotulos
+                for limite, n in zip(BUCKETS_S, hist.buckets):
+                    linhas.append(f"{nome}_bucket{_formatar_rotulos(base, ('le', str(limite)))} {n}")
+                linhas.append(f"{nome}_bucket{_formatar_rotulos(base, ('le', '+Inf'))} {hist.contagem}")
+                linhas.append(f"{nome}_sum{_formatar_rotulos(base)} {hist.soma:.6f}")
+                linhas.append(f"{nome}_count{_formatar_rotulos(base)} {hist.contagem}")
+
+        tipos_vistos = set()
+        for (contador, rotulos), valor in contadores:
+            nome = f"{PREFIXO}_{contador}"
+            if nome not in tipos_vistos:
+                tipos_vistos.add(nome)
+                linhas.append(f"# TYPE {nome} counter")
+            linhas.append(f"{nome}{_formatar_rotulos(rotulos)} {valor:g}")
+        return "\n".join(linhas) + "\n"
+
+    def reiniciar(self) -> None:
+        """Zera etapas e contadores (o log continua configurado)."""
+        with self._lock:
+            self._etapas.clear()
+            self._contadores.clear()
+
+
+METRICAS = Metricas()
+
+
+def contar_bytes_resposta(response) -> None:
+    """
+    Listener de "response": soma o Content-Length em bytes_recebidos_total.
+
+    Respostas sem Content-Length (chunked) não são somadas, então o total
+    é um limite inferior; ler o corpo para medir custaria um round-trip.
+    """
+    try:
+        tamanho = int(response.headers.get("content-length", 0))
+    except (TypeError, ValueError):
+        return
+    if tamanho:
+        METRICAS.contar("bytes_recebidos_total", tamanho)
+
+
+def servir_metricas(porta: int = 9464, host: str = "127.0.0.1",
+                    metricas: Metricas = METRICAS) -> "ThreadingHTTPServer":
+    """
+    Sobe o endpoint /metrics (texto Prometheus) numa thread daemon.
+
+    Args:
+        porta: Porta local (0 = escolhida pelo sistema)
+        host: Interface (padrão: só local)
+        metricas: Instância exposta
+
+    Returns:
+        O servidor (server.shutdown() para parar)
+    """
+    # só aqui: http.server (e o pacote email que ele puxa) pesa no início de todo comando
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            corpo = metricas.texto_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, porta), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True, name="metricas").start()
+    print(f"Métricas em http://{host}:{server.server_address[1]}/metrics")
+    return server
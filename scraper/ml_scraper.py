@@ -0,0 +1,36 @@
+from typing import Optional
+
+from scraper.browser_pool import BrowserPool
+from scraper.marketplaces import obter_marketplace
+# helpers de comportamento humano compartilhados com o motor
+from scraper.shopee_scraper import ShopeeScraper, human_pause, human_scroll
+
+
+URL_OFERTAS = "https://www.mercadolivre.com.br/ofertas"
+
+
+class MLScraper(ShopeeScraper):
+    """
+    Scraper do Mercado Livre Brasil.
+
+    É o mesmo motor do ShopeeScraper (pool, lote, HTTP, prazos, métricas)
+    com o adaptador MercadoLivre como marketplace padrão: contexto pt-BR,
+    seletores ui-pdp/andes e a API pública de itens.
+    """
+
+    def __init__(self, pool: Optional[BrowserPool] = None):
+        """Inicializa o scraper
+
+        Args:
+            pool: BrowserPool compartilhado entre chamadas (opcional)
+        """
+        super().__init__(pool, marketplace=obter_marketplace("mercadolivre"))
+
+    def scrape_produto(self, url: str = URL_OFERTAS):
+        """
+        Acessa a vitrine, seleciona um produto aleatório e extrai os dados.
+
+        Args:
+            url: URL da vitrine no Mercado Livre (padrão: ofertas do dia)
+        """
+        return super().scrape_produto(url)
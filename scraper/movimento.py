@@ -0,0 +1,260 @@
+import asyncio
+import random
+import time
+from functools import lru_cache
+from typing import List, Sequence, Tuple
+
+from scraper.metricas import METRICAS
+from scraper.resiliencia import registrar_erro
+
+
+# como o gesto chega ao navegador:
+#   passo    - um comando por ponto da trajetória, cada um com sua pausa (padrão)
+#   agrupado - só os pontos-chave; o driver do Playwright interpola os passos entre eles
+#              e os envia de uma vez (linear, sem jitter nem pausa entre os passos do trecho)
+#   pagina   - a trajetória inteira num único page.evaluate, reproduzida pelo JS da página
+# agrupado e pagina mudam o perfil de tempo dos eventos: só valem por opção explícita
+MODOS_MOVIMENTO = ("passo", "agrupado", "pagina")
+MODO_PADRAO = "passo"
+
+# pontos-chave por gesto de mouse no modo agrupado
+PONTOS_CHAVE = 4
+
+# desvio aleatório (px) de cada ponto e pausas (s) entre os passos
+JITTER_PX = 1.5
+PAUSA_MOUSE_S = (0.005, 0.02)
+PAUSA_SCROLL_S = (0.05, 0.25)
+PASSO_SCROLL_PX = (50, 200)
+
+# reproduz mouse e scroll na página; os eventos são sintéticos (isTrusted=false)
+_REPRODUZIR_JS = """
+async ({mouse, scroll}) => {
+    const dormir = ms => new Promise(r => setTimeout(r, ms));
+    for (const [x, y, s] of mouse) {
+        const alvo = document.elementFromPoint(x, y) || document.body;
+        alvo.dispatchEvent(new MouseEvent('mousemove', {clientX: x, clientY: y, bubbles: true, view: window}));
+        await dormir(s * 1000);
+    }
+    for (const [dy, s] of scroll) {
+        (document.scrollingElement || document.body).dispatchEvent(new WheelEvent('wheel', {deltaY: dy, bubbles: true}));
+        window.scrollBy(0, dy);
+        await dormir(s * 1000);
+    }
+}
+"""
+
+Ponto = Tuple[float, float, float]
+
+
+@lru_cache(maxsize=64)
+def curva(passos: int) -> Tuple[float, ...]:
+    """
+    Template ease-in-out (3t² - 2t³) com `passos` pontos.
+
+    Só depende do número de passos, então é calculado uma vez por tamanho
+    e reaproveitado por todos os gestos.
+    """
+    return tuple(3 * t * t - 2 * t * t * t for t in (i / passos for i in range(1, passos + 1)))
+
+
+def trajetoria(start: tuple, end: tuple, passos: int = 20, rng=random) -> List[Ponto]:
+    """
+    Pontos (x, y, pausa_s) do gesto inteiro, numa única passada.
+
+    Mesma curva, jitter de ±1.5px e pausas de 5-20ms do human_move_mouse original.
+    """
+    sx, sy = start
+    dx, dy = end[0] - sx, end[1] - sy
+    uniforme = rng.uniform
+    return [
+        (sx + dx * e + uniforme(-JITTER_PX, JITTER_PX), sy + dy * e + uniforme(-JITTER_PX, JITTER_PX),
+         uniforme(*PAUSA_MOUSE_S))
+        for e in curva(max(1, passos))
+    ]
+
+
+def rajadas_scroll(distancia: int, rng=random) -> List[Tuple[int, float]]:
+    """
+    Rajadas (delta_px, pausa_s) que somam `distancia`.
+
+    Passos de 50-200px (o resto, se menor que 50px, vai inteiro) com pausas
+    de 50-250ms, como no human_scroll original.
+    """
+    rajadas = []
+    restante = abs(distancia)
+    direcao = 1 if distancia > 0 else -1
+    minimo, maximo = PASSO_SCROLL_PX
+    while restante > 0:
+        passo = min(maximo, restante)
+        if passo < minimo:
+            passo = restante
+        passo = rng.randint(min(minimo, passo), passo)
+        rajadas.append((direcao * passo, rng.uniform(*PAUSA_SCROLL_S)))
+        restante -= passo
+    return rajadas
+
+
+def agrupar(pontos: Sequence[Ponto], pontos_chave: int = PONTOS_CHAVE) -> List[Tuple[float, float, int, float]]:
+    """
+    Reduz a trajetória a pontos-chave (x, y, passos, pausa_s).
+
+    Cada ponto-chave substitui um trecho da trajetória: leva o número de
+    passos do trecho (interpolados pelo driver em mouse.move(steps=...)) e
+    a soma das pausas, então o gesto mantém o número de eventos e a duração
+    total, mas não a cadência: dentro do trecho os eventos saem em linha
+    reta e em sequência, e a pausa inteira vem depois.
+    """
+    total = len(pontos)
+    grupos = min(pontos_chave, total)
+    chaves = []
+    anterior = 0
+    for g in range(1, grupos + 1):
+        fim = round(g * total / grupos)
+        x, y, _ = pontos[fim - 1]
+        chaves.append((x, y, fim - anterior, sum(p[2] for p in pontos[anterior:fim])))
+        anterior = fim
+    return chaves
+
+
+def _aguardar_ate(alvo: float) -> None:
+    # a pausa conta a partir do envio anterior: o tempo do comando sai da pausa, não se soma a ela
+    restante = alvo - time.perf_counter()
+    if restante > 0:
+        time.sleep(restante)
+
+
+def _argumento_js(mouse=(), scroll=()) -> dict:
+    return {"mouse": [list(p) for p in mouse], "scroll": [list(r) for r in scroll]}
+
+
+def _reproduzir_na_pagina(page, mouse=(), scroll=(), etapa: str = "mouse") -> int:
+    try:
+        page.evaluate(_REPRODUZIR_JS, _argumento_js(mouse, scroll))
+    except Exception as e:
+        registrar_erro(e, etapa)
+        return 0
+    return 1
+
+
+def mover_mouse(page, start: tuple, end: tuple, passos: int = 20, modo: str = MODO_PADRAO) -> int:
+    """
+    Move o mouse pela trajetória pré-calculada.
+
+    Args:
+        page: Objeto page do Playwright
+        start: Tupla (x, y) inicial
+        end: Tupla (x, y) final
+        passos: Pontos da trajetória
+        modo: passo, agrupado ou pagina (MODOS_MOVIMENTO)
+
+    Returns:
+        Comandos enviados ao navegador
+    """
+    pontos = trajetoria(start, end, passos)
+    if modo == "pagina":
+        enviados = _reproduzir_na_pagina(page, mouse=pontos)
+    else:
+        chaves = agrupar(pontos) if modo == "agrupado" else [(x, y, 1, pausa) for x, y, pausa in pontos]
+        enviados = 0
+        alvo = time.perf_counter()
+        for x, y, n, pausa in chaves:
+            try:
+                if n > 1:
+                    page.mouse.move(x, y, steps=n)
+                else:
+                    page.mouse.move(x, y)
+            except Exception as e:
+                # página fechada ou navegando: o resto do gesto também falharia
+                registrar_erro(e, "mouse")
+                break
+            enviados += 1
+            alvo += pausa
+            _aguardar_ate(alvo)
+    METRICAS.contar("humano_comandos_total", enviados, gesto="mouse")
+    return enviados
+
+
+def rolar(page, distancia: int = 500, modo: str = MODO_PADRAO) -> int:
+    """
+    Rola a página pelas rajadas pré-calculadas.
+
+    As rajadas já são poucas (uma por 50-200px), então passo e agrupado
+    enviam um mouse.wheel por rajada; pagina envia um único evaluate.
+
+    Returns:
+        Comandos enviados ao navegador
+    """
+    rajadas = rajadas_scroll(distancia)
+    if modo == "pagina":
+        enviados = _reproduzir_na_pagina(page, scroll=rajadas, etapa="scroll")
+    else:
+        enviados = 0
+        alvo = time.perf_counter()
+        for delta, pausa in rajadas:
+            try:
+                page.mouse.wheel(0, delta)
+            except Exception as e:
+                registrar_erro(e, "scroll")
+                break
+            enviados += 1
+            alvo += pausa
+            _aguardar_ate(alvo)
+    METRICAS.contar("humano_comandos_total", enviados, gesto="scroll")
+    return enviados
+
+
+async def _despachar(chamadas, etapa: str) -> int:
+    """
+    Envia as chamadas em pipeline: cada comando parte no seu horário sem
+    esperar a resposta do anterior; as respostas são recolhidas no fim.
+    """
+    loop = asyncio.get_running_loop()
+    pendentes = []
+    alvo = loop.time()
+    for enviar, pausa in chamadas:
+        pendentes.append(asyncio.ensure_future(enviar()))
+        alvo += pausa
+        await asyncio.sleep(max(0.0, alvo - loop.time()))
+    erros = [r for r in await asyncio.gather(*pendentes, return_exceptions=True) if isinstance(r, Exception)]
+    if erros:
+        registrar_erro(erros[0], etapa)
+    return len(pendentes) - len(erros)
+
+
+async def mover_mouse_async(page, start: tuple, end: tuple, passos: int = 20, modo: str = MODO_PADRAO) -> int:
+    """Versão assíncrona de mover_mouse (comandos em pipeline)."""
+    pontos = trajetoria(start, end, passos)
+    if modo == "pagina":
+        try:
+            await page.evaluate(_REPRODUZIR_JS, _argumento_js(mouse=pontos))
+            enviados = 1
+        except Exception as e:
+            registrar_erro(e, "mouse")
+            enviados = 0
+    else:
+        chaves = agrupar(pontos) if modo == "agrupado" else [(x, y, 1, pausa) for x, y, pausa in pontos]
+        enviados = await _despachar(
+            [((lambda x=x, y=y, n=n: page.mouse.move(x, y, steps=n)), pausa) for x, y, n, pausa in chaves],
+            "mouse",
+        )
+    METRICAS.contar("humano_comandos_total", enviados, gesto="mouse")
+    return enviados
+
+
+async def rolar_async(page, distancia: int = 500, modo: str = MODO_PADRAO) -> int:
+    """Versão assíncrona de rolar (comandos em pipeline)."""
+    rajadas = rajadas_scroll(distancia)
+    if modo == "pagina":
+        try:
+            await page.evaluate(_REPRODUZIR_JS, _argumento_js(scroll=rajadas))
+            enviados = 1
+        except Exception as e:
+            registrar_erro(e, "scroll")
+            enviados = 0
+    else:
+        enviados = await _despachar(
+            [((lambda delta=delta: page.mouse.wheel(0, delta)), pausa) for delta, pausa in rajadas],
+            "scroll",
+        )
+    METRICAS.contar("humano_comandos_total", enviados, gesto="scroll")
+    return enviados
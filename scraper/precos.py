@@ -0,0 +1,214 @@
+import re
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional
+from urllib.parse import urlparse
+
+from scraper.marketplaces import marketplace_do_link
+
+
+LOCALE_PADRAO = "es-AR"
+
+# moeda assumida para um "$" sem prefixo
+MOEDA_POR_LOCALE = {"es-AR": "ARS", "pt-BR": "BRL"}
+
+# locale deduzido pelo domínio do link, para domínios sem adaptador registrado
+LOCALE_POR_DOMINIO = (
+    (".com.br", "pt-BR"),
+    (".com.ar", "es-AR"),
+)
+
+# colunas acrescentadas por normalizar_linhas
+CAMPOS_PRECO = (
+    "preco_valor",
+    "preco_centavos",
+    "preco_moeda",
+    "preco_original",
+    "preco_maximo",
+    "preco_desconto_pct",
+    "preco_parcelas",
+    "preco_valor_parcela",
+)
+
+_SIMBOLOS = (
+    (re.compile(r"R\$"), "BRL"),
+    (re.compile(r"AR\$|\bARS\b"), "ARS"),
+    (re.compile(r"US\$|\bUSD\b"), "USD"),
+)
+_SEPARADOR_QUEBRADO = re.compile(r"(?<=\d)\s*([.,])\s*(?=\d)")
+_PARCELAS = re.compile(
+    r"(\d{1,2})\s*(?:x|cuotas?|parcelas?)\s*(?:sin interés\s*|sem juros\s*)?(?:de\s*)?"
+    r"(?:R\$|AR\$|US\$|\$)?\s*(\d[\d.,]*)",
+    re.IGNORECASE,
+)
+# o sufixo é obrigatório: "%" sozinho também aparece em juros e em nomes
+_DESCONTO = re.compile(r"\b(\d{1,3})\s*%\s*(?:OFF|de desconto|dto\.?|desc\.?)", re.IGNORECASE)
+_NUMERO = re.compile(r"\d[\d.,]*\d|\d")
+_FAIXA = re.compile(r"\d\s*[-–~]\s*(?:R\$|AR\$|US\$|\$)?\s*\d")
+
+
+class PrecoNormalizado(NamedTuple):
+    """Preço numérico extraído de um texto livre."""
+
+    valor: Optional[Decimal]
+    centavos: Optional[int]
+    moeda: Optional[str]
+    valor_original: Optional[Decimal]
+    valor_maximo: Optional[Decimal]
+    desconto_pct: Optional[int]
+    parcelas: Optional[int]
+    valor_parcela: Optional[Decimal]
+    texto_original: str
+
+
+def converter_numero(texto: str, locale: str = LOCALE_PADRAO) -> Optional[Decimal]:
+    """
+    Converte "1.234,56" / "19,66" / "12.999" / "1,234.56" em Decimal.
+
+    O último separador decide: vírgula é decimal; ponto seguido de
+    exatamente 3 dígitos é milhar em es-AR/pt-BR (como em "$ 12.999").
+
+    Returns:
+        Decimal ou None se o texto não for um número
+    """
+    texto = texto.strip(".,")
+    if not texto:
+        return None
+    ultimo = max(texto.rfind(","), texto.rfind("."))
+    if ultimo == -1:
+        inteiro, decimal = texto, ""
+    else:
+        sep = texto[ultimo]
+        depois = texto[ultimo + 1:]
+        milhar_latino = sep == "." and len(depois) == 3 and locale in MOEDA_POR_LOCALE
+        if milhar_latino or (sep == "," and len(depois) == 3 and texto.count(",") > 1):
+            inteiro, decimal = texto, ""
+        else:
+            inteiro, decimal = texto[:ultimo], depois
+    inteiro = re.sub(r"[.,]", "", inteiro)
+    try:
+        return Decimal(f"{inteiro}.{decimal}" if decimal else inteiro)
+    except InvalidOperation:
+        return None
+
+
+def locale_do_link(link: Optional[str], padrao: str = LOCALE_PADRAO) -> str:
+    """
+    Locale dos preços do link: o locale_preco do adaptador do domínio ou,
+    sem adaptador, o do sufixo do domínio (.com.br -> pt-BR, .com.ar -> es-AR).
+    """
+    site = marketplace_do_link(link or "")
+    if site is not None:
+        return site.locale_preco
+    host = urlparse(link or "").hostname or ""
+    for sufixo, locale in LOCALE_POR_DOMINIO:
+        if host.endswith(sufixo):
+            return locale
+    return padrao
+
+
+@lru_cache(maxsize=65536)
+def normalizar_preco(texto: Optional[str], locale: str = LOCALE_PADRAO) -> PrecoNormalizado:
+    """
+    Normaliza um texto de preço bruto.
+
+    Args:
+        texto: Texto extraído da página (ex.: "R$\\n19\\n,\\n66", "$ 12.999 - $ 15.000",
+               "12x R$ 10,00", "$ 20.000 $ 15.000 25% OFF")
+        locale: "es-AR" ou "pt-BR" (define a moeda de um "$" sem prefixo)
+
+    Returns:
+        PrecoNormalizado; valor é o menor preço encontrado (preço atual),
+        valor_original o maior quando há preço riscado, valor_maximo o topo
+        de uma faixa "a - b".
+
+    Resultados ficam em cache: textos de preço se repetem muito entre
+    linhas, então um lote grande custa bem menos que uma chamada por linha.
+    """
+    vazio = PrecoNormalizado(None, None, None, None, None, None, None, None, texto or "")
+    if not texto:
+        return vazio
+
+    t = " ".join(texto.split())
+    t = _SEPARADOR_QUEBRADO.sub(r"\1", t)
+
+    moeda = None
+    for padrao, codigo in _SIMBOLOS:
+        if padrao.search(t):
+            moeda = codigo
+            break
+    if moeda is None and "$" in t:
+        moeda = MOEDA_POR_LOCALE.get(locale)
+
+    parcelas = valor_parcela = None
+    m = _PARCELAS.search(t)
+    if m:
+        parcelas = int(m.group(1))
+        valor_parcela = converter_numero(m.group(2), locale)
+        t = t[:m.start()] + " " + t[m.end():]
+
+    desconto = None
+    m = next((m for m in _DESCONTO.finditer(t) if int(m.group(1)) <= 100), None)
+    if m:
+        desconto = int(m.group(1))
+        t = t[:m.start()] + " " + t[m.end():]
+
+    valores = [v for v in (converter_numero(n, locale) for n in _NUMERO.findall(t)) if v is not None]
+    if not valores:
+        return vazio._replace(moeda=moeda, parcelas=parcelas, valor_parcela=valor_parcela, desconto_pct=desconto)
+
+    valor = min(valores)
+    original = maximo = None
+    if len(valores) > 1 and max(valores) != valor:
+        if _FAIXA.search(t):
+            maximo = max(valores)
+        else:
+            original = max(valores)
+
+    return PrecoNormalizado(
+        valor=valor,
+        centavos=int((valor * 100).to_integral_value()),
+        moeda=moeda,
+        valor_original=original,
+        valor_maximo=maximo,
+        desconto_pct=desconto,
+        parcelas=parcelas,
+        valor_parcela=valor_parcela,
+        texto_original=texto,
+    )
+
+
+def normalizar_lote(textos: Iterable[Optional[str]], locale: str = LOCALE_PADRAO) -> List[PrecoNormalizado]:
+    """Normaliza uma sequência de textos de preço com o mesmo locale."""
+    return [normalizar_preco(t, locale) for t in textos]
+
+
+def normalizar_linhas(linhas: List[Dict[str, object]], campo: str = "preco",
+                      locale: Optional[str] = None) -> List[Dict[str, object]]:
+    """
+    Acrescenta as colunas de CAMPOS_PRECO a cada linha (em lote).
+
+    Args:
+        linhas: Resultados do scraper (dicionários com preco e link)
+        campo: Coluna com o texto do preço
+        locale: Força um locale; None deduz pelo domínio do link de cada linha
+
+    Returns:
+        A mesma lista, com as linhas atualizadas
+
+    Pode ser passada como `transformar` de um Sink para normalizar cada lote
+    no momento da gravação.
+    """
+    for linha in linhas:
+        p = normalizar_preco(linha.get(campo), locale or locale_do_link(linha.get("link")))
+        linha.update({
+            "preco_valor": p.valor,
+            "preco_centavos": p.centavos,
+            "preco_moeda": p.moeda,
+            "preco_original": p.valor_original,
+            "preco_maximo": p.valor_maximo,
+            "preco_desconto_pct": p.desconto_pct,
+            "preco_parcelas": p.parcelas,
+            "preco_valor_parcela": p.valor_parcela,
+        })
+    return linhas
@@ -0,0 +1,264 @@
+import random
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, Optional, TypeVar
+
+from scraper.metricas import METRICAS
+
+
+T = TypeVar("T")
+
+TIMEOUT = "timeout"
+BLOQUEADO = "bloqueado"
+SELETOR = "seletor"
+NAVEGACAO = "navegacao"
+OUTRO = "outro"
+
+# fração do prazo restante que cada etapa pode consumir; o resto fica para
+# as etapas seguintes e para uma nova tentativa
+FRACAO_PRAZO = {
+    "goto": 0.5,
+    "clique": 0.3,
+    "espera": 0.3,
+    "seletor": 0.15,
+}
+
+# trechos das mensagens do Playwright/Firefox para falhas de rede e navegação
+_MARCAS_NAVEGACAO = ("net::ERR_", "NS_ERROR_", "NS_BINDING_", "Navigation failed", "Target closed",
+                     "Target page, context or browser has been closed", "interrupted by another navigation")
+
+
+class BloqueadoError(Exception):
+    """O site recusou a requisição HTTP (anti-bot, captcha ou rate limit)."""
+
+
+class ErroEtapa(Exception):
+    """Falha classificada de uma etapa do scraping."""
+
+    tipo = OUTRO
+
+    def __init__(self, mensagem: str, etapa: Optional[str] = None):
+        super().__init__(mensagem)
+        self.etapa = etapa
+
+
+class PrazoEsgotado(ErroEtapa):
+    tipo = TIMEOUT
+
+
+class PaginaBloqueada(ErroEtapa):
+    tipo = BLOQUEADO
+
+
+class SeletorAusente(ErroEtapa):
+    tipo = SELETOR
+
+
+class ErroNavegacao(ErroEtapa):
+    tipo = NAVEGACAO
+
+
+def classificar_erro(erro: BaseException) -> str:
+    """
+    Classe do erro: timeout, bloqueado, seletor, navegacao ou outro.
+
+    Reconhece as exceções deste pacote, o TimeoutError do Playwright (pelo
+    nome, sem importar o Playwright), timeouts do requests e as mensagens
+    de erro de rede do navegador.
+    """
+    if isinstance(erro, ErroEtapa):
+        return erro.tipo
+    if isinstance(erro, BloqueadoError):
+        return BLOQUEADO
+    nome = type(erro).__name__
+    if isinstance(erro, TimeoutError) or "Timeout" in nome:
+        return TIMEOUT
+    mensagem = str(erro)
+    if "Connection" in nome or any(marca in mensagem for marca in _MARCAS_NAVEGACAO):
+        return NAVEGACAO
+    return OUTRO
+
+
+def registrar_erro(erro: BaseException, etapa: str) -> str:
+    """Classifica o erro, conta erros_total{tipo,etapa} e devolve o tipo."""
+    tipo = classificar_erro(erro)
+    METRICAS.contar("erros_total", tipo=tipo, etapa=etapa)
+    return tipo
+
+
+class Prazo:
+    """
+    Orçamento de tempo total de um produto, repartido entre as etapas.
+
+    timeout_ms(etapa, teto_ms) devolve o timeout da etapa: o teto antigo
+    (ex.: 60000 no goto), limitado à fração FRACAO_PRAZO[etapa] do que
+    resta do prazo. Com o prazo esgotado levanta PrazoEsgotado, então uma
+    página ruim para de consumir tempo em vez de esgotar cada timeout.
+    """
+
+    def __init__(self, total_s: float, relogio: Callable[[], float] = time.monotonic):
+        self.total_s = total_s
+        self.relogio = relogio
+        self._fim = relogio() + total_s
+
+    def restante_s(self) -> float:
+        return max(0.0, self._fim - self.relogio())
+
+    def esgotado(self) -> bool:
+        return self.restante_s() <= 0
+
+    def timeout_ms(self, etapa: str, teto_ms: float, minimo_ms: float = 250) -> int:
+        """
+        Timeout (ms) da etapa dentro do prazo.
+
+        Raises:
+            PrazoEsgotado: Se não resta tempo
+        """
+        restante = self.restante_s()
+        if restante <= 0:
+            raise PrazoEsgotado(f"prazo de {self.total_s:.0f}s do produto esgotado", etapa)
+        fatia_ms = restante * 1000 * FRACAO_PRAZO.get(etapa, 1.0)
+        return int(max(minimo_ms, min(teto_ms, fatia_ms)))
+
+
+def repetir(funcao: Callable[[], T], tentativas: int = 2, base_s: float = 1.0, max_s: float = 8.0,
+            repetir_em: Iterable[str] = (TIMEOUT, NAVEGACAO), prazo: Optional[Prazo] = None,
+            etapa: str = "produto", dormir: Callable[[float], None] = time.sleep) -> T:
+    """
+    Chama funcao com novas tentativas e backoff exponencial (com jitter).
+
+    Só erros das classes em repetir_em são repetidos: bloqueio e seletor
+    ausente não melhoram na hora e sobem direto. Com um prazo, a espera
+    nunca passa do tempo restante.
+
+    Args:
+        funcao: Operação sem argumentos
+        tentativas: Total de tentativas (1 = sem repetição)
+        base_s: Espera antes da segunda tentativa (dobra a cada nova)
+        max_s: Teto da espera
+        repetir_em: Classes de erro repetidas
+        prazo: Prazo do produto (opcional)
+        etapa: Rótulo das métricas
+        dormir: Função de espera (testes)
+
+    Raises:
+        A última exceção de funcao
+    """
+    repetir_em = tuple(repetir_em)
+    for tentativa in range(1, tentativas + 1):
+        try:
+            return funcao()
+        except Exception as e:
+            tipo = registrar_erro(e, etapa)
+            if tentativa >= tentativas or tipo not in repetir_em:
+                raise
+            espera = min(max_s, base_s * 2 ** (tentativa - 1)) * random.uniform(0.5, 1.0)
+            if prazo is not None and prazo.restante_s() <= espera:
+                raise
+            print(f"{etapa}: {tipo} ({e}); tentativa {tentativa + 1} em {espera:.1f}s")
+            METRICAS.contar("retentativas_total", etapa=etapa, tipo=tipo)
+            dormir(espera)
+    raise ValueError("tentativas precisa ser >= 1")
+
+
+class _EstadoDominio:
+    __slots__ = ("resultados", "aberto_ate", "aberturas", "meio_aberto")
+
+    def __init__(self, janela: int):
+        self.resultados: Deque[bool] = deque(maxlen=janela)
+        self.aberto_ate = 0.0
+        self.aberturas = 0
+        self.meio_aberto = False
+
+
+class Disjuntor:
+    """
+    Circuit breaker por domínio.
+
+    Guarda os últimos `janela` resultados de cada domínio; quando a taxa
+    de erro passa de `limiar` (com pelo menos `min_amostras`), o domínio
+    fica pausado por `pausa_s`. Passada a pausa, o próximo resultado é o
+    teste: sucesso fecha o disjuntor, falha reabre com a pausa dobrada
+    (até `pausa_max_s`).
+    """
+
+    def __init__(self, janela: int = 20, min_amostras: int = 5, limiar: float = 0.5,
+                 pausa_s: float = 30.0, pausa_max_s: float = 600.0,
+                 relogio: Callable[[], float] = time.monotonic, dormir: Callable[[float], None] = time.sleep):
+        """Configura o disjuntor
+
+        Args:
+            janela: Resultados recentes considerados por domínio
+            min_amostras: Resultados mínimos antes de poder abrir
+            limiar: Taxa de erro (0-1) que abre o disjuntor
+            pausa_s: Primeira pausa do domínio
+            pausa_max_s: Teto da pausa
+            relogio: Fonte de tempo (testes)
+            dormir: Função de espera (testes)
+        """
+        self.janela = janela
+        self.min_amostras = min_amostras
+        self.limiar = limiar
+        self.pausa_s = pausa_s
+        self.pausa_max_s = pausa_max_s
+        self.relogio = relogio
+        self.dormir = dormir
+        self._lock = threading.Lock()
+        self._dominios: Dict[str, _EstadoDominio] = {}
+
+    def _estado(self, dominio: str) -> _EstadoDominio:
+        estado = self._dominios.get(dominio)
+        if estado is None:
+            estado = self._dominios[dominio] = _EstadoDominio(self.janela)
+        return estado
+
+    def pausa_restante(self, dominio: str) -> float:
+        """Segundos até o domínio voltar a ser visitado (0 = liberado)."""
+        with self._lock:
+            return max(0.0, self._estado(dominio).aberto_ate - self.relogio())
+
+    def aberto(self, dominio: str) -> bool:
+        return self.pausa_restante(dominio) > 0
+
+    def aguardar(self, dominio: str) -> float:
+        """
+        Bloqueia enquanto o domínio estiver pausado.
+
+        Returns:
+            Segundos esperados
+        """
+        espera = self.pausa_restante(dominio)
+        if espera > 0:
+            print(f"Disjuntor aberto para {dominio}, pausando {espera:.0f}s")
+            METRICAS.observar("disjuntor_pausa", espera, dominio=dominio)
+            self.dormir(espera)
+        return espera
+
+    def registrar(self, dominio: str, sucesso: bool) -> None:
+        """Registra o resultado de uma visita ao domínio."""
+        with self._lock:
+            estado = self._estado(dominio)
+            if estado.meio_aberto:
+                estado.meio_aberto = False
+                if sucesso:
+                    estado.aberturas = 0
+                    estado.resultados.clear()
+                    print(f"Disjuntor de {dominio} fechado")
+                else:
+                    self._abrir(dominio, estado)
+                return
+            estado.resultados.append(sucesso)
+            amostras = len(estado.resultados)
+            falhas = amostras - sum(estado.resultados)
+            if amostras >= self.min_amostras and falhas / amostras >= self.limiar:
+                self._abrir(dominio, estado)
+
+    def _abrir(self, dominio: str, estado: _EstadoDominio) -> None:
+        pausa = min(self.pausa_max_s, self.pausa_s * 2 ** estado.aberturas)
+        estado.aberturas += 1
+        estado.aberto_ate = self.relogio() + pausa
+        estado.resultados.clear()
+        estado.meio_aberto = True
+        METRICAS.contar("disjuntor_aberturas_total", dominio=dominio)
+        print(f"Disjuntor aberto para {dominio}: pausa de {pausa:.0f}s")
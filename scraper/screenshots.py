@@ -0,0 +1,186 @@
+import hashlib
+import io
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional
+
+from scraper.metricas import METRICAS
+
+
+MODOS = ("desligado", "viewport", "elemento", "completa")
+FORMATOS = ("png", "jpeg", "webp")
+EXTENSOES = {"png": "png", "jpeg": "jpg", "webp": "webp"}
+
+
+class ScreenshotManager:
+    """
+    Screenshots com modo, formato e qualidade configuráveis, gravados em segundo plano.
+
+    Modos:
+        desligado: não captura
+        viewport: só a área visível (rápido, tamanho fixo)
+        elemento: recorte do elemento do produto (cai para viewport se não achar)
+        completa: página inteira (comportamento original)
+
+    A captura em si precisa acontecer na thread da página, mas a conversão
+    (WebP), o hash e a escrita em disco vão para um pool de threads, então
+    a próxima navegação não espera o arquivo. O nome do arquivo é o hash do
+    conteúdo: capturas idênticas não são regravadas e execuções paralelas
+    nunca sobrescrevem o arquivo uma da outra.
+    """
+
+    def __init__(self, modo: str = "completa", formato: str = "png", qualidade: int = 80,
+                 diretorio: str = "screenshots", workers: int = 2):
+        """Inicializa o gerenciador
+
+        Args:
+            modo: desligado, viewport, elemento ou completa
+            formato: png, jpeg ou webp (webp requer Pillow)
+            qualidade: Qualidade 1-100 para jpeg/webp
+            diretorio: Diretório de saída
+            workers: Threads para conversão e escrita
+
+        Raises:
+            ValueError: Modo ou formato desconhecido
+            ImportError: formato webp sem Pillow instalado
+        """
+        if modo not in MODOS:
+            raise ValueError(f"Modo de screenshot inválido: {modo}")
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato de screenshot inválido: {formato}")
+        if formato == "webp":
+            try:
+                import PIL.Image  # noqa: F401
+            except ImportError as e:
+                raise ImportError("Screenshots em WebP requerem Pillow: pip install Pillow") from e
+        self.modo = modo
+        self.formato = formato
+        self.qualidade = qualidade
+        self.diretorio = diretorio
+        self.workers = workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pendentes: List[Future] = []
+        self.salvos = 0
+        self.duplicados = 0
+
+    @property
+    def ativo(self) -> bool:
+        return self.modo != "desligado"
+
+    def _opcoes_captura(self) -> dict:
+        """Argumentos de page.screenshot para o formato configurado."""
+        if self.formato == "jpeg":
+            return {"type": "jpeg", "quality": self.qualidade}
+        # png direto, ou png como entrada da conversão para webp
+        return {"type": "png"}
+
+    def _submeter(self, dados: bytes) -> Future:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="screenshot")
+        futuro = self._executor.submit(self._gravar, dados)
+        self._pendentes = [f for f in self._pendentes if not f.done()] + [futuro]
+        return futuro
+
+    def _gravar(self, dados: bytes) -> str:
+        """Converte (se webp), calcula o hash e grava se ainda não existir. Roda no pool."""
+        if self.formato == "webp":
+            from PIL import Image
+            saida = io.BytesIO()
+            Image.open(io.BytesIO(dados)).save(saida, format="WEBP", quality=self.qualidade)
+            dados = saida.getvalue()
+
+        digest = hashlib.sha256(dados).hexdigest()[:20]
+        caminho = os.path.join(self.diretorio, f"produto_{digest}.{EXTENSOES[self.formato]}")
+        if os.path.exists(caminho):
+            self.duplicados += 1
+            return caminho
+
+        os.makedirs(self.diretorio, exist_ok=True)
+        tmp = f"{caminho}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(dados)
+        os.replace(tmp, caminho)
+        self.salvos += 1
+        METRICAS.contar("screenshot_bytes_total", len(dados))
+        print(f"Screenshot salvo em: {caminho}")
+        return caminho
+
+    def capturar(self, page, seletores: Optional[List[str]] = None) -> Optional[Future]:
+        """
+        Captura a página (API síncrona) e agenda a gravação em segundo plano.
+
+        Args:
+            page: Objeto page do Playwright
+            seletores: Seletores do elemento do produto (modo elemento)
+
+        Returns:
+            Future com o caminho do arquivo, ou None se desligado ou se a captura falhou
+        """
+        if not self.ativo:
+            return None
+        opcoes = self._opcoes_captura()
+        try:
+            with METRICAS.etapa("screenshot", modo=self.modo):
+                dados = None
+                # um seletor por vez, na ordem de prioridade: com a união, a
+                # ordem do documento decidiria e um "main" externo venceria
+                for seletor in seletores if self.modo == "elemento" and seletores else []:
+                    try:
+                        alvo = page.locator(seletor)
+                        if alvo.count() > 0:
+                            dados = alvo.first.screenshot(timeout=2000, **opcoes)
+                            break
+                    except Exception:
+                        dados = None
+                if dados is None:
+                    dados = page.screenshot(full_page=self.modo == "completa", **opcoes)
+        except Exception as e:
+            print(f"Erro ao capturar screenshot: {e}")
+            return None
+        return self._submeter(dados)
+
+    async def capturar_async(self, page, seletores: Optional[List[str]] = None) -> Optional[Future]:
+        """Mesma coisa que capturar(), para páginas da API assíncrona."""
+        if not self.ativo:
+            return None
+        opcoes = self._opcoes_captura()
+        try:
+            with METRICAS.etapa("screenshot", modo=self.modo):
+                dados = None
+                for seletor in seletores if self.modo == "elemento" and seletores else []:
+                    try:
+                        alvo = page.locator(seletor)
+                        if await alvo.count() > 0:
+                            dados = await alvo.first.screenshot(timeout=2000, **opcoes)
+                            break
+                    except Exception:
+                        dados = None
+                if dados is None:
+                    dados = await page.screenshot(full_page=self.modo == "completa", **opcoes)
+        except Exception as e:
+            print(f"Erro ao capturar screenshot: {e}")
+            return None
+        return self._submeter(dados)
+
+    def aguardar(self) -> List[str]:
+        """
+        Espera as gravações pendentes terminarem.
+
+        Returns:
+            Caminhos gravados (ou já existentes) das capturas pendentes
+        """
+        caminhos = []
+        for futuro in self._pendentes:
+            try:
+                caminhos.append(futuro.result())
+            except Exception as e:
+                print(f"Erro ao salvar screenshot: {e}")
+        self._pendentes = []
+        return caminhos
+
+    def fechar(self) -> None:
+        """Espera as gravações pendentes e encerra o pool de threads."""
+        self.aguardar()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
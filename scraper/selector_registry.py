@@ -0,0 +1,136 @@
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+
+class SelectorRegistry:
+    """
+    Registro de acertos/erros/latência por seletor, persistido em JSON.
+
+    Cada cascata (ex.: "nome", "preco", "listagem", "overlay") guarda as
+    estatísticas dos seus seletores. ordenar() devolve a cascata com o
+    seletor que está vencendo agora na frente, então um seletor obsoleto
+    (como uma classe ofuscada que a Shopee trocou) deixa de custar um
+    timeout em toda página. Seletores com muitos erros seguidos são
+    sinalizados como obsoletos.
+
+    A taxa de acerto é uma média móvel exponencial: reage rápido quando o
+    site muda e não fica presa ao histórico antigo.
+    """
+
+    def __init__(self, caminho: str = "seletores.json", limite_obsoleto: int = 20,
+                 salvar_a_cada: int = 25, peso: float = 0.2):
+        """Inicializa o registro, carregando estatísticas anteriores se existirem
+
+        Args:
+            caminho: Arquivo JSON onde as estatísticas são persistidas
+            limite_obsoleto: Erros seguidos para um seletor ser considerado obsoleto
+            salvar_a_cada: Salva no disco a cada N registros
+            peso: Peso de cada nova observação na taxa de acerto (0-1)
+        """
+        self.caminho = caminho
+        self.limite_obsoleto = limite_obsoleto
+        self.salvar_a_cada = salvar_a_cada
+        self.peso = peso
+        self._pendentes = 0
+        self._avisados = set()
+        self.stats: Dict[str, Dict[str, dict]] = {}
+        self.carregar()
+
+    def carregar(self) -> None:
+        """Lê as estatísticas do arquivo (ignora arquivo ausente ou corrompido)."""
+        try:
+            with open(self.caminho, encoding="utf-8") as f:
+                self.stats = json.load(f)
+        except (OSError, ValueError):
+            self.stats = {}
+
+    def salvar(self) -> None:
+        """Grava as estatísticas de forma atômica (arquivo temporário + rename)."""
+        tmp = f"{self.caminho}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.stats, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.caminho)
+        self._pendentes = 0
+
+    def _stat(self, cascata: str, seletor: str) -> dict:
+        return self.stats.setdefault(cascata, {}).setdefault(seletor, {
+            "acertos": 0,
+            "erros": 0,
+            "erros_seguidos": 0,
+            "taxa": 0.5,
+            "latencia_media_ms": 0.0,
+            "ultimo_acerto": None,
+        })
+
+    def registrar(self, cascata: str, seletor: str, acerto: bool, latencia_s: float = 0.0) -> None:
+        """
+        Registra o resultado de uma tentativa de seletor.
+
+        Args:
+            cascata: Nome da cascata ("nome", "preco", ...)
+            seletor: Seletor tentado
+            acerto: True se o seletor encontrou o que se procurava
+            latencia_s: Tempo gasto na tentativa
+        """
+        s = self._stat(cascata, seletor)
+        if acerto:
+            s["acertos"] += 1
+            s["erros_seguidos"] = 0
+            s["ultimo_acerto"] = time.time()
+        else:
+            s["erros"] += 1
+            s["erros_seguidos"] += 1
+        s["taxa"] = s["taxa"] * (1 - self.peso) + (1.0 if acerto else 0.0) * self.peso
+        total = s["acertos"] + s["erros"]
+        s["latencia_media_ms"] += (latencia_s * 1000 - s["latencia_media_ms"]) / total
+
+        if s["erros_seguidos"] == self.limite_obsoleto and (cascata, seletor) not in self._avisados:
+            self._avisados.add((cascata, seletor))
+            print(f"AVISO: seletor '{seletor}' ({cascata}) falhou {self.limite_obsoleto} vezes seguidas")
+
+        self._pendentes += 1
+        if self.salvar_a_cada and self._pendentes >= self.salvar_a_cada:
+            self.salvar()
+
+    def registrar_cascata(self, cascata: str, tentados: List[str], vencedor: Optional[str],
+                          latencia_s: float = 0.0) -> None:
+        """
+        Registra uma cascata tentada em ordem: os seletores antes do vencedor erraram.
+
+        Args:
+            cascata: Nome da cascata
+            tentados: Seletores na ordem em que foram tentados
+            vencedor: Seletor que acertou (None = nenhum acertou)
+            latencia_s: Tempo total da cascata (atribuído ao vencedor)
+        """
+        for sel in tentados:
+            if sel == vencedor:
+                self.registrar(cascata, sel, True, latencia_s)
+                return
+            self.registrar(cascata, sel, False)
+
+    def ordenar(self, cascata: str, seletores: List[str]) -> List[str]:
+        """
+        Reordena a cascata pela taxa de acerto recente (maior primeiro).
+
+        Seletores sem histórico mantêm a posição relativa original (ordenação
+        estável com taxa inicial 0.5).
+        """
+        stats = self.stats.get(cascata, {})
+        return sorted(seletores, key=lambda sel: -stats.get(sel, {}).get("taxa", 0.5))
+
+    def obsoletos(self) -> Dict[str, List[str]]:
+        """
+        Seletores que pararam de funcionar.
+
+        Returns:
+            Dicionário cascata -> seletores com pelo menos limite_obsoleto erros seguidos
+        """
+        resultado = {}
+        for cascata, seletores in self.stats.items():
+            ruins = [sel for sel, s in seletores.items() if s["erros_seguidos"] >= self.limite_obsoleto]
+            if ruins:
+                resultado[cascata] = ruins
+        return resultado
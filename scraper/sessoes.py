@@ -0,0 +1,117 @@
+import json
+import os
+import re
+import time
+from typing import Dict, Optional
+
+
+# identidade usada quando o contexto não passa por proxy
+SEM_PROXY = "direto"
+
+
+def _nome_arquivo(identidade: str) -> str:
+    """Identidade (host:porta, nome de conta...) como nome de arquivo seguro."""
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", identidade) or SEM_PROXY
+
+
+class ArmazemSessoes:
+    """
+    Sessões do navegador (storage_state: cookies + localStorage) por identidade.
+
+    Cada identidade (normalmente o proxy do contexto) tem um arquivo JSON
+    em `diretorio`. Um contexto novo carrega a sessão já aquecida, então a
+    primeira página chega sem os overlays de região/login e com os cookies
+    que o anti-bot já aceitou. As gravações são atômicas, então vários
+    workers podem compartilhar o diretório: quem aquece uma sessão primeiro
+    a entrega para os outros.
+
+    Uma sessão é regravada no máximo a cada `renovar_s` (para guardar os
+    cookies renovados pelo site) e descartada depois de `validade_s` desde
+    a criação, ou quando o contexto que a usava foi bloqueado.
+    """
+
+    def __init__(self, diretorio: str = "sessoes", validade_s: float = 24 * 3600, renovar_s: float = 3600):
+        """Abre (ou cria) o diretório de sessões
+
+        Args:
+            diretorio: Onde ficam os arquivos (compartilhe entre workers/containers)
+            validade_s: Idade máxima de uma sessão desde a primeira gravação
+            renovar_s: Intervalo mínimo entre regravações da mesma sessão
+        """
+        self.diretorio = diretorio
+        self.validade_s = validade_s
+        self.renovar_s = renovar_s
+        os.makedirs(diretorio, exist_ok=True)
+        # última gravação feita por este processo, por identidade
+        self._salvo_em: Dict[str, float] = {}
+        self.carregadas = 0
+        self.descartadas = 0
+
+    def _caminho(self, identidade: str) -> str:
+        return os.path.join(self.diretorio, f"{_nome_arquivo(identidade)}.json")
+
+    def _ler(self, identidade: str) -> Optional[dict]:
+        try:
+            with open(self._caminho(identidade), encoding="utf-8") as f:
+                registro = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return registro if isinstance(registro, dict) and "estado" in registro else None
+
+    def carregar(self, identidade: str, agora: Optional[float] = None) -> Optional[dict]:
+        """
+        storage_state da identidade, pronto para browser.new_context(storage_state=...).
+
+        Cookies já vencidos são removidos; uma sessão vencida é apagada.
+
+        Returns:
+            O estado, ou None se não há sessão válida (contexto começa do zero)
+        """
+        agora = time.time() if agora is None else agora
+        registro = self._ler(identidade)
+        if registro is None:
+            return None
+        if agora - registro.get("criado_em", 0) > self.validade_s:
+            print(f"Sessão de {identidade} venceu, começando do zero")
+            self.descartar(identidade)
+            return None
+        estado = registro["estado"]
+        # expires -1 = cookie de sessão
+        estado["cookies"] = [c for c in estado.get("cookies", [])
+                             if c.get("expires", -1) in (-1, None) or c["expires"] > agora]
+        self.carregadas += 1
+        return estado
+
+    def precisa_salvar(self, identidade: str, agora: Optional[float] = None) -> bool:
+        """True se este processo ainda não gravou a sessão ou a gravação tem mais de renovar_s."""
+        agora = time.time() if agora is None else agora
+        salvo_em = self._salvo_em.get(identidade)
+        return salvo_em is None or agora - salvo_em >= self.renovar_s
+
+    def salvar(self, identidade: str, estado: dict, agora: Optional[float] = None) -> None:
+        """
+        Grava a sessão de forma atômica, mantendo a data de criação original.
+
+        Args:
+            identidade: Chave da sessão (ex.: host:porta do proxy)
+            estado: Resultado de context.storage_state()
+        """
+        agora = time.time() if agora is None else agora
+        anterior = self._ler(identidade)
+        criado_em = anterior.get("criado_em", agora) if anterior else agora
+        caminho = self._caminho(identidade)
+        # temporário por processo: workers diferentes podem gravar ao mesmo tempo
+        tmp = f"{caminho}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"criado_em": criado_em, "salvo_em": agora, "estado": estado}, f, ensure_ascii=False)
+        os.replace(tmp, caminho)
+        self._salvo_em[identidade] = agora
+
+    def descartar(self, identidade: str) -> None:
+        """Apaga a sessão (ex.: o contexto foi bloqueado com ela)."""
+        self._salvo_em.pop(identidade, None)
+        try:
+            os.remove(self._caminho(identidade))
+        except FileNotFoundError:
+            return
+        self.descartadas += 1
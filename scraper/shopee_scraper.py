@@ -1,18 +1,65 @@
 import csv
 import random
 import time
-import os
-from typing import List, Optional, Dict
-from playwright.sync_api import sync_playwright
+from typing import Iterator, List, Optional, Dict, Tuple
+from urllib.parse import parse_qsl, urldefrag, urlencode, urljoin, urlsplit, urlunsplit
+from contextlib import ExitStack, contextmanager
+from functools import partial
+
+from scraper.browser_pool import BrowserPool
+from scraper.extraction import SELETOR_PRECO_TEXTO, extrair_nome_preco
+from scraper.fluxo import CAPACIDADE_PADRAO, Esteira
+from scraper.frontier import Frontier, normalizar_url
+from scraper.http_fetcher import STATUS_BLOQUEIO, BloqueadoError, HttpFetcher
+from scraper.incremental import EstadoIncremental
+from scraper.marketplaces import Marketplace, marketplace_do_link
+from scraper.metricas import METRICAS
+from scraper.movimento import MODO_PADRAO, mover_mouse, rolar
+from scraper.resiliencia import Disjuntor, PaginaBloqueada, Prazo, classificar_erro, registrar_erro, repetir
+from scraper.screenshots import ScreenshotManager
+from scraper.sessoes import ArmazemSessoes
+# constantes da Shopee reexportadas (compatibilidade com quem importava daqui)
+from scraper.site_shopee import (
+    ANTI_DETECTION_SCRIPT,
+    CONTEXT_ARGS,
+    ELEMENTO_PRODUTO_SELECTORS,
+    EXTRA_HTTP_HEADERS,
+    LISTING_SELECTORS,
+    NOME_SELECTORS,
+    PRECO_SELECTORS,
+    Shopee,
+)
+from scraper.waits import espera_inteligente
+
+
+# href do próprio elemento, do primeiro link dentro dele ou do link que o
+# envolve (cards da listagem em div, como div[data-sqe='item'])
+_HREF_JS = """
+e => {
+    const a = e.matches('a[href]') ? e : (e.querySelector('a[href]') || e.closest('a[href]'));
+    return a ? a.getAttribute('href') : null;
+}
+"""
+
+_HREFS_JS = f"els => els.map({_HREF_JS.strip()})"
+
+def parece_preco(texto: str) -> bool:
+    """
+    Valida se o texto parece ser um preço contendo $, AR ou qualquer dígito.
+    """
+    return bool(texto) and ("$" in texto or "AR" in texto or any(char.isdigit() for char in texto))
+
 
 
 def human_pause(min_s: float = 0.3, max_s: float = 1.2) -> None:
     """
     Simula o tempo que um usuário real levaria para ler ou decidir uma ação (tempo min_s e max_s segundos)
     """
-    time.sleep(random.uniform(min_s, max_s))
+    duracao = random.uniform(min_s, max_s)
+    time.sleep(duracao)
+    METRICAS.observar("humano_pausa", duracao)
 
-def human_move_mouse(page, start: tuple, end: tuple, steps: int = 20) -> None:
+def human_move_mouse(page, start: tuple, end: tuple, steps: int = 20, modo: str = MODO_PADRAO) -> None:
     """
     Move o mouse de forma suave e natural do ponto inicial ao ponto final.
     
@@ -21,77 +68,91 @@ def human_move_mouse(page, start: tuple, end: tuple, steps: int = 20) -> None:
         start: Tupla (x, y) com coordenadas iniciais
         end: Tupla (x, y) com coordenadas finais
         steps: Número de passos intermediários (mais passos = movimento mais suave)
+        modo: Como o gesto chega ao navegador (passo, agrupado ou pagina; ver scraper.movimento)
     
     Usa uma curva ease-in-out para acelerar no início e desacelerar no fim,
     simulando movimento natural e add desvios aleatórios (jitter) para
-    parecer mais humano.
+    parecer mais humano. A trajetória inteira é calculada antes; no modo
+    agrupado (opcional) só os pontos-chave viram comandos para o navegador.
     """
-    sx, sy = start
-    ex, ey = end
-    
-    # interpolar posição do mouse em varios passos
-    for i in range(1, steps + 1):
-        t = i / steps  # progresso de 0 a 1
-        
-        # Aplicar curva ease-in-out: acelera no início, desacelera no fim
-        # Fórmula: 3t² - 2t³ com movimento suave
-        easing = 3 * t * t - 2 * t * t * t
-        
-        # Calcular posição com desvio aleatório (jitter)
-        ix = sx + (ex - sx) * easing + random.uniform(-1.5, 1.5)
-        iy = sy + (ey - sy) * easing + random.uniform(-1.5, 1.5)
-        
-        try:
-            page.mouse.move(ix, iy)
-        except Exception:
-            pass  
-    
-        time.sleep(random.uniform(0.005, 0.02))  # pausa curta entre cada passo do movimento
+    inicio = time.perf_counter()
+    mover_mouse(page, start, end, steps, modo)
+    METRICAS.observar("humano_mouse", time.perf_counter() - inicio)
 
 
-def human_scroll(page, distance: int = 500) -> None:
+def human_scroll(page, distance: int = 500, modo: str = MODO_PADRAO) -> None:
     """
     Rola a página de forma gradual e natural, simulando scroll humano.
     
     Args:
         page: Objeto page do Playwright
         distance: Distância total em pixels (positivo = rolar para baixo, negativo = para cima)
+        modo: Como o gesto chega ao navegador (passo, agrupado ou pagina; ver scraper.movimento)
     
     A função divide o scroll em múltiplos passos pequenos e aleatórios,
     com pausas entre eles, imitando o comportamento de scroll de um usuário real.
     """
-    remaining = distance
-    direction = 1 if remaining > 0 else -1  # 1 para baixo, -1 para cima
-    
-    # Continuar rolando até completar a distância total
-    while abs(remaining) > 0:
-        step = min(200, abs(remaining)) #tamanho do passo: max de 200px 
-        
-        # Se restar menos de 50px, usar o que sobrou
-        if step < 50:
-            step = abs(remaining)
-        
-        step = random.randint(min(50, step), step) # add variação aleatória ao tamanho do passo
-        
-        # Executar o scroll
-        try:
-            page.mouse.wheel(0, direction * step)
-        except Exception:
-            pass  
-        remaining -= direction * step  # atualiza a distância restante
-        time.sleep(random.uniform(0.05, 0.25)) # pausa entre cada passo (50-250ms)
+    inicio = time.perf_counter()
+    rolar(page, distance, modo)
+    METRICAS.observar("humano_scroll", time.perf_counter() - inicio)
 
 
 class ShopeeScraper:
     """
     Classe principal para scraping de produtos da Shopee Argentina.
+
+    É também o motor genérico dos outros marketplaces: o que é específico
+    do site (seletores, contexto, overlays, API) vem de um adaptador
+    Marketplace. Cada navegação usa o adaptador registrado para o domínio
+    da URL, então o mesmo scraper (e o mesmo pool) atende Shopee e
+    Mercado Livre; URLs de domínios sem adaptador usam self.marketplace.
     """
     
-    def __init__(self):
+    def __init__(self, pool: Optional[BrowserPool] = None, marketplace: Optional[Marketplace] = None):
         """Inicializa o scraper
+
+        Args:
+            pool: BrowserPool compartilhado entre chamadas (opcional). Sem pool,
+                  cada chamada lança e fecha o próprio navegador.
+            marketplace: Adaptador padrão (contexto do navegador e URLs sem adaptador); padrão Shopee
         """
+        self.marketplace = marketplace if marketplace is not None else Shopee()
+        self._site = None
         self.proxy = None
-        self.storage_state_path = None
+        self.storage_state_path = None  # diretório de sessões (storage_state por proxy), compartilhável entre workers
+        self.pool = pool
+        self.screenshots = ScreenshotManager()  # modo/formato dos screenshots (gravação em segundo plano)
+        self.interceptor = None  # RequestInterceptor opcional instalado nos contextos
+        self.espera_inteligente = False  # True troca pausas fixas por esperas em seletores
+        self.jitter = (0.2, 0.6)  # pausa extra (s) depois de uma espera inteligente
+        self.movimento = MODO_PADRAO  # como mouse/scroll chegam ao navegador: passo, agrupado ou pagina (scraper.movimento)
+        self.limite_rede_ociosa_ms = 2000
+        self.extracao_em_uma_passada = True  # False volta à cascata de inner_text sequenciais
+        self.registro_seletores = None  # SelectorRegistry opcional que reordena as cascatas
+        self.sink = None  # Sink de saída em lote (None = append direto no produtos.csv)
+        self.historico = None  # HistoricoPrecos opcional: cada resultado vira uma observação de preço
+        self.http = None  # HttpFetcher opcional: tenta cada produto via HTTP antes do navegador
+        self.somente_http = False  # True: links que o HTTP não resolve são pulados em vez de abrir o navegador
+        self.captura = None  # CapturaApi opcional: lê o produto das respostas XHR antes do DOM
+        self.proxies = None  # PoolProxies opcional: proxy por contexto/requisição, com saúde e limites de taxa
+        self.prazo_produto_s = 45.0  # orçamento total de um produto (navegação, esperas, extração e novas tentativas)
+        self.tentativas = 2  # tentativas por produto em timeout/erro de navegação, com backoff exponencial
+        self.disjuntor = Disjuntor()  # pausa o domínio quando a taxa de erro dispara (None desliga)
+        self._pool_ativo = None
+        self._prazo = None
+
+    @property
+    def site(self) -> Marketplace:
+        """Adaptador da página atual (o da última URL navegada)."""
+        return self._site or self.marketplace
+
+    def _entrar(self, url: str) -> Marketplace:
+        """Escolhe o adaptador de url: o padrão se ele atende o domínio, senão o do registro."""
+        if self.marketplace.atende(url):
+            self._site = self.marketplace
+        else:
+            self._site = marketplace_do_link(url) or self.marketplace
+        return self._site
     
     def _close_overlay_if_present(self, page) -> bool:
         """
@@ -103,23 +164,13 @@ class ShopeeScraper:
         Returns:
             True se conseguiu fechar algum overlay, False caso contrário
         
-        Tenta múltiplos seletores CSS comuns usados pela Shopee para botões de fechar.
+        Tenta os seletores de botão de fechar do site (overlay_selectors do adaptador).
         Usa movimento de mouse humano antes de clicar para parecer mais natural.
         """
-        # seletores CSS para botões de fechar modais
-        close_selectors = [
-            "svg.V4lWQZ",  
-            "button[aria-label='Fechar']",  
-            "button[aria-label='Close']",  
-            ".shopee-modal__close", 
-            ".modal-close", 
-            "button[data-testid='close']",  
-            "button:has-text('Fechar')",  
-            "button:has-text('Close')",  
-        ]
-
         # tenta cada seletor até encontrar um elemento visível
-        for sel in close_selectors:
+        ordem = self._ordem("overlay", self.site.overlay_selectors)
+        inicio = time.monotonic()
+        for i, sel in enumerate(ordem):
             try:
                 # Buscar elemento pelo seletor CSS
                 el = page.query_selector(sel)
@@ -135,7 +186,8 @@ class ShopeeScraper:
                             page, 
                             (random.randint(50, 200), random.randint(50, 200)),  # posição inicial
                             (cx, cy),  # posição do botão
-                            steps=random.randint(8, 20)  # número de passos do movimento
+                            steps=random.randint(8, 20),  # número de passos do movimento
+                            modo=self.movimento,
                         )
                         human_pause(0.2, 0.6)
                         try:
@@ -146,13 +198,16 @@ class ShopeeScraper:
                         
                         human_pause(0.5, 1.5)
                         print(f"Fechou overlay com seletor: {sel}")
+                        METRICAS.contar("overlays_fechados_total")
+                        # sem overlay nenhum seletor é culpado, então só se registra quando um fecha
+                        self._registrar("overlay", ordem[:i + 1], sel, time.monotonic() - inicio)
                         return True
             except Exception:
                 continue  
         return False
 
-    """def _click_banner_if_present(self, page) -> bool:
-        
+    def _click_banner_if_present(self, page) -> bool:
+        """
         Tenta localizar e clicar em um banner promocional se presente na página.
         
         Args:
@@ -162,18 +217,10 @@ class ShopeeScraper:
             True se conseguiu clicar no banner, False caso contrário
         
         Útil para páginas que exibem banners de promoções/ofertas que precisam
-        ser clicados para acessar conteúdo específico.
-        
-        # seletores para banners promocionais da Shopee
-        banner_selectors = [
-            "img.uXN1L5",  
-            "img[alt='Banner']",  
-            "img[alt=\"Banner\"]",  
-            "img[src*='down-ar.img.susercontent.com']",  
-        ]
-
+        ser clicados para acessar conteúdo específico (banner_selectors do adaptador).
+        """
         # Tentar cada seletor de banner
-        for sel in banner_selectors:
+        for sel in self.site.banner_selectors:
             try:
                 el = page.query_selector(sel)
                 
@@ -191,22 +238,468 @@ class ShopeeScraper:
                             page, 
                             (random.randint(50, 200), random.randint(50, 200)),
                             (cx, cy), 
-                            steps=random.randint(8, 20)
+                            steps=random.randint(8, 20),
+                            modo=self.movimento,
                         )
                         human_pause(0.2, 0.6)
                         try:
                             el.click()
-                        except Exception:
+                        except Exception as e:
                             # Fallback: clicar diretamente nas coordenadas
+                            registrar_erro(e, "banner")
                             page.mouse.click(cx, cy)
                         
                         human_pause(1.0, 2.0)
                         print(f"Clicou no banner com seletor: {sel}")
                         return True
-            except Exception:
+            except Exception as e:
+                registrar_erro(e, "banner")
                 continue  
 
-        return False  """
+        return False
+
+    def criar_pool(self, **kwargs) -> BrowserPool:
+        """
+        Cria um BrowserPool com o contexto do marketplace padrão (Shopee Argentina).
+
+        Args:
+            **kwargs: Repassados para BrowserPool (tamanho, max_paginas, max_rss_mb...)
+
+        Returns:
+            Pool ainda não iniciado; use `with` ou iniciar()
+        """
+        kwargs.setdefault("proxy", self.proxy)
+        kwargs.setdefault("interceptor", self.interceptor)
+        kwargs.setdefault("proxies", self.proxies)
+        if "sessoes" not in kwargs and self.storage_state_path:
+            kwargs["sessoes"] = ArmazemSessoes(self.storage_state_path)
+        return BrowserPool(
+            context_args=self.marketplace.context_args,
+            init_script=self.marketplace.init_script,
+            extra_headers=self.marketplace.extra_headers,
+            **kwargs,
+        )
+
+    def criar_http(self, **kwargs) -> HttpFetcher:
+        """
+        Cria um HttpFetcher com os cabeçalhos do marketplace padrão.
+
+        Args:
+            **kwargs: Repassados para HttpFetcher (timeout, pool_conexoes...)
+        """
+        kwargs.setdefault("headers", self.marketplace.extra_headers)
+        kwargs.setdefault("base_url", self.marketplace.base_url)
+        kwargs.setdefault("proxies", self.proxies)
+        return HttpFetcher(**kwargs)
+
+    @contextmanager
+    def _sessao(self):
+        """
+        Fornece uma página de um contexto aquecido e a devolve ao final.
+
+        Usa self.pool quando configurado (navegador reaproveitado entre
+        chamadas); caso contrário cria um pool temporário só para esta
+        chamada, como antes.
+        """
+        try:
+            if self.pool is not None:
+                self._pool_ativo = self.pool
+                with self.pool.pagina() as page:
+                    self._preparar_pagina(page)
+                    yield page
+                return
+
+            with self.criar_pool() as pool:
+                self._pool_ativo = pool
+                with pool.pagina() as page:
+                    self._preparar_pagina(page)
+                    yield page
+            print("Navegador fechado.")
+        finally:
+            self._pool_ativo = None
+            self._prazo = None
+            if self.registro_seletores is not None:
+                self.registro_seletores.salvar()
+            if self.sink is not None:
+                self.sink.flush()
+            if self.captura is not None:
+                self.captura.imprimir_relatorio()
+
+    def _preparar_pagina(self, page) -> None:
+        """Instala os listeners por página (captura XHR) numa página recém-aberta."""
+        if self.captura is not None:
+            self.captura.instalar(page)
+
+    def _ordem(self, cascata: str, seletores: List[str]) -> List[str]:
+        """
+        Ordem em que a cascata deve ser tentada (vencedores recentes primeiro).
+        """
+        if self.registro_seletores is None:
+            return list(seletores)
+        return self.registro_seletores.ordenar(self.site.cascata(cascata), seletores)
+
+    def _contar_timeout(self, erro: Exception, cascata: str, seletor: str) -> None:
+        """Conta seletor_timeouts_total{cascata,seletor} quando o erro é um timeout do Playwright."""
+        if type(erro).__name__ == "TimeoutError":
+            METRICAS.contar("seletor_timeouts_total", cascata=cascata, seletor=seletor)
+
+    def _registrar(self, cascata: str, tentados: List[str], vencedor: Optional[str], latencia_s: float) -> None:
+        """
+        Registra o resultado de uma cascata no registro de seletores (se houver).
+        """
+        # vencedor fora da cascata (ex.: fallback por texto do preço): todos os tentados falharam
+        falhos = tentados[:tentados.index(vencedor)] if vencedor in tentados else tentados
+        for sel in falhos:
+            METRICAS.contar("seletor_falhas_total", cascata=cascata, seletor=sel)
+        if self.registro_seletores is not None:
+            self.registro_seletores.registrar_cascata(self.site.cascata(cascata), tentados, vencedor, latencia_s)
+
+    def _pausa(self, min_s: float, max_s: float) -> None:
+        """
+        Pausa de leitura: fixa no modo padrão, só o jitter no modo espera inteligente.
+        """
+        if self.espera_inteligente:
+            human_pause(*self.jitter)
+        else:
+            human_pause(min_s, max_s)
+
+    def _timeout_ms(self, etapa: str, teto_ms: float) -> int:
+        """Timeout da etapa: o teto, limitado pelo prazo do produto em andamento (se houver)."""
+        if self._prazo is None:
+            return int(teto_ms)
+        return self._prazo.timeout_ms(etapa, teto_ms)
+
+    def _aguardar(self, page, seletores: List[str], estado: str, min_s: float, max_s: float) -> None:
+        """
+        Espera a página ficar pronta depois de uma navegação.
+
+        Args:
+            page: Objeto page do Playwright
+            seletores: Seletores que indicam conteúdo pronto
+            estado: "attached" ou "visible"
+            min_s, max_s: Pausa fixa usada quando espera_inteligente está desligada
+
+        No modo espera inteligente a espera é proporcional à prontidão real
+        (seletor presente e rede ociosa, com limite) mais um jitter pequeno.
+        """
+        if not self.espera_inteligente:
+            human_pause(min_s, max_s)
+            return
+        esperado = espera_inteligente(page, seletores, estado, timeout_ms=self._timeout_ms("espera", 15000),
+                                      limite_rede_ms=self.limite_rede_ociosa_ms)
+        print(f"Página pronta em {esperado:.1f}s")
+        human_pause(*self.jitter)
+
+    def _abrir_loja(self, page, url: str) -> None:
+        """
+        Navega até a loja, rola um pouco a página e fecha overlays iniciais.
+
+        Args:
+            page: Objeto page do Playwright
+            url: URL da loja
+        """
+        site = self._entrar(url)
+        print(f"---> Acessando loja: {url}")
+        with METRICAS.etapa("goto", pagina="loja"):
+            page.goto(url, 
+                      timeout=self._timeout_ms("goto", 60000), 
+                      wait_until="domcontentloaded")
+
+        self._aguardar(page, site.listing_selectors, "attached", 3, 6)
+        human_scroll(page, 
+                     distance=random.randint(300, 800), modo=self.movimento)
+        self._pausa(1, 2)
+        try:
+            with METRICAS.etapa("overlay"):
+                self._close_overlay_if_present(page)
+            self._pausa(0.5, 1.2)
+        except Exception as e:
+            print(f"Falha ao fechar overlay ({registrar_erro(e, 'overlay')}): {e}")
+        if site.clicar_banner:
+            self._click_banner_if_present(page)
+
+    def _encontrar_produtos(self, page) -> list:
+        """
+        Procura os produtos da listagem tentando múltiplos seletores.
+
+        Args:
+            page: Objeto page do Playwright
+
+        Returns:
+            Lista de locators dos produtos (vazia se nenhum seletor funcionar)
+        """
+        print("---> Procurando produtos na página...")    
+        produtos = []
+        # tentativa de cada seletor até encontrar produtos
+        ordem = self._ordem("listagem", self.site.listing_selectors)
+        inicio = time.monotonic()
+        vencedor = None
+        with METRICAS.etapa("listagem"):
+            for selector in ordem:
+                produtos = page.locator(selector).all()
+                if produtos:
+                    print(f"Encontrados {len(produtos)} produtos com seletor: {selector}")
+                    vencedor = selector
+                    break  
+        self._registrar("listagem", ordem, vencedor, time.monotonic() - inicio)
+        return produtos
+
+    def _coletar_links(self, page, produtos: list) -> List[str]:
+        """
+        Extrai os hrefs absolutos dos produtos, sem repetições e na ordem da listagem.
+
+        Args:
+            page: Objeto page do Playwright (usado para resolver URLs relativas)
+            produtos: Lista de locators retornada por _encontrar_produtos
+
+        Returns:
+            Lista de URLs únicas de produtos
+        """
+        hrefs = []
+        for produto in produtos:
+            try:
+                href = produto.evaluate(_HREF_JS)
+            except Exception:
+                continue
+            if href:
+                hrefs.append(href)
+        return dedupe_links(hrefs, base_url=page.url)
+
+    def _hrefs_da_listagem(self, page) -> List[str]:
+        """
+        hrefs de todos os produtos renderizados, numa única chamada por seletor.
+
+        Usa a ordem do registro de seletores, sem registrar (é chamado a cada rolagem).
+        """
+        for selector in self._ordem("listagem", self.site.listing_selectors):
+            try:
+                hrefs = page.eval_on_selector_all(selector, _HREFS_JS)
+            except Exception:
+                continue
+            hrefs = [h for h in hrefs if h]
+            if hrefs:
+                return hrefs
+        return []
+
+    def _rolar_listagem(self, page, max_rolagens: int = 40, paradas: int = 2) -> List[str]:
+        """
+        Rola a listagem até parar de aparecer link novo (scroll infinito).
+
+        Args:
+            page: Página na listagem da loja
+            max_rolagens: Limite de rolagens por página
+            paradas: Rolagens seguidas sem link novo para considerar o fim
+
+        Returns:
+            Links únicos de produtos encontrados na página
+        """
+        links = dedupe_links(self._hrefs_da_listagem(page), base_url=page.url)
+        sem_novos = 0
+        for _ in range(max_rolagens):
+            human_scroll(page, distance=random.randint(800, 1400), modo=self.movimento)
+            self._pausa(0.8, 1.5)
+            atuais = dedupe_links(links + self._hrefs_da_listagem(page), base_url=page.url)
+            if len(atuais) == len(links):
+                sem_novos += 1
+                if sem_novos >= paradas:
+                    break
+            else:
+                sem_novos = 0
+            links = atuais
+        return links
+
+    def _colher_listagem(self, page, url: str, frontier: Frontier, max_paginas: int) -> None:
+        """
+        Percorre as páginas da listagem acrescentando os produtos à fronteira.
+
+        Para na primeira página que não traz nenhum link novo (fim do
+        catálogo ou paginação ignorada pelo site). A página atingida é
+        persistida a cada passo para o crawl retomar dali.
+        """
+        for n in range(frontier.pagina_listagem, max_paginas):
+            self._abrir_loja(page, url_pagina(url, n))
+            links = self._rolar_listagem(page)
+            novas = frontier.adicionar(links, base_url=page.url)
+            print(f"---> Página {n + 1} da listagem: {len(links)} links, {novas} novos")
+            frontier.pagina_listagem = n + 1
+            frontier.salvar()
+            if novas == 0:
+                break
+        frontier.listagem_concluida = True
+        frontier.salvar()
+
+    def _extrair_dados(self, page) -> Dict[str, str]:
+        """
+        Na página do produto: rola, captura screenshot e extrai nome, preço e link.
+
+        Args:
+            page: Objeto page do Playwright já na página do produto
+
+        Returns:
+            Dicionário com as chaves nome, preco e link
+        """
+        human_scroll(page, 
+                     distance=random.randint(200, 500), modo=self.movimento)
+        self._pausa(1, 2)
+
+        self.screenshots.capturar(page, self.site.elemento_produto_selectors)
+
+        nome, preco = self._extrair_nome_preco(page)
+
+        link_produto = page.url
+        
+        print(f"\nProduto encontrado:")
+        print(f"Nome: {nome}")
+        print(f"Preço: {preco}")
+        print(f"Link: {link_produto}")
+        if self.interceptor is not None:
+            self.interceptor.imprimir_relatorio()
+        return {"nome": nome, "preco": preco, "link": link_produto}
+
+    def _dados_da_api(self, page, link: Optional[str] = None) -> Optional[Dict[str, object]]:
+        """
+        Devolve o produto assim que o payload XHR da página chega (se a captura estiver ativa).
+
+        Args:
+            page: Página do produto com a captura instalada
+            link: URL do produto (None = page.url)
+
+        Returns:
+            Dicionário com nome, preco, link e os campos da API, ou None para cair no DOM
+        """
+        if self.captura is None or not self.site.captura_xhr:
+            return None
+        with METRICAS.etapa("api"):
+            dados = self.captura.aguardar(page, link)
+        if dados is None:
+            print("Payload da API não chegou, usando seletores do DOM.")
+            return None
+
+        self.screenshots.capturar(page, self.site.elemento_produto_selectors)
+        dados["link"] = page.url
+        print(f"\nProduto encontrado (API):")
+        print(f"Nome: {dados['nome']}")
+        print(f"Preço: {dados['preco']}")
+        print(f"Link: {dados['link']}")
+        if self.interceptor is not None:
+            self.interceptor.imprimir_relatorio()
+        return dados
+
+    def _extrair_nome_preco(self, page) -> Tuple[str, str]:
+        """
+        Extrai nome e preço do produto.
+
+        Usa a extração em uma passada (toda a cascata de seletores num único
+        page.evaluate) e só cai na cascata sequencial se o evaluate falhar.
+
+        Returns:
+            Tupla (nome, preco)
+        """
+        if self.extracao_em_uma_passada:
+            try:
+                nome_selectors = self._ordem("nome", self.site.nome_selectors)
+                preco_selectors = self._ordem("preco", self.site.preco_selectors)
+                inicio = time.monotonic()
+                with METRICAS.etapa("nome_preco"):
+                    dados = extrair_nome_preco(page, nome_selectors, preco_selectors)
+                latencia = time.monotonic() - inicio
+                self._registrar("nome", nome_selectors, dados["seletor_nome"], latencia)
+                self._registrar("preco", preco_selectors, dados["seletor_preco"], latencia)
+                print(f"Nome via {dados['seletor_nome']} | Preço via {dados['seletor_preco']}")
+                return dados["nome"], dados["preco"]
+            except Exception as e:
+                print(f"Extração em uma passada falhou ({e}), usando cascata sequencial")
+        return self._extrair_nome_preco_sequencial(page)
+
+    def _extrair_nome_preco_sequencial(self, page) -> Tuple[str, str]:
+        """
+        Cascata original: um inner_text com timeout por seletor.
+
+        Returns:
+            Tupla (nome, preco)
+        """
+        with METRICAS.etapa("nome"):
+            nome = self._extrair_nome_sequencial(page)
+        with METRICAS.etapa("preco"):
+            preco = self._extrair_preco_sequencial(page)
+        return nome, preco
+
+    def _extrair_nome_sequencial(self, page) -> str:
+        """Cascata de seletores do nome (texto com mais de 3 caracteres)."""
+        nome = "NOME NÃO ENCONTRADO"  
+
+        for sel in self._ordem("nome", self.site.nome_selectors):
+            inicio = time.monotonic()
+            try:
+                nome = page.locator(sel).first.inner_text(timeout=self._timeout_ms("seletor", 5000)) # primeiro elemento que corresponda ao seletor
+                
+                # se o nome for valido
+                if nome and len(nome) > 3:
+                    self._registrar("nome", [sel], sel, time.monotonic() - inicio)
+                    break 
+            except Exception as e:
+                self._contar_timeout(e, "nome", sel)
+            self._registrar("nome", [sel], None, time.monotonic() - inicio)
+        
+        print("-----> Tentando extrair nome do produto...")
+        return nome
+
+    def _extrair_preco_sequencial(self, page) -> str:
+        """Cascata de seletores do preço, com busca por texto ($, AR$, ARS) no final."""
+        preco = "PREÇO NÃO ENCONTRADO"  
+        
+        print("-----> Tentando extrair preço...")
+        for sel in self._ordem("preco", self.site.preco_selectors):
+            inicio = time.monotonic()
+            try:
+                # Buscar todos os elementos que correspondam
+                elementos = page.locator(sel).all()
+                for el in elementos[:5]:
+                    try:
+                        texto = el.inner_text(timeout=self._timeout_ms("seletor", 2000))
+                        
+                        # Validar se o texto parece ser um preço contendo $ ou qualquer dígito
+                        if parece_preco(texto):
+                            preco = texto.strip()
+                            print(f"Preço encontrado com seletor: {sel}")
+                            break  
+                    except Exception as e:
+                        self._contar_timeout(e, "preco", sel)
+                        continue  
+
+                if preco != "PREÇO NÃO ENCONTRADO":
+                    self._registrar("preco", [sel], sel, time.monotonic() - inicio)
+                    break
+            except Exception as e:
+                registrar_erro(e, "preco")
+            self._registrar("preco", [sel], None, time.monotonic() - inicio)
+        
+        if preco == "PREÇO NÃO ENCONTRADO":
+            try:
+                # busca de qualquer elemento contendo $, AR$ ou ARS usando regex
+                preco_el = page.locator("text=/\\$|AR\\$|ARS/").first
+                preco = preco_el.inner_text(timeout=self._timeout_ms("seletor", 3000)).strip()
+                print(f"---> Preço encontrado via texto regex")
+            except Exception as e:
+                self._contar_timeout(e, "preco", SELETOR_PRECO_TEXTO)
+
+        return preco
+
+    def _salvar(self, dados: Dict[str, str]) -> None:
+        """
+        Envia o resultado para o sink configurado ou, sem sink, acrescenta ao produtos.csv.
+
+        Args:
+            dados: Dicionário retornado por _extrair_dados
+        """
+        with METRICAS.etapa("gravacao"):
+            if self.historico is not None:
+                self.historico.registrar(dados)
+            if self.sink is not None:
+                self.sink.escrever(dados)
+                return
+            salvar_csv(dados)
+        print("\nDados salvos em produtos.csv")
 
     def scrape_produto(self, url: str = "https://shopee.com.ar/topick_global_ar.ar"):
         """
@@ -224,72 +717,17 @@ class ShopeeScraper:
         6. Captura screenshot do produto
         7. Salva dados em CSV
         """
-        with sync_playwright() as p:
-            browser = p.firefox.launch(headless=True, slow_mo=50, proxy=self.proxy) if self.proxy else p.firefox.launch(headless=True, slow_mo=50)
-            
-            # contexto do navegador para Argentina
-            context_args = dict(
-                viewport={"width": 1380, "height": 900},
-                locale="es-AR",  
-                timezone_id="America/Argentina/Buenos_Aires"
-            )
-            
-            context = browser.new_context(**context_args)
-
-            # script anti-detecção 
-            context.add_init_script("""
-            Object.defineProperty(navigator, 'webdriver', {get: () => false});
-            Object.defineProperty(navigator, 'languages', {get: () => ['es-AR','es','en']});
-            Object.defineProperty(navigator, 'platform', {get: () => 'Linux x86_64'});
-            window.chrome = { runtime: {} };
-            Object.defineProperty(navigator, 'plugins', {get: () => [1,2,3,4,5]});
-            """)
-
-            page = context.new_page()
-            
-            #  cabeçalhos HTTP para simular tráfego argentino
-            page.set_extra_http_headers({
-                "Referer": "https://www.google.com.ar/",  
-                "Accept-Language": "es-AR,es;q=0.9,en-US;q=0.8,en;q=0.7",
-                "DNT": "1",
-            })
-
-            print(f"---> Acessando loja: {url}")
-            page.goto(url, 
-                      timeout=60000, 
-                      wait_until="domcontentloaded")
-
-            human_pause(3, 6)  
-            human_scroll(page, 
-                         distance=random.randint(300, 800))
-            human_pause(1, 2)
-            try:
-                self._close_overlay_if_present(page)
-                human_pause(0.5, 1.2)
-            except Exception:
-                pass  
-
-
-            print("---> Procurando produtos na página...")    
-            produtos = []
-            selectors_to_try = [
-                "a[href*='/product/']",  
-                "div[data-sqe='item']",  
-                ".shop-search-result-view__item", 
-            ]
-            
-            # tentativa de cada seletor até encontrar produtos
-            for selector in selectors_to_try:
-                produtos = page.locator(selector).all()
-                if produtos:
-                    print(f"Encontrados {len(produtos)} produtos com seletor: {selector}")
-                    break  
+        with self._sessao() as page:
+            self._abrir_loja(page, url)
+            produtos = self._encontrar_produtos(page)
             
             if not produtos:
                 print("Nenhum produto encontrado! Verifique os seletores.")
                 return
 
             produto = random.choice(produtos) 
+            # a partir daqui o produto tem o mesmo prazo de uma visita em lote
+            self._prazo = Prazo(self.prazo_produto_s)
             
             # simular movimento de mouse até o produto 
             try:
@@ -305,124 +743,409 @@ class ShopeeScraper:
                         page, 
                         (random.randint(100, 300), random.randint(100, 300)), 
                         (cx, cy), 
-                        steps=random.randint(15, 25)
+                        steps=random.randint(15, 25),
+                        modo=self.movimento,
                     )
-                    human_pause(0.5, 1.5)  
-            except Exception:
-                pass  
+                    self._pausa(0.5, 1.5)
+            except Exception as e:
+                registrar_erro(e, "mouse")
 
             print("---> Clicando em produto aleatório...")
-            try:
-                produto.click(timeout=10000)
-            except Exception:
+            if self.captura is not None:
+                self.captura.reiniciar()
+            with METRICAS.etapa("clique"):
                 try:
-                    href = produto.get_attribute("href")
-                    if href:
-                        # se URL for relativa add dominio
-                        if not href.startswith("http"):
-                            href = "https://shopee.com.ar" + href
-                        page.goto(href, timeout=60000, wait_until="domcontentloaded")
+                    produto.click(timeout=self._timeout_ms("clique", 10000))
                 except Exception as e:
-                    print(f"Erro ao clicar no produto: {e}")
-                    browser.close()
-                    return
+                    print(f"Clique falhou ({registrar_erro(e, 'clique')}), navegando pelo href")
+                    try:
+                        href = produto.evaluate(_HREF_JS)
+                        if href:
+                            # se URL for relativa add dominio
+                            href = self.site.absoluto(href)
+                            page.goto(href, timeout=self._timeout_ms("goto", 60000), wait_until="domcontentloaded")
+                    except Exception as e:
+                        print(f"Erro ao clicar no produto ({registrar_erro(e, 'goto')}): {e}")
+                        return
 
+            dados = self._dados_da_api(page)
+            if dados is None:
+                self._aguardar(page, self.site.nome_selectors + self.site.preco_selectors, "visible", 3, 5)
+                page.wait_for_load_state("domcontentloaded", 
+                                         timeout=self._timeout_ms("espera", 30000))  
 
-            human_pause(3, 5) 
-            page.wait_for_load_state("domcontentloaded", 
-                                     timeout=30000)  
-            human_scroll(page, 
-                         distance=random.randint(200, 500))
-            human_pause(1, 2)
+                dados = self._extrair_dados(page)
+            self._salvar(dados)
 
-            screenshot_dir = "screenshots"
-            os.makedirs(screenshot_dir, 
-                        exist_ok=True)  
-            timestamp = time.strftime("%Y%m%d_%H%M%S")
-            screenshot_path = os.path.join(screenshot_dir, f"produto_{timestamp}.png")
+    def _via_http(self, link: str) -> Optional[Dict[str, object]]:
+        """
+        Tenta o produto pela camada HTTP (se configurada).
 
-            try:
-                page.screenshot(path=screenshot_path, 
-                                full_page=True)  
-                print(f"Screenshot salvo em: {screenshot_path}")
-            except Exception as e:
-                print(f"Erro ao salvar screenshot: {e}")
+        Returns:
+            Dados do produto, ou None para escalar ao navegador
+        """
+        if self.http is None:
+            return None
+        try:
+            with METRICAS.etapa("http"):
+                dados = self.http.buscar_produto(link)
+        except BloqueadoError as e:
+            print(f"HTTP bloqueado, usando navegador: {e}")
+            return None
+        if dados:
+            print(f"Produto via HTTP: {dados['nome']} | {dados['preco']}")
+        return dados
 
-            nome = "NOME NÃO ENCONTRADO"  
-            
-            # seletores CSS possíveis para o título do produto
-            nome_selectors = [
-                "span.qaNIZv",  
-                "h1",  
-                "div[class*='title']",  
-                "span[class*='product-title']",  
-            ]
- 
-            for sel in nome_selectors:
-                try:
-                    nome = page.locator(sel).first.inner_text(timeout=5000) # primeiro elemento que corresponda ao seletor
-                    
-                    # se o nome for valido
-                    if nome and len(nome) > 3:
-                        break 
-                except Exception:
-                    continue 
-            
-            print("-----> Tentando extrair nome do produto...")
-            preco = "PREÇO NÃO ENCONTRADO"  
-            # seletores CSS possíveis para preço
-            preco_selectors = [
-                "div.pmmxKx",  # Classe específica da Shopee para preço
-                "div[class*='price']",  
-                "span[class*='price']",  
-                "div.price",  
-                "[class*='PriceSection']",  
-                "[class*='product-price']",  
-                "div[data-testid='lblProductPrice']",  # Atributo de teste
-            ]
-            
-            print("-----> Tentando extrair preço...")
-            for sel in preco_selectors:
-                try:
-                    # Buscar todos os elementos que correspondam
-                    elementos = page.locator(sel).all()
-                    for el in elementos[:5]:
-                        try:
-                            texto = el.inner_text(timeout=2000)
-                            
-                            # Validar se o texto parece ser um preço contendo $ ou qualquer dígito
-                            if texto and ("$" in texto or "AR" in texto or any(char.isdigit() for char in texto)):
-                                preco = texto.strip()
-                                print(f"Preço encontrado com seletor: {sel}")
-                                break  
-                        except Exception:
-                            continue  
+    def _visitar_produto(self, page, link: str) -> Optional[Dict[str, str]]:
+        """
+        Navega até o produto na página já aberta e extrai os dados.
 
-                    if preco != "PREÇO NÃO ENCONTRADO":
-                        break
-                except Exception:
-                    continue  
-            
-            if preco == "PREÇO NÃO ENCONTRADO":
-                try:
-                    # busca de qualquer elemento contendo $, AR$ ou ARS usando regex
-                    preco_el = page.locator("text=/\\$|AR\\$|ARS/").first
-                    preco = preco_el.inner_text(timeout=3000).strip()
-                    print(f"---> Preço encontrado via texto regex")
-                except Exception:
-                    pass  
-
-            link_produto = page.url
-            
-            print(f"\nProduto encontrado:")
-            print(f"Nome: {nome}")
-            print(f"Preço: {preco}")
-            print(f"Link: {link_produto}")
-
-            with open("produtos.csv", "a", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow([nome, preco, link_produto])
-
-            print("\nDados salvos em produtos.csv")
-            browser.close()
-            print("Navegador fechado.")
\ No newline at end of file
+        O produto inteiro cabe em prazo_produto_s, repartido entre as
+        etapas. Timeouts e erros de navegação ganham novas tentativas com
+        backoff exponencial dentro do prazo; bloqueios não. O disjuntor
+        pausa o domínio quando a taxa de erro das visitas dispara.
+
+        Returns:
+            Dados do produto, ou None se a navegação falhou
+        """
+        dominio = urlsplit(link).hostname or ""
+        self._entrar(link)
+        if self.disjuntor is not None:
+            self.disjuntor.aguardar(dominio)
+        self._prazo = Prazo(self.prazo_produto_s)
+        try:
+            dados = repetir(lambda: self._tentar_produto(page, link), tentativas=self.tentativas,
+                            prazo=self._prazo, etapa="produto")
+        except Exception as e:
+            print(f"Erro ao abrir produto ({classificar_erro(e)}): {e}")
+            if self.disjuntor is not None:
+                self.disjuntor.registrar(dominio, False)
+            return None
+        finally:
+            self._prazo = None
+        if self.disjuntor is not None:
+            self.disjuntor.registrar(dominio, True)
+        return dados
+
+    def _tentar_produto(self, page, link: str) -> Dict[str, str]:
+        """
+        Uma tentativa de _visitar_produto.
+
+        Raises:
+            PaginaBloqueada: O site respondeu com status de bloqueio
+            Exception: Erros do Playwright na navegação (classificados por quem chama)
+        """
+        if self.captura is not None:
+            self.captura.reiniciar()
+        pool = self._pool_ativo
+        if pool is not None:
+            pool.limitar(page, link)
+        inicio = time.perf_counter()
+        try:
+            with METRICAS.etapa("goto", pagina="produto"):
+                resposta = page.goto(link, timeout=self._timeout_ms("goto", 60000), wait_until="domcontentloaded")
+        except Exception:
+            if pool is not None:
+                pool.reportar(page, False)
+            raise
+        status = getattr(resposta, "status", None)
+        bloqueado = status in STATUS_BLOQUEIO
+        if pool is not None:
+            pool.reportar(page, not bloqueado, time.perf_counter() - inicio, bloqueado)
+        if bloqueado:
+            raise PaginaBloqueada(f"HTTP {status} em {link}", "goto")
+        dados = self._dados_da_api(page, link)
+        if dados is not None:
+            return dados
+        self._aguardar(page, self.site.nome_selectors + self.site.preco_selectors, "visible", 3, 5)
+        dados = self._extrair_dados(page)
+        if dados.get("nome") == "NOME NÃO ENCONTRADO" and dados.get("preco") == "PREÇO NÃO ENCONTRADO":
+            # a linha continua sendo gravada como antes; só a classificação é contada
+            METRICAS.contar("erros_total", tipo="seletor", etapa="extracao")
+        return dados
+
+    def extrair_produto(self, page, link: str) -> Optional[Dict[str, object]]:
+        """
+        Extrai um produto: HTTP primeiro (se configurado), depois a página do navegador.
+
+        Args:
+            page: Página aberta (de _sessao ou do pool)
+            link: URL do produto
+
+        Returns:
+            Dados do produto, ou None se nenhuma das camadas conseguiu
+        """
+        return self._via_http(link) or self._visitar_produto(page, link)
+
+    def listar_loja(self, url: str, max_paginas: int = 100) -> List[str]:
+        """
+        Todas as URLs de produto da loja (listagem paginada e rolada até o fim), normalizadas.
+
+        Args:
+            url: URL da loja
+            max_paginas: Limite de páginas da listagem
+        """
+        frontier = Frontier(None)
+        with self._sessao() as page:
+            self._colher_listagem(page, url, frontier, max_paginas)
+        return frontier.pendentes()
+
+    def scrape_links(self, links: List[str]) -> List[Dict[str, object]]:
+        """
+        Extrai uma lista de URLs de produto conhecidas, HTTP primeiro.
+
+        Args:
+            links: URLs de produtos
+
+        Returns:
+            Lista de resultados, um por produto extraído
+
+        Com self.http configurado, cada produto custa uma requisição HTTP;
+        o navegador só é aberto (uma vez) para os links em que o HTTP foi
+        bloqueado ou não conseguiu interpretar a resposta. Com
+        self.somente_http esses links são pulados e o Playwright nem é importado.
+        """
+        resultados = []
+        for dados in self._produtos_dos_links(links):
+            self._salvar(dados)
+            resultados.append(dados)
+        return resultados
+
+    def _produtos_dos_links(self, links: List[str]) -> Iterator[Dict[str, object]]:
+        """Gera os produtos de scrape_links um a um, sem gravar."""
+        pendentes = []
+        for link in dedupe_links(links):
+            dados = self._via_http(link)
+            if dados:
+                yield dados
+            else:
+                pendentes.append(link)
+
+        if pendentes and self.somente_http:
+            print(f"---> {len(pendentes)} produtos pulados: o HTTP não resolveu e o navegador está desligado")
+            METRICAS.contar("produtos_pulados_total", len(pendentes), motivo="somente_http")
+            pendentes = []
+        if pendentes:
+            print(f"---> {len(pendentes)} produtos precisam do navegador")
+            with self._sessao() as page:
+                for link in pendentes:
+                    dados = self._visitar_produto(page, link)
+                    if dados is not None:
+                        yield dados
+        elif self.sink is not None:
+            self.sink.flush()
+
+    def scrape_produtos(self, url: str = "https://shopee.com.ar/topick_global_ar.ar", limit: Optional[int] = None) -> List[Dict[str, str]]:
+        """
+        Modo em lote: carrega a loja uma única vez e visita vários produtos em sequência.
+
+        Args:
+            url: URL da loja na Shopee Argentina (padrão: topick_global_ar.ar)
+            limit: Número máximo de produtos a visitar (None = todos os encontrados)
+
+        Returns:
+            Lista de dicionários (nome, preco, link), um por produto visitado
+
+        Reaproveita o mesmo navegador, contexto e página, além dos links já
+        coletados na listagem: cada produto custa apenas uma navegação, não
+        uma nova inicialização do Firefox. Links repetidos são descartados.
+        """
+        resultados = []
+        for dados in self._produtos_em_lote(url, limit):
+            self._salvar(dados)
+            resultados.append(dados)
+        return resultados
+
+    def _produtos_em_lote(self, url: str, limit: Optional[int] = None) -> Iterator[Dict[str, object]]:
+        """Gera os produtos de scrape_produtos um a um, sem gravar."""
+        with self._sessao() as page:
+            self._abrir_loja(page, url)
+
+            links = self._coletar_links(page, self._encontrar_produtos(page))
+            if not links:
+                print("Nenhum produto encontrado! Verifique os seletores.")
+                return
+            if limit is not None:
+                links = links[:limit]
+
+            print(f"---> Visitando {len(links)} produtos em lote...")
+            for i, link in enumerate(links, start=1):
+                print(f"---> [{i}/{len(links)}] {link}")
+                dados = self.extrair_produto(page, link)
+                if dados is not None:
+                    yield dados
+
+    def iter_produtos(self, url: str = "https://shopee.com.ar/topick_global_ar.ar", links: Optional[List[str]] = None,
+                      limit: Optional[int] = None, buffer: int = CAPACIDADE_PADRAO) -> Esteira:
+        """
+        Entrega os produtos (registros Produto) à medida que cada página termina.
+
+        Args:
+            url: URL da loja (modo em lote, como scrape_produtos)
+            links: URLs de produtos conhecidas (como scrape_links; url é ignorada)
+            limit: Máximo de produtos
+            buffer: Resultados prontos que podem esperar pelo consumidor
+
+        Returns:
+            Esteira para `for` ou `async for`
+
+        Uso:
+            for produto in scraper.iter_produtos(limit=100):
+                sink.escrever(produto.como_dict())
+
+        O crawler roda numa thread e para quando o buffer enche, então um
+        consumidor lento segura o ritmo em vez de acumular memória, e o
+        consumidor (sinks, normalização, alertas) trabalha enquanto a próxima
+        página carrega. Nada é gravado aqui: quem consome decide. Com
+        self.pool (Playwright preso à thread que o iniciou) o crawler roda
+        dentro do próprio `for`, sem buffer e sem `async for`.
+        """
+        if links is not None:
+            links = links[:limit] if limit is not None else links
+            produtor = partial(self._produtos_dos_links, links)
+        else:
+            produtor = partial(self._produtos_em_lote, url, limit)
+        return Esteira(produtor, buffer, em_thread=self.pool is None)
+
+    def crawl_loja(self, url: str = "https://shopee.com.ar/topick_global_ar.ar",
+                   frontier: Optional[Frontier] = None, max_paginas: int = 100,
+                   limit: Optional[int] = None) -> List[Dict[str, object]]:
+        """
+        Crawl completo da loja: pagina/rola a listagem inteira e visita cada produto.
+
+        Args:
+            url: URL da loja
+            frontier: Fronteira persistida (padrão: frontier.json); uma execução
+                      interrompida retoma a listagem e as URLs pendentes
+            max_paginas: Limite de páginas da listagem
+            limit: Máximo de produtos visitados nesta execução (None = todos pendentes)
+
+        Returns:
+            Lista de resultados dos produtos visitados nesta execução
+        """
+        frontier = frontier if frontier is not None else Frontier()
+        resultados = []
+        try:
+            with self._sessao() as page:
+                if not frontier.listagem_concluida:
+                    self._colher_listagem(page, url, frontier, max_paginas)
+
+                pendentes = frontier.pendentes()
+                if limit is not None:
+                    pendentes = pendentes[:limit]
+                print(f"---> Fronteira com {len(frontier)} produtos, visitando {len(pendentes)} pendentes...")
+                for i, link in enumerate(pendentes, start=1):
+                    print(f"---> [{i}/{len(pendentes)}] {link}")
+                    dados = self.extrair_produto(page, link)
+                    if dados is None:
+                        frontier.falhar(link)
+                        continue
+                    self._salvar(dados)
+                    resultados.append(dados)
+                    frontier.concluir(link)
+        finally:
+            frontier.salvar()
+            print(f"Fronteira: {frontier.resumo()}")
+        return resultados
+
+    def scrape_incremental(self, url: str, estado: EstadoIncremental, limit: Optional[int] = 50,
+                           descobrir: bool = False) -> List[Dict[str, object]]:
+        """
+        Revisita só os produtos vencidos e grava só os que mudaram.
+
+        Args:
+            url: URL da loja (usada para descobrir produtos)
+            estado: Impressões digitais e agenda por URL
+            limit: Máximo de produtos visitados nesta rodada
+            descobrir: Relê a listagem da loja para agendar produtos novos
+                       (sempre acontece com o estado vazio)
+
+        Returns:
+            Resultados novos ou alterados (os gravados)
+
+        Cada produto tenta primeiro o HTTP (se configurado); o navegador só
+        é aberto quando algum produto precisar dele.
+        """
+        if descobrir or len(estado) == 0:
+            with self._sessao() as page:
+                self._abrir_loja(page, url)
+                links = self._coletar_links(page, self._encontrar_produtos(page))
+            novos = estado.adicionar(normalizar_url(link) for link in links)
+            print(f"---> {novos} produtos novos agendados ({len(estado)} no total)")
+
+        vencidos = estado.vencidos(limit)
+        if not vencidos:
+            espera = estado.segundos_ate_proxima()
+            print(f"Nenhum produto vencido (próximo em {espera or 0:.0f}s).")
+            return []
+
+        gravados = []
+        with ExitStack() as pilha:
+            page = None
+            for i, link in enumerate(vencidos, start=1):
+                print(f"---> [{i}/{len(vencidos)}] {link}")
+                dados = self._via_http(link)
+                if dados is None:
+                    if page is None:
+                        page = pilha.enter_context(self._sessao())
+                    dados = self._visitar_produto(page, link)
+                if dados is None:
+                    estado.adiar(link)
+                    continue
+                # a agenda é pela URL agendada, mesmo que a página tenha redirecionado
+                dados["link"] = link
+                if estado.registrar(dados):
+                    self._salvar(dados)
+                    gravados.append(dados)
+                else:
+                    print("Sem mudanças, linha não gravada.")
+        if self.sink is not None:
+            self.sink.flush()
+        print(f"Incremental: {len(gravados)} alterados de {len(vencidos)} visitados")
+        return gravados
+
+
+def salvar_csv(dados: Dict[str, str], caminho: str = "produtos.csv") -> None:
+    """
+    Acrescenta uma linha nome, preço, link ao arquivo CSV.
+    """
+    with open(caminho, "a", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow([dados["nome"], dados["preco"], dados["link"]])
+
+
+def dedupe_links(hrefs: List[str], base_url: str = "https://shopee.com.ar") -> List[str]:
+    """
+    Converte hrefs em URLs absolutas e remove duplicados mantendo a ordem.
+
+    Args:
+        hrefs: Lista de hrefs (relativos ou absolutos) coletados na listagem
+        base_url: URL usada para resolver hrefs relativos
+
+    Returns:
+        Lista de URLs absolutas sem repetições (fragmentos #... são ignorados)
+    """
+    vistos = set()
+    links = []
+    for href in hrefs:
+        if not href:
+            continue
+        link, _ = urldefrag(urljoin(base_url, href.strip()))
+        if link not in vistos:
+            vistos.add(link)
+            links.append(link)
+    return links
+
+
+def url_pagina(url: str, pagina: int) -> str:
+    """
+    URL da página N (0 = primeira) da listagem da loja, pelo parâmetro page da Shopee.
+
+    A primeira página mantém a URL original.
+    """
+    if pagina == 0:
+        return url
+    partes = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(partes.query, keep_blank_values=True) if k != "page"]
+    query.append(("page", str(pagina)))
+    return urlunsplit(partes._replace(query=urlencode(query)))
@@ -0,0 +1,364 @@
+import csv
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem lock entre processos
+    fcntl = None
+
+
+CAMPOS_PADRAO = ("nome", "preco", "link")
+
+
+def agora_iso() -> str:
+    """Timestamp UTC em ISO 8601 (segundos)."""
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+class _LockArquivo:
+    """flock exclusivo num arquivo aberto, para vários processos escrevendo no mesmo destino."""
+
+    def __init__(self, f):
+        self.f = f
+
+    def __enter__(self):
+        if fcntl is not None:
+            fcntl.flock(self.f.fileno(), fcntl.LOCK_EX)
+        return self.f
+
+    def __exit__(self, exc_type, exc, tb):
+        if fcntl is not None:
+            self.f.flush()
+            fcntl.flock(self.f.fileno(), fcntl.LOCK_UN)
+        return False
+
+
+class Sink:
+    """
+    Destino de saída com buffer: acumula linhas e grava em lote.
+
+    O lote é gravado quando atinge `tamanho_lote` linhas, quando passou
+    `intervalo_s` desde a última gravação, ou em flush()/fechar(). O
+    intervalo só é conferido a cada escrever() (não há thread de timer):
+    um buffer parado espera a próxima linha, um flush() ou o fechar().
+    Cada linha recebe `coletado_em` se ainda não tiver, e linhas repetidas
+    do mesmo link dentro do lote são reduzidas à mais recente. Se a
+    gravação falhar, o lote continua no buffer para a próxima tentativa.
+
+    É seguro para várias threads (lock interno) e as subclasses que
+    gravam em arquivo usam flock para vários processos.
+    """
+
+    def __init__(self, tamanho_lote: int = 50, intervalo_s: float = 5.0,
+                 transformar: Optional[Callable[[List[Dict[str, object]]], List[Dict[str, object]]]] = None):
+        """
+        Args:
+            tamanho_lote: Linhas acumuladas antes de gravar
+            intervalo_s: Tempo máximo (s) entre gravações, conferido a cada escrever()
+            transformar: Função aplicada ao lote inteiro antes de gravar
+                         (ex.: precos.normalizar_linhas)
+        """
+        self.tamanho_lote = max(1, tamanho_lote)
+        self.intervalo_s = intervalo_s
+        self.transformar = transformar
+        self._buffer: List[Dict[str, object]] = []
+        self._lock = threading.Lock()
+        self._ultimo_flush = time.monotonic()
+        self.gravadas = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.fechar()
+        return False
+
+    def escrever(self, dados: Dict[str, object]) -> None:
+        """
+        Acrescenta um resultado ao buffer (grava se o lote encheu ou o tempo passou).
+
+        Args:
+            dados: Dicionário com pelo menos nome, preco e link
+        """
+        linha = dict(dados)
+        linha.setdefault("coletado_em", agora_iso())
+        with self._lock:
+            self._buffer.append(linha)
+            cheio = len(self._buffer) >= self.tamanho_lote
+            vencido = time.monotonic() - self._ultimo_flush >= self.intervalo_s
+            if cheio or vencido:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        """Grava imediatamente o que estiver no buffer."""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        self._ultimo_flush = time.monotonic()
+        if not self._buffer:
+            return
+        linhas = _dedupe_por_link(self._buffer)
+        if self.transformar is not None:
+            linhas = self.transformar(linhas)
+        self._gravar(linhas)
+        # só esvazia depois de gravar: um erro (disco cheio, banco travado)
+        # sobe para quem chamou sem perder o lote
+        self._buffer = []
+        self.gravadas += len(linhas)
+
+    def _gravar(self, linhas: List[Dict[str, object]]) -> None:
+        raise NotImplementedError
+
+    def fechar(self) -> None:
+        """Grava o buffer e libera recursos."""
+        self.flush()
+
+
+def _dedupe_por_link(linhas: List[Dict[str, object]]) -> List[Dict[str, object]]:
+    """Mantém só a última linha de cada link, na ordem da primeira aparição."""
+    por_link: Dict[object, Dict[str, object]] = {}
+    sem_link = []
+    for linha in linhas:
+        link = linha.get("link")
+        if link is None:
+            sem_link.append(linha)
+        else:
+            por_link[link] = linha
+    return list(por_link.values()) + sem_link
+
+
+class CsvSink(Sink):
+    """
+    CSV com cabeçalho (escrito só quando o arquivo é novo ou está vazio).
+
+    O padrão mantém o formato histórico do produtos.csv (nome, preco, link);
+    passe `campos` para incluir outras colunas, como coletado_em.
+    """
+
+    def __init__(self, caminho: str = "produtos.csv", campos: Sequence[str] = CAMPOS_PADRAO,
+                 cabecalho: bool = True, **kwargs):
+        super().__init__(**kwargs)
+        self.caminho = caminho
+        self.campos = list(campos)
+        self.cabecalho = cabecalho
+
+    def _gravar(self, linhas):
+        with open(self.caminho, "a", newline="", encoding="utf-8") as f, _LockArquivo(f):
+            writer = csv.DictWriter(f, fieldnames=self.campos, extrasaction="ignore")
+            # tamanho lido depois do flock: outro processo pode ter criado o arquivo enquanto esperávamos
+            if self.cabecalho and os.fstat(f.fileno()).st_size == 0:
+                writer.writeheader()
+            writer.writerows(linhas)
+
+
+class JsonlSink(Sink):
+    """Um objeto JSON por linha, com todos os campos do resultado."""
+
+    def __init__(self, caminho: str = "produtos.jsonl", **kwargs):
+        super().__init__(**kwargs)
+        self.caminho = caminho
+
+    def _gravar(self, linhas):
+        texto = "".join(json.dumps(linha, ensure_ascii=False, default=str) + "\n" for linha in linhas)
+        with open(self.caminho, "a", encoding="utf-8") as f, _LockArquivo(f):
+            f.write(texto)
+
+
+class SqliteSink(Sink):
+    """
+    Tabela SQLite em modo WAL com upsert pelo link do produto.
+
+    Vários processos podem escrever no mesmo banco: o WAL permite leitores
+    simultâneos e o busy_timeout faz os escritores esperarem a vez.
+    """
+
+    def __init__(self, caminho: str = "produtos.db", tabela: str = "produtos", **kwargs):
+        super().__init__(**kwargs)
+        self.caminho = caminho
+        self.tabela = tabela
+        self._conn = sqlite3.connect(caminho, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {tabela} ("
+            " link TEXT PRIMARY KEY,"
+            " nome TEXT,"
+            " preco TEXT,"
+            " coletado_em TEXT,"
+            " extras TEXT)"
+        )
+        self._conn.commit()
+
+    def _gravar(self, linhas):
+        registros = []
+        for linha in linhas:
+            extras = {k: v for k, v in linha.items() if k not in ("link", "nome", "preco", "coletado_em")}
+            registros.append((
+                linha.get("link"),
+                linha.get("nome"),
+                None if linha.get("preco") is None else str(linha.get("preco")),
+                linha.get("coletado_em"),
+                json.dumps(extras, ensure_ascii=False, default=str) if extras else None,
+            ))
+        with self._conn:
+            self._conn.executemany(
+                f"INSERT INTO {self.tabela} (link, nome, preco, coletado_em, extras) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(link) DO UPDATE SET nome=excluded.nome, preco=excluded.preco, "
+                "coletado_em=excluded.coletado_em, extras=excluded.extras",
+                registros,
+            )
+
+    def fechar(self):
+        super().fechar()
+        self._conn.close()
+
+
+class ParquetSink(Sink):
+    """
+    Parquet particionado: cada lote vira um arquivo parte-*.parquet no diretório.
+
+    Parquet não aceita append, então cada flush grava uma parte nova com
+    nome único por processo; leitores tratam o diretório como um dataset.
+    Requer pyarrow (dependência opcional).
+    """
+
+    def __init__(self, diretorio: str = "produtos_parquet", **kwargs):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as e:
+            raise ImportError("ParquetSink requer pyarrow: pip install pyarrow") from e
+        super().__init__(**kwargs)
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self.diretorio = diretorio
+        self._partes = 0
+        os.makedirs(diretorio, exist_ok=True)
+
+    def _gravar(self, linhas):
+        colunas = list(CAMPOS_PADRAO) + ["coletado_em"]
+        for linha in linhas:
+            for chave in linha:
+                if chave not in colunas:
+                    colunas.append(chave)
+        tabela = self._pa.table({
+            c: [None if linha.get(c) is None else str(linha.get(c)) for linha in linhas]
+            for c in colunas
+        })
+        self._partes += 1
+        nome = f"parte-{time.strftime('%Y%m%d_%H%M%S')}-{os.getpid()}-{self._partes:05d}.parquet"
+        self._pq.write_table(tabela, os.path.join(self.diretorio, nome))
+
+
+def criar_sink(destino: str, **kwargs) -> Sink:
+    """
+    Cria o sink adequado pela extensão do destino.
+
+    Args:
+        destino: .csv, .jsonl, .db/.sqlite ou .parquet (diretório de partes)
+        **kwargs: Repassados ao sink (tamanho_lote, intervalo_s, campos...)
+
+    Raises:
+        ValueError: Extensão desconhecida
+    """
+    ext = os.path.splitext(destino)[1].lower()
+    if ext == ".csv":
+        return CsvSink(destino, **kwargs)
+    if ext in (".jsonl", ".ndjson"):
+        return JsonlSink(destino, **kwargs)
+    if ext in (".db", ".sqlite", ".sqlite3"):
+        return SqliteSink(destino, **kwargs)
+    if ext == ".parquet":
+        return ParquetSink(destino, **kwargs)
+    raise ValueError(f"Formato de saída desconhecido: {destino}")
+
+
+def ler_resultados(origem: str, tabela: str = "produtos") -> Iterator[Dict[str, object]]:
+    """
+    Lê de volta os resultados gravados por um sink (o inverso de criar_sink).
+
+    Args:
+        origem: .csv (com ou sem cabeçalho), .jsonl ou .db/.sqlite do SqliteSink
+        tabela: Tabela do SqliteSink
+
+    Returns:
+        Gerador de dicionários (nome, preco, link, coletado_em e extras), um por linha
+
+    O CSV legado não tem data: todas as linhas valem como coletadas na
+    data de modificação do arquivo.
+    """
+    ext = os.path.splitext(origem)[1].lower()
+    if ext in (".jsonl", ".ndjson"):
+        with open(origem, encoding="utf-8") as f:
+            for texto in f:
+                if texto.strip():
+                    yield json.loads(texto)
+    elif ext in (".db", ".sqlite", ".sqlite3"):
+        conn = sqlite3.connect(origem)
+        try:
+            for link, nome, preco, coletado_em, extras in conn.execute(
+                    f"SELECT link, nome, preco, coletado_em, extras FROM {tabela}"):
+                linha = {"nome": nome, "preco": preco, "link": link, "coletado_em": coletado_em}
+                if extras:
+                    linha.update(json.loads(extras))
+                yield linha
+        finally:
+            conn.close()
+    else:
+        coletado_em = datetime.fromtimestamp(os.path.getmtime(origem), timezone.utc).isoformat(timespec="seconds")
+        with open(origem, newline="", encoding="utf-8") as f:
+            cabecalho = None
+            for i, row in enumerate(csv.reader(f)):
+                if i == 0 and row[:3] == list(CAMPOS_PADRAO):
+                    cabecalho = row
+                    continue
+                if cabecalho is not None:
+                    linha = {c: v for c, v in zip(cabecalho, row) if v != ""}
+                    linha.setdefault("coletado_em", coletado_em)
+                    yield linha
+                elif len(row) >= 3:
+                    yield {"nome": row[0], "preco": row[1], "link": row[2], "coletado_em": coletado_em}
+
+
+def mesclar_jsonl(caminhos: Sequence[str], destino: Sink) -> int:
+    """
+    Junta partes JSONL (ex.: uma por worker) num sink, uma linha por link.
+
+    Quando o mesmo link aparece em mais de uma parte fica a linha com o
+    coletado_em mais recente.
+
+    Args:
+        caminhos: Arquivos .jsonl das partes
+        destino: Sink de saída (não é fechado aqui)
+
+    Returns:
+        Quantidade de linhas escritas no destino
+    """
+    por_link: Dict[object, Dict[str, object]] = {}
+    sem_link = []
+    for caminho in caminhos:
+        with open(caminho, encoding="utf-8") as f:
+            for texto in f:
+                if not texto.strip():
+                    continue
+                try:
+                    linha = json.loads(texto)
+                except ValueError:
+                    continue  # linha cortada de um worker interrompido
+                link = linha.get("link")
+                if link is None:
+                    sem_link.append(linha)
+                elif link not in por_link or str(linha.get("coletado_em", "")) >= str(por_link[link].get("coletado_em", "")):
+                    por_link[link] = linha
+    linhas = list(por_link.values()) + sem_link
+    for linha in linhas:
+        destino.escrever(linha)
+    destino.flush()
+    return len(linhas)
@@ -0,0 +1,147 @@
+import re
+from typing import Dict, Optional, Tuple
+
+from scraper.marketplaces import Marketplace
+
+
+API_ML = "https://api.mercadolibre.com"
+
+# produto de catálogo (/p/MLB123) ou anúncio (produto.mercadolivre.com.br/MLB-123-...)
+_ID_CATALOGO = re.compile(r"/p/(ML[A-Z]\d+)")
+_ID_ANUNCIO = re.compile(r"/(ML[A-Z])-?(\d+)")
+
+# seletores da listagem (vitrine de ofertas, busca e carrosséis)
+LISTING_SELECTORS = [
+    "a.poly-component__title",
+    ".poly-card a[href]",
+    ".ui-search-result__wrapper a[href]",
+    "a[href*='/p/MLB']",
+    "a[href*='produto.mercadolivre.com.br']",
+]
+
+# título do produto
+NOME_SELECTORS = [
+    "h1.ui-pdp-title",
+    "h1",
+    "[class*='ui-pdp-title']",
+]
+
+# preço (andes-money-amount: "R$\n19\n,\n66" no inner_text)
+PRECO_SELECTORS = [
+    ".ui-pdp-price__second-line .andes-money-amount",
+    "[class*='ui-pdp-price'] .andes-money-amount",
+    ".andes-money-amount",
+    "[class*='price']",
+]
+
+ELEMENTO_PRODUTO_SELECTORS = [
+    ".ui-pdp-container",
+    "[class*='ui-pdp-container']",
+    "main",
+]
+
+# aviso de cookies, seletor de CEP e modais
+OVERLAY_SELECTORS = [
+    "button[data-testid='action:understood-button']",
+    ".cookie-consent-banner-opt-out__action--key-accept",
+    "button.onboarding-cp-button",
+    ".andes-modal__close-button",
+    "button[aria-label='Fechar']",
+    "button:has-text('Entendi')",
+]
+
+# banners da home que levam às vitrines de ofertas
+BANNER_SELECTORS = [
+    "a[href*='/ofertas'] img",
+    "img[alt*='Ofertas']",
+    ".andes-carousel-snapped__slide img",
+]
+
+CONTEXT_ARGS = dict(
+    viewport={"width": 1380, "height": 900},
+    locale="pt-BR",
+    timezone_id="America/Sao_Paulo",
+)
+
+ANTI_DETECTION_SCRIPT = """
+Object.defineProperty(navigator, 'webdriver', {get: () => false});
+Object.defineProperty(navigator, 'languages', {get: () => ['pt-BR','pt','en']});
+Object.defineProperty(navigator, 'platform', {get: () => 'Linux x86_64'});
+window.chrome = { runtime: {} };
+Object.defineProperty(navigator, 'plugins', {get: () => [1,2,3,4,5]});
+"""
+
+EXTRA_HTTP_HEADERS = {
+    "Referer": "https://www.google.com.br/",
+    "Accept-Language": "pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7",
+    "DNT": "1",
+}
+
+
+def formatar_preco_ml(valor: Optional[float]) -> Optional[str]:
+    """Preço numérico da API no texto "R$ 1.299,90"."""
+    if valor is None:
+        return None
+    inteiro, decimal = divmod(round(float(valor) * 100), 100)
+    texto = f"{inteiro:,}".replace(",", ".")
+    return f"R$ {texto},{decimal:02d}"
+
+
+class MercadoLivre(Marketplace):
+    """Mercado Livre Brasil: seletores ui-pdp/andes, contexto pt-BR e a API pública de itens/produtos."""
+
+    nome = "mercadolivre"
+    base_url = "https://www.mercadolivre.com.br"
+    # só o Brasil: o Mercado Libre argentino tem preços em ARS e páginas em espanhol
+    dominios = ("mercadolivre.com.br",)
+    prefixo_cascata = "mercadolivre:"
+    locale_preco = "pt-BR"
+    listing_selectors = LISTING_SELECTORS
+    nome_selectors = NOME_SELECTORS
+    preco_selectors = PRECO_SELECTORS
+    elemento_produto_selectors = ELEMENTO_PRODUTO_SELECTORS
+    overlay_selectors = OVERLAY_SELECTORS
+    banner_selectors = BANNER_SELECTORS
+    context_args = CONTEXT_ARGS
+    extra_headers = EXTRA_HTTP_HEADERS
+    init_script = ANTI_DETECTION_SCRIPT
+
+    def id_item(self, link: str) -> Optional[str]:
+        achado = _ID_CATALOGO.search(link)
+        if achado:
+            return achado.group(1)
+        achado = _ID_ANUNCIO.search(link)
+        return None if achado is None else achado.group(1) + achado.group(2)
+
+    def requisicao_api(self, link: str) -> Optional[Tuple[str, Dict[str, str]]]:
+        achado = _ID_CATALOGO.search(link)
+        if achado:
+            return f"{API_ML}/products/{achado.group(1)}", {}
+        achado = _ID_ANUNCIO.search(link)
+        if achado:
+            return f"{API_ML}/items/{achado.group(1)}{achado.group(2)}", {}
+        return None
+
+    def parse_api(self, payload: object) -> Optional[Dict[str, object]]:
+        """
+        Interpreta /items/<id> (title, price) ou /products/<id> (name, buy_box_winner.price).
+        """
+        if not isinstance(payload, dict):
+            return None
+        nome = payload.get("title") or payload.get("name")
+        if not nome:
+            return None
+        preco = payload.get("price")
+        estoque = payload.get("available_quantity")
+        vencedor = payload.get("buy_box_winner")
+        if preco is None and isinstance(vencedor, dict):
+            preco = vencedor.get("price")
+            estoque = vencedor.get("available_quantity", estoque)
+        if preco is None:
+            return None
+        return {
+            "nome": nome,
+            "preco": formatar_preco_ml(preco),
+            "estoque": estoque,
+            "preco_original": formatar_preco_ml(payload.get("original_price")),
+        }
@@ -0,0 +1,116 @@
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from scraper.http_fetcher import ids_do_link, parse_item_shopee
+from scraper.marketplaces import Marketplace
+
+
+# seletores da listagem de produtos da loja
+LISTING_SELECTORS = [
+    "a[href*='/product/']",  
+    "div[data-sqe='item']",  
+    ".shop-search-result-view__item", 
+]
+
+# seletores CSS possíveis para o título do produto
+NOME_SELECTORS = [
+    "span.qaNIZv",  
+    "h1",  
+    "div[class*='title']",  
+    "span[class*='product-title']",  
+]
+
+# seletores CSS possíveis para preço
+PRECO_SELECTORS = [
+    "div.pmmxKx",  # Classe específica da Shopee para preço
+    "div[class*='price']",  
+    "span[class*='price']",  
+    "div.price",  
+    "[class*='PriceSection']",  
+    "[class*='product-price']",  
+    "div[data-testid='lblProductPrice']",  # Atributo de teste
+]
+
+# elemento principal do produto (recorte do screenshot no modo "elemento")
+ELEMENTO_PRODUTO_SELECTORS = [
+    "div.product-briefing",
+    "section[class*='product-briefing']",
+    "div[class*='product-briefing']",
+    "main",
+]
+
+# contexto do navegador para Argentina
+CONTEXT_ARGS = dict(
+    viewport={"width": 1380, "height": 900},
+    locale="es-AR",  
+    timezone_id="America/Argentina/Buenos_Aires"
+)
+
+# script anti-detecção 
+ANTI_DETECTION_SCRIPT = """
+Object.defineProperty(navigator, 'webdriver', {get: () => false});
+Object.defineProperty(navigator, 'languages', {get: () => ['es-AR','es','en']});
+Object.defineProperty(navigator, 'platform', {get: () => 'Linux x86_64'});
+window.chrome = { runtime: {} };
+Object.defineProperty(navigator, 'plugins', {get: () => [1,2,3,4,5]});
+"""
+
+#  cabeçalhos HTTP para simular tráfego argentino
+EXTRA_HTTP_HEADERS = {
+    "Referer": "https://www.google.com.ar/",  
+    "Accept-Language": "es-AR,es;q=0.9,en-US;q=0.8,en;q=0.7",
+    "DNT": "1",
+}
+
+# botões de fechar modais/overlays
+OVERLAY_SELECTORS = [
+    "svg.V4lWQZ",  
+    "button[aria-label='Fechar']",  
+    "button[aria-label='Close']",  
+    ".shopee-modal__close", 
+    ".modal-close", 
+    "button[data-testid='close']",  
+    "button:has-text('Fechar')",  
+    "button:has-text('Close')",  
+]
+
+# banners promocionais da Shopee
+BANNER_SELECTORS = [
+    "img.uXN1L5",  
+    "img[alt='Banner']",  
+    "img[src*='down-ar.img.susercontent.com']",  
+]
+
+
+class Shopee(Marketplace):
+    """Shopee Argentina: seletores, contexto es-AR e API de item /api/v4/item/get."""
+
+    nome = "shopee"
+    base_url = "https://shopee.com.ar"
+    dominios = ("shopee.com.ar",)
+    locale_preco = "es-AR"
+    listing_selectors = LISTING_SELECTORS
+    nome_selectors = NOME_SELECTORS
+    preco_selectors = PRECO_SELECTORS
+    elemento_produto_selectors = ELEMENTO_PRODUTO_SELECTORS
+    overlay_selectors = OVERLAY_SELECTORS
+    banner_selectors = BANNER_SELECTORS
+    context_args = CONTEXT_ARGS
+    extra_headers = EXTRA_HTTP_HEADERS
+    init_script = ANTI_DETECTION_SCRIPT
+    captura_xhr = True
+
+    def id_item(self, link: str) -> Optional[str]:
+        ids = ids_do_link(link)
+        return None if ids is None else f"{ids[0]}.{ids[1]}"
+
+    def requisicao_api(self, link: str) -> Optional[Tuple[str, Dict[str, str]]]:
+        ids = ids_do_link(link)
+        if ids is None:
+            return None
+        partes = urlsplit(link)
+        shopid, itemid = ids
+        return f"{partes.scheme}://{partes.netloc}/api/v4/item/get", {"itemid": itemid, "shopid": shopid}
+
+    def parse_api(self, payload: object) -> Optional[Dict[str, object]]:
+        return parse_item_shopee(payload)
@@ -0,0 +1,77 @@
+import time
+from typing import List, Optional
+
+from scraper.metricas import METRICAS
+
+
+def esperar_seletores(page, seletores: List[str], estado: str = "visible", timeout_ms: int = 15000) -> bool:
+    """
+    Espera até que qualquer um dos seletores CSS chegue ao estado pedido.
+
+    Args:
+        page: Objeto page do Playwright
+        seletores: Lista de seletores CSS (esperados juntos, como uma lista CSS "a, b, c")
+        estado: "attached" (existe no DOM) ou "visible"
+        timeout_ms: Tempo máximo de espera
+
+    Returns:
+        True se algum seletor ficou pronto, False se estourou o timeout
+
+    Uma única espera sobre a união dos seletores, em vez de uma por seletor,
+    retorna assim que o primeiro candidato aparece. Com estado "visible" cada
+    seletor ganha :visible: seletores soltos (div[class*='title']) costumam
+    casar antes com nós ocultos, e o .first da união ficaria preso neles.
+    """
+    if estado == "visible":
+        seletores = [f"{sel}:visible" for sel in seletores]
+    try:
+        page.locator(", ".join(seletores)).first.wait_for(state=estado, timeout=timeout_ms)
+        return True
+    except Exception:
+        METRICAS.contar("espera_timeouts_total", estado=estado)
+        return False
+
+
+def esperar_rede_ociosa(page, limite_ms: int = 2000) -> bool:
+    """
+    Espera o estado networkidle, mas nunca mais que limite_ms.
+
+    Páginas da Shopee mantêm conexões abertas (analytics, long polling), então
+    networkidle pode nunca chegar; o limite evita que isso vire tempo morto.
+
+    Returns:
+        True se a rede ficou ociosa dentro do limite
+    """
+    try:
+        page.wait_for_load_state("networkidle", timeout=limite_ms)
+        return True
+    except Exception:
+        return False
+
+
+def espera_inteligente(
+    page,
+    seletores: Optional[List[str]] = None,
+    estado: str = "visible",
+    timeout_ms: int = 15000,
+    limite_rede_ms: int = 2000,
+) -> float:
+    """
+    Espera pelos sinais reais de prontidão da página.
+
+    Args:
+        page: Objeto page do Playwright
+        seletores: Seletores que indicam que o conteúdo chegou (opcional)
+        estado: Estado esperado dos seletores
+        timeout_ms: Limite da espera pelos seletores
+        limite_rede_ms: Limite da espera por networkidle (0 desativa)
+
+    Returns:
+        Segundos efetivamente esperados
+    """
+    inicio = time.monotonic()
+    if seletores:
+        esperar_seletores(page, seletores, estado, timeout_ms)
+    if limite_rede_ms:
+        esperar_rede_ociosa(page, limite_rede_ms)
+    return time.monotonic() - inicio
@@ -0,0 +1,204 @@
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+
+from scraper.browser_pool import cpu_descendentes_s, rss_descendentes_mb
+from scraper.captura_api import CapturaApi
+from scraper.metricas import METRICAS
+from scraper.movimento import MODO_PADRAO, MODOS_MOVIMENTO
+from scraper.proxies import PoolProxies
+from scraper.screenshots import MODOS, ScreenshotManager
+from scraper.shopee_scraper import ShopeeScraper
+from scraper.sinks import JsonlSink
+from scripts.loja_fake import LojaFake, ProxyFake
+
+# módulos cujo import é cronometrado num interpretador limpo (rótulo -> módulo)
+IMPORTS_MEDIDOS = {
+    "cli": "scripts.run_scraper",
+    "scraper": "scraper.shopee_scraper",
+    "playwright": "playwright.sync_api",
+}
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark offline do ShopeeScraper contra uma loja local")
+    parser.add_argument("--produtos", type=int, default=20,
+                        help="produtos visitados (o catálogo fake tem o dobro)")
+    parser.add_argument("--latencia-ms", type=int, default=50,
+                        help="latência de toda resposta da loja fake")
+    parser.add_argument("--xhr-atraso-ms", type=int, default=200,
+                        help="atraso extra da API do item (XHR lento)")
+    parser.add_argument("--overlay", action="store_true",
+                        help="mostra um modal com botão de fechar nas páginas")
+    parser.add_argument("--sem-seletor", type=float, default=0.0,
+                        help="fração (0-1) de produtos com classes que nenhum seletor conhece")
+    parser.add_argument("--espera-inteligente", action="store_true",
+                        help="espera seletores/rede ociosa em vez de pausas fixas")
+    parser.add_argument("--movimento", choices=MODOS_MOVIMENTO, default=MODO_PADRAO,
+                        help="como mouse/scroll chegam ao navegador (passo, agrupado ou pagina)")
+    parser.add_argument("--http", action="store_true",
+                        help="HTTP primeiro (JSON-LD/API da loja fake), navegador como fallback")
+    parser.add_argument("--captura-api", action="store_true",
+                        help="lê o produto do XHR da página")
+    parser.add_argument("--screenshot", choices=MODOS, default="desligado",
+                        help="modo de screenshot durante o benchmark")
+    parser.add_argument("--proxies", type=int, default=0,
+                        help="passa o tráfego por N proxies locais (PoolProxies)")
+    parser.add_argument("--proxies-bloqueados", type=int, default=0,
+                        help="quantos desses proxies respondem 403 a tudo (IP banido)")
+    parser.add_argument("--resultado", metavar="ARQUIVO", default=None,
+                        help="acrescenta o resultado como uma linha JSON (para comparar execuções)")
+    parser.add_argument("--somente-import", action="store_true",
+                        help="mede só o tempo de import e de partida da CLI (sem loja nem navegador)")
+    return parser.parse_args(argv)
+
+def percentil(valores, p):
+    """Percentil p (0-100) por interpolação linear; 0.0 para lista vazia."""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    k = (len(ordenados) - 1) * p / 100
+    baixo = int(k)
+    alto = min(baixo + 1, len(ordenados) - 1)
+    return ordenados[baixo] + (ordenados[alto] - ordenados[baixo]) * (k - baixo)
+
+def tempo_import(modulo):
+    """Milissegundos para importar o módulo num interpretador novo; None se não estiver instalado."""
+    codigo = ("import time; inicio = time.perf_counter(); "
+              f"import {modulo}; print((time.perf_counter() - inicio) * 1000)")
+    r = subprocess.run([sys.executable, "-c", codigo], cwd=RAIZ, capture_output=True, text=True)
+    return round(float(r.stdout), 1) if r.returncode == 0 else None
+
+def tempo_partida_cli():
+    """Milissegundos de parede de um `python -m scraper scrape --dry-run` (interpretador incluso)."""
+    inicio = time.perf_counter()
+    subprocess.run([sys.executable, "-m", "scraper", "scrape", "--dry-run"], cwd=RAIZ,
+                   capture_output=True, check=True)
+    return round((time.perf_counter() - inicio) * 1000, 1)
+
+def medir_imports():
+    """Tempo de import dos módulos de IMPORTS_MEDIDOS e de partida da CLI, em ms."""
+    tempos = {rotulo: tempo_import(modulo) for rotulo, modulo in IMPORTS_MEDIDOS.items()}
+    tempos["partida_cli"] = tempo_partida_cli()
+    return tempos
+
+def cronometrar(scraper, latencias):
+    """Envolve scraper.extrair_produto para medir a latência de cada produto."""
+    original = scraper.extrair_produto
+
+    def extrair_produto(page, link):
+        inicio = time.perf_counter()
+        try:
+            return original(page, link)
+        finally:
+            latencias.append(time.perf_counter() - inicio)
+
+    scraper.extrair_produto = extrair_produto
+
+def executar(args, loja, diretorio, proxies=()):
+    """Roda o scraper em modo lote contra a loja e devolve o dicionário de resultados."""
+    scraper = ShopeeScraper()
+    if proxies:
+        scraper.proxies = PoolProxies([p.url for p in proxies], taxa_por_proxy=0, taxa_por_dominio=0)
+    scraper.espera_inteligente = args.espera_inteligente
+    scraper.movimento = args.movimento
+    scraper.screenshots = ScreenshotManager(modo=args.screenshot, diretorio=os.path.join(diretorio, "screenshots"))
+    scraper.sink = JsonlSink(os.path.join(diretorio, "produtos.jsonl"))
+    if args.http:
+        scraper.http = scraper.criar_http(base_url=loja.url)
+    if args.captura_api:
+        scraper.captura = CapturaApi()
+    latencias = []
+    cronometrar(scraper, latencias)
+
+    METRICAS.reiniciar()
+    uso_antes = resource.getrusage(resource.RUSAGE_SELF)
+    inicio = time.perf_counter()
+    with scraper.criar_pool() as pool:
+        scraper.pool = pool
+        resultados = scraper.scrape_produtos(f"{loja.url}/loja", limit=args.produtos)
+        # medido antes de fechar: depois disso os navegadores já não existem
+        rss_navegador = rss_descendentes_mb()
+        cpu_navegador = cpu_descendentes_s()
+    duracao = time.perf_counter() - inicio
+    uso = resource.getrusage(resource.RUSAGE_SELF)
+    scraper.sink.fechar()
+    scraper.screenshots.fechar()
+    if scraper.proxies is not None:
+        scraper.proxies.imprimir_relatorio()
+
+    encontrados = [r for r in resultados if "NÃO ENCONTRADO" not in f"{r.get('nome')}{r.get('preco')}"]
+    return {
+        "ts": round(time.time()),
+        "produtos": len(resultados),
+        "completos": len(encontrados),
+        "duracao_s": round(duracao, 2),
+        "produtos_por_min": round(len(resultados) * 60 / duracao, 2) if duracao else 0.0,
+        "p50_ms": round(percentil(latencias, 50) * 1000, 1),
+        "p95_ms": round(percentil(latencias, 95) * 1000, 1),
+        "cpu_python_s": round((uso.ru_utime - uso_antes.ru_utime) + (uso.ru_stime - uso_antes.ru_stime), 2),
+        "cpu_navegador_s": round(cpu_navegador, 2),
+        "rss_python_mb": round(uso.ru_maxrss / 1024, 1),
+        "rss_navegador_mb": round(rss_navegador, 1),
+        # comandos de mouse/scroll enviados ao navegador (IPC dos gestos humanos)
+        "comandos_humanos": int(sum(METRICAS.contador("humano_comandos_total", gesto=g) for g in ("mouse", "scroll"))),
+        "etapas": {nome: round(r["total_s"], 2) for nome, r in METRICAS.etapas().items()},
+        "importacao_ms": medir_imports(),
+        "config": {
+            "latencia_ms": args.latencia_ms,
+            "xhr_atraso_ms": args.xhr_atraso_ms,
+            "overlay": args.overlay,
+            "sem_seletor": args.sem_seletor,
+            "espera_inteligente": args.espera_inteligente,
+            "movimento": args.movimento,
+            "http": args.http,
+            "captura_api": args.captura_api,
+            "screenshot": args.screenshot,
+            "proxies": args.proxies,
+            "proxies_bloqueados": args.proxies_bloqueados,
+        },
+    }
+
+def imprimir(resultado):
+    print("\n===== Benchmark =====")
+    for chave in ("produtos", "completos", "duracao_s", "produtos_por_min", "p50_ms", "p95_ms",
+                  "cpu_python_s", "cpu_navegador_s", "rss_python_mb", "rss_navegador_mb", "comandos_humanos"):
+        if chave in resultado:
+            print(f"{chave:<18} {resultado[chave]}")
+    if "etapas" in resultado:
+        print("etapas (s):", ", ".join(f"{k}={v}" for k, v in resultado["etapas"].items()))
+    print("importação (ms):", ", ".join(f"{k}={'-' if v is None else v}"
+                                        for k, v in resultado["importacao_ms"].items()))
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.somente_import:
+        resultado = {"ts": round(time.time()), "importacao_ms": medir_imports()}
+    else:
+        loja = LojaFake(
+            produtos=args.produtos * 2,
+            por_pagina=args.produtos * 2,
+            latencia_ms=args.latencia_ms,
+            xhr_atraso_ms=args.xhr_atraso_ms,
+            overlay=args.overlay,
+            fracao_sem_seletor=args.sem_seletor,
+        )
+        with loja, tempfile.TemporaryDirectory() as diretorio, ExitStack() as pilha:
+            proxies = [pilha.enter_context(ProxyFake(bloquear=i < args.proxies_bloqueados))
+                       for i in range(args.proxies)]
+            resultado = executar(args, loja, diretorio, proxies)
+    imprimir(resultado)
+    if args.resultado:
+        with open(args.resultado, "a", encoding="utf-8") as f:
+            f.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
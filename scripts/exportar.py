@@ -0,0 +1,34 @@
+import argparse
+from scraper.precos import CAMPOS_PRECO, normalizar_linhas
+from scraper.sinks import CAMPOS_PADRAO, criar_sink, ler_resultados
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Converte resultados entre formatos (.csv, .jsonl, .db, .parquet)")
+    parser.add_argument("entradas", nargs="+",
+                        help="arquivos .csv, .jsonl ou .db/.sqlite gravados pelo scraper")
+    parser.add_argument("--saida", required=True,
+                        help="destino: .csv, .jsonl, .db/.sqlite ou .parquet")
+    parser.add_argument("--normalizar-precos", action="store_true",
+                        help="acrescenta valor numérico, moeda, desconto e parcelas")
+    parser.add_argument("--locale", choices=["es-AR", "pt-BR"], default=None,
+                        help="força o locale da normalização (padrão: deduzido pelo domínio de cada link)")
+    parser.add_argument("--lote", type=int, default=5000,
+                        help="linhas gravadas por vez")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    opcoes = dict(tamanho_lote=args.lote, intervalo_s=float("inf"))
+    if args.normalizar_precos:
+        opcoes["transformar"] = lambda linhas: normalizar_linhas(linhas, locale=args.locale)
+    if args.saida.endswith(".csv"):
+        opcoes["campos"] = CAMPOS_PADRAO + ("coletado_em",) + (CAMPOS_PRECO if args.normalizar_precos else ())
+    with criar_sink(args.saida, **opcoes) as sink:
+        for entrada in args.entradas:
+            for linha in ler_resultados(entrada):
+                sink.escrever(linha)
+    print(f"{sink.gravadas} linhas exportadas para {args.saida}")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,83 @@
+import argparse
+import time
+from datetime import datetime, timezone
+from scraper.historico import HistoricoPrecos
+from scraper.sinks import ler_resultados
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Histórico de preços: importa resultados e consulta a evolução")
+    parser.add_argument("--banco", default="historico.db",
+                        help="SQLite do histórico")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    importar = comandos.add_parser("importar", help="acrescenta resultados de arquivos .csv, .jsonl ou .db")
+    importar.add_argument("arquivos", nargs="+")
+    importar.add_argument("--lote", type=int, default=20000,
+                          help="observações gravadas por transação")
+
+    ultimo = comandos.add_parser("ultimo", help="último preço de um produto")
+    ultimo.add_argument("produto", help="link ou chave (ex.: shopee:123.456)")
+
+    faixa = comandos.add_parser("faixa", help="menor e maior preço de um produto na janela")
+    faixa.add_argument("produto", help="link ou chave (ex.: shopee:123.456)")
+    faixa.add_argument("--dias", type=float, default=30)
+
+    quedas = comandos.add_parser("quedas", help="produtos cujo preço atual mais caiu em relação ao topo da janela")
+    quedas.add_argument("--dias", type=float, default=7)
+    quedas.add_argument("--limite", type=int, default=20)
+
+    comandos.add_parser("compactar", help="remove observações que repetem o preço anterior")
+    return parser.parse_args(argv)
+
+def formatar(centavos, moeda):
+    """Centavos no formato "ARS 1.234,56"."""
+    inteiro, decimal = divmod(centavos, 100)
+    return f"{moeda or ''} {inteiro:,}".replace(",", ".").strip() + f",{decimal:02d}"
+
+def data(ts):
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat(timespec="seconds")
+
+def importar(historico, args):
+    gravadas = 0
+    for caminho in args.arquivos:
+        lote = []
+        for linha in ler_resultados(caminho):
+            lote.append(linha)
+            if len(lote) >= args.lote:
+                gravadas += historico.registrar_lote(lote)
+                lote = []
+        gravadas += historico.registrar_lote(lote)
+    print(f"{gravadas} observações gravadas ({historico.ignoradas} sem preço reconhecível), "
+          f"{len(historico)} no histórico")
+
+def main(argv=None):
+    args = parse_args(argv)
+    historico = HistoricoPrecos(args.banco)
+    try:
+        if args.comando == "importar":
+            importar(historico, args)
+        elif args.comando == "compactar":
+            historico.compactar()
+        elif args.comando == "ultimo":
+            r = historico.ultimo(args.produto)
+            if r is None:
+                print(f"Sem histórico para {args.produto}")
+                return 1
+            print(f"{r['chave']} | {r['nome']} | {formatar(r['centavos'], r['moeda'])} em {data(r['ts'])}")
+        elif args.comando == "faixa":
+            r = historico.faixa(args.produto, time.time() - args.dias * 86400)
+            if r is None:
+                print(f"Sem preço para {args.produto} nos últimos {args.dias:g} dias")
+                return 1
+            print(f"{r['chave']} | {r['nome']} | mín {formatar(r['minimo'], r['moeda'])} | "
+                  f"máx {formatar(r['maximo'], r['moeda'])} ({r['observacoes']} observações)")
+        else:
+            for r in historico.maiores_quedas(time.time() - args.dias * 86400, args.limite):
+                print(f"-{r['queda_pct']:5.1f}% | {formatar(r['maximo'], r['moeda'])} -> "
+                      f"{formatar(r['atual'], r['moeda'])} | {r['nome']} | {r['link']}")
+    finally:
+        historico.fechar()
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,251 @@
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.error import HTTPError, URLError
+from urllib.parse import parse_qs, urlsplit
+from urllib.request import ProxyHandler, Request, build_opener
+
+from scraper.http_fetcher import FATOR_PRECO_SHOPEE
+
+
+def _preco(n: int) -> int:
+    """Preço determinístico do produto n (em pesos)."""
+    return 1000 + (n * 7919) % 90000
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Rotas da loja fake; a configuração fica em self.server.loja."""
+
+    def do_GET(self):
+        loja: "LojaFake" = self.server.loja
+        partes = urlsplit(self.path)
+        query = parse_qs(partes.query)
+        if loja.latencia_ms:
+            time.sleep(loja.latencia_ms / 1000)
+
+        if partes.path == "/loja":
+            pagina = int(query.get("page", ["0"])[0])
+            self._responder(loja.html_listagem(pagina))
+        elif partes.path.startswith("/product/1/"):
+            try:
+                n = int(partes.path.rsplit("/", 1)[-1])
+            except ValueError:
+                self.send_error(404)
+                return
+            if not 1 <= n <= loja.produtos:
+                self.send_error(404)
+                return
+            self._responder(loja.html_produto(n))
+        elif partes.path == "/api/v4/item/get":
+            if loja.xhr_atraso_ms:
+                time.sleep(loja.xhr_atraso_ms / 1000)
+            n = int(query.get("itemid", ["0"])[0])
+            corpo = loja.item_api(n) if 1 <= n <= loja.produtos else {"error": 4, "data": None}
+            self._responder(json.dumps(corpo), "application/json")
+        else:
+            self.send_error(404)
+
+    def _responder(self, corpo: str, tipo: str = "text/html; charset=utf-8"):
+        dados = corpo.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(dados)))
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LojaFake:
+    """
+    Loja local no formato da Shopee para benchmarks e testes sem rede.
+
+    Rotas:
+        /loja?page=N           listagem paginada com links /product/1/<n>
+        /product/1/<n>         página do produto; nome e preço são renderizados
+                               pelo JavaScript a partir do XHR, como na Shopee
+        /api/v4/item/get       JSON do item (preço x100000)
+
+    Condições configuráveis: latência de toda resposta, atraso só do XHR,
+    overlay (modal com botão de fechar) e uma fração de produtos cujo
+    nome e preço vêm com classes que nenhum seletor conhece. As páginas
+    também trazem JSON-LD, então o modo HTTP funciona contra ela.
+    """
+
+    def __init__(self, produtos: int = 50, por_pagina: int = 20, latencia_ms: int = 0,
+                 xhr_atraso_ms: int = 0, overlay: bool = False, fracao_sem_seletor: float = 0.0,
+                 semente: int = 0):
+        """Configura a loja
+
+        Args:
+            produtos: Total de produtos do catálogo
+            por_pagina: Produtos por página da listagem
+            latencia_ms: Atraso aplicado a toda resposta
+            xhr_atraso_ms: Atraso extra da API do item (XHR lento)
+            overlay: Mostra um modal sobre a listagem e o produto
+            fracao_sem_seletor: Fração (0-1) dos produtos com classes desconhecidas
+            semente: Semente que escolhe quais produtos ficam sem seletor
+        """
+        self.produtos = produtos
+        self.por_pagina = por_pagina
+        self.latencia_ms = latencia_ms
+        self.xhr_atraso_ms = xhr_atraso_ms
+        self.overlay = overlay
+        sorteio = random.Random(semente)
+        self.sem_seletor = {n for n in range(1, produtos + 1) if sorteio.random() < fracao_sem_seletor}
+        self._server: Optional[ThreadingHTTPServer] = None
+        self.url = ""
+
+    def _overlay_html(self) -> str:
+        if not self.overlay:
+            return ""
+        return (
+            "<div class='shopee-modal' style='position:fixed;inset:0;background:#0008;z-index:9'>"
+            "<button class='shopee-modal__close' onclick='this.parentElement.remove()'>x</button></div>"
+        )
+
+    def html_listagem(self, pagina: int) -> str:
+        inicio = pagina * self.por_pagina + 1
+        fim = min(self.produtos, inicio + self.por_pagina - 1)
+        links = "".join(
+            f"<div class='shop-search-result-view__item'><a href='/product/1/{n}?sp_atk=bench'>Produto {n}</a></div>"
+            for n in range(inicio, fim + 1)
+        )
+        return f"<html><body>{self._overlay_html()}<div class='shop'>{links}</div></body></html>"
+
+    def html_produto(self, n: int) -> str:
+        nome = f"Produto de teste {n}"
+        ld = json.dumps({"@type": "Product", "name": nome, "offers": {"price": f"{_preco(n):,}".replace(",", ".")}})
+        if n in self.sem_seletor:
+            classes = ("_x9k2", "_p0q7")
+        else:
+            classes = ("product-title", "product-price")
+        # renderiza a partir do XHR, como a página real
+        script = (
+            f"fetch('/api/v4/item/get?itemid={n}&shopid=1').then(r => r.json()).then(j => {{"
+            f"document.getElementById('nome').className = '{classes[0]}';"
+            f"document.getElementById('nome').textContent = j.data.name;"
+            f"document.getElementById('preco').className = '{classes[1]}';"
+            f"document.getElementById('preco').textContent = '$ ' + (j.data.price / {FATOR_PRECO_SHOPEE}).toLocaleString('es-AR');"
+            f"}});"
+        )
+        return (
+            f"<html><head><title>{nome}</title>"
+            f"<script type='application/ld+json'>{ld}</script></head><body>"
+            f"{self._overlay_html()}"
+            f"<main class='product-briefing'><div id='nome'></div><div id='preco'></div></main>"
+            f"<script>{script}</script></body></html>"
+        )
+
+    def item_api(self, n: int) -> dict:
+        return {
+            "error": None,
+            "data": {
+                "itemid": n,
+                "shopid": 1,
+                "name": f"Produto de teste {n}",
+                "price": _preco(n) * FATOR_PRECO_SHOPEE,
+                "stock": n % 13,
+                "item_rating": {"rating_star": 4.0 + (n % 10) / 10},
+            },
+        }
+
+    def iniciar(self) -> str:
+        """Sobe o servidor numa porta livre e devolve a URL base."""
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._server.daemon_threads = True
+        self._server.loja = self
+        threading.Thread(target=self._server.serve_forever, daemon=True, name="loja-fake").start()
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        return self.url
+
+    def parar(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        self.iniciar()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.parar()
+        return False
+
+
+class _HandlerProxy(BaseHTTPRequestHandler):
+    """Proxy HTTP de encaminhamento (GET com URL absoluta); configuração em self.server.proxy."""
+
+    def do_GET(self):
+        proxy: "ProxyFake" = self.server.proxy
+        proxy.requisicoes += 1
+        if proxy.latencia_ms:
+            time.sleep(proxy.latencia_ms / 1000)
+        if proxy.bloquear:
+            self.send_error(403)
+            return
+        cabecalhos = {k: v for k, v in self.headers.items() if k.lower() not in ("host", "proxy-connection", "connection")}
+        try:
+            resp = proxy._opener.open(Request(self.path, headers=cabecalhos), timeout=30)
+            status, corpo, tipo = resp.status, resp.read(), resp.headers.get("Content-Type", "text/html")
+        except HTTPError as e:
+            status, corpo, tipo = e.code, e.read(), e.headers.get("Content-Type", "text/html")
+        except URLError:
+            self.send_error(502)
+            return
+        self.send_response(status)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ProxyFake:
+    """
+    Proxy HTTP local para testar o PoolProxies sem proxies de verdade.
+
+    Encaminha GETs (URL absoluta, como os clientes mandam para um proxy)
+    até o destino. `bloquear` faz o proxy responder 403 a tudo, como um
+    IP banido; `latencia_ms` atrasa cada resposta. Os dois podem ser
+    trocados com o proxy rodando. `requisicoes` conta o tráfego recebido.
+    """
+
+    def __init__(self, bloquear: bool = False, latencia_ms: int = 0):
+        self.bloquear = bloquear
+        self.latencia_ms = latencia_ms
+        self.requisicoes = 0
+        # conexão direta ao destino (ignora HTTP_PROXY do ambiente)
+        self._opener = build_opener(ProxyHandler({}))
+        self._server: Optional[ThreadingHTTPServer] = None
+        self.url = ""
+
+    def iniciar(self) -> str:
+        """Sobe o proxy numa porta livre e devolve a URL (http://127.0.0.1:<porta>)."""
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _HandlerProxy)
+        self._server.daemon_threads = True
+        self._server.proxy = self
+        threading.Thread(target=self._server.serve_forever, daemon=True, name="proxy-fake").start()
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        return self.url
+
+    def parar(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        self.iniciar()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.parar()
+        return False
@@ -0,0 +1,43 @@
+import argparse
+import csv
+import os
+import sys
+from scraper.precos import CAMPOS_PRECO, normalizar_linhas
+from scraper.sinks import CAMPOS_PADRAO, criar_sink
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Normaliza os preços de um CSV de produtos (nome, preco, link)")
+    parser.add_argument("entrada", nargs="?", default="produtos.csv",
+                        help="CSV de entrada (com ou sem cabeçalho)")
+    parser.add_argument("--saida", default="produtos_normalizados.csv",
+                        help="destino: .csv, .jsonl, .db/.sqlite ou .parquet")
+    parser.add_argument("--locale", choices=["es-AR", "pt-BR"], default=None,
+                        help="força o locale (padrão: deduzido pelo domínio de cada link)")
+    parser.add_argument("--lote", type=int, default=5000,
+                        help="linhas normalizadas e gravadas por vez")
+    return parser.parse_args(argv)
+
+def ler_linhas(caminho):
+    """Lê o CSV legado (sem cabeçalho) ou com cabeçalho nome,preco,link."""
+    with open(caminho, newline="", encoding="utf-8") as f:
+        for i, row in enumerate(csv.reader(f)):
+            if i == 0 and row[:3] == list(CAMPOS_PADRAO):
+                continue
+            if len(row) >= 3:
+                # linhas legadas não têm data de coleta
+                yield {"nome": row[0], "preco": row[1], "link": row[2], "coletado_em": None}
+
+def main(argv=None):
+    args = parse_args(argv)
+    opcoes = dict(tamanho_lote=args.lote, intervalo_s=float("inf"),
+                  transformar=lambda linhas: normalizar_linhas(linhas, locale=args.locale))
+    if args.saida.endswith(".csv"):
+        opcoes["campos"] = CAMPOS_PADRAO + CAMPOS_PRECO
+    with criar_sink(args.saida, **opcoes) as sink:
+        for linha in ler_linhas(args.entrada):
+            sink.escrever(linha)
+    print(f"{sink.gravadas} linhas normalizadas em {args.saida}")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,3 +5,60 @@ import os
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    """Loja fake no formato da Shopee: /loja lista produtos em /product/1/<n>."""
+
+    total_produtos = 6
+
+    def do_GET(self):
+        if self.path.startswith("/loja"):
+            links = "".join(
+                f'<a href="/product/1/{n}">Produto {n}</a>' for n in range(1, self.total_produtos + 1)
+            )
+            corpo = f"<html><body><div class='shop'>{links}</div></body></html>"
+        elif self.path.startswith("/product/1/"):
+            n = self.path.rsplit("/", 1)[-1]
+            corpo = (
+                f"<html><body><h1>Produto de teste {n}</h1>"
+                f"<div class='product-price'>$ {n}.999,00</div></body></html>"
+            )
+        else:
+            self.send_error(404)
+            return
+        dados = corpo.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(dados)))
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def fixture_server():
+    """Sobe a loja fake num servidor HTTP local e devolve a URL base."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FixtureHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def firefox_disponivel() -> bool:
+    """Verifica se o Firefox do Playwright está instalado (necessário para testes de integração)."""
+    try:
+        from playwright.sync_api import sync_playwright
+        with sync_playwright() as p:
+            return os.path.exists(p.firefox.executable_path)
+    except Exception:
+        return False
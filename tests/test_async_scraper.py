@@ -0,0 +1,105 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from conftest import firefox_disponivel
+from scraper.async_scraper import AsyncShopeeScraper, human_pause, human_scroll
+
+
+class TestAsyncHumanHelpers:
+    """Testes para as versões assíncronas dos helpers humanos."""
+
+    def test_human_pause_runs_without_error(self):
+        """Verifica que human_pause assíncrono executa sem erros."""
+        asyncio.run(human_pause(0.001, 0.002))
+
+    def test_human_scroll_with_distance(self):
+        """Verifica que human_scroll assíncrono chama mouse.wheel."""
+        mock_page = Mock()
+        mock_page.mouse.wheel = AsyncMock()
+
+        asyncio.run(human_scroll(mock_page, distance=100))
+
+        assert mock_page.mouse.wheel.await_count >= 1
+
+
+class _PaginaFake:
+    """Página mínima que mede quantas navegações acontecem ao mesmo tempo."""
+
+    ativos = 0
+    pico = 0
+
+    def __init__(self):
+        self.url = None
+
+    async def goto(self, url, **kwargs):
+        cls = type(self)
+        cls.ativos += 1
+        cls.pico = max(cls.pico, cls.ativos)
+        await asyncio.sleep(0.01)
+        cls.ativos -= 1
+        self.url = url
+
+
+class _ScraperFake(AsyncShopeeScraper):
+    async def _extrair_dados(self, page):
+        return {"nome": "Produto", "preco": "$ 1", "link": page.url}
+
+
+class TestAsyncShopeeScraper:
+    """Testes para o motor assíncrono."""
+
+    def test_processar_fila_respeita_limite_de_concorrencia(self):
+        """Verifica que cada URL gera um resultado e nunca há mais páginas ativas que workers."""
+        _PaginaFake.ativos = 0
+        _PaginaFake.pico = 0
+        scraper = _ScraperFake(concorrencia=3, ritmo=0, salvar=False)
+        urls = [f"http://loja/product/1/{n}" for n in range(10)]
+
+        resultados = asyncio.run(scraper._processar_fila([_PaginaFake() for _ in range(3)], urls))
+
+        assert sorted(r["link"] for r in resultados) == sorted(urls)
+        assert 1 < _PaginaFake.pico <= 3
+
+    def test_worker_continua_apos_erro(self):
+        """Verifica que uma URL com erro não interrompe a fila."""
+        scraper = _ScraperFake(concorrencia=1, ritmo=0, salvar=False)
+        pagina = _PaginaFake()
+        original = pagina.goto
+
+        async def goto(url, **kwargs):
+            if url.endswith("/ruim"):
+                raise Exception("timeout")
+            await original(url, **kwargs)
+
+        pagina.goto = goto
+
+        resultados = asyncio.run(scraper._processar_fila([pagina], ["http://loja/ruim", "http://loja/boa"]))
+
+        assert [r["link"] for r in resultados] == ["http://loja/boa"]
+
+    def test_coletar_links_pelo_link_mais_proximo(self):
+        """Verifica que a listagem lê os hrefs numa chamada e pula seletores sem links."""
+        scraper = AsyncShopeeScraper(ritmo=0)
+        page = Mock(url="https://shopee.com.ar/loja")
+        page.goto = AsyncMock()
+        page.mouse.wheel = AsyncMock()
+        hrefs = {"a[href*='/product/']": [], "div[data-sqe='item']": ["/product/1/10", None, "/product/1/10"]}
+        page.eval_on_selector_all = AsyncMock(side_effect=lambda seletor, js: hrefs.get(seletor, []))
+
+        links = asyncio.run(scraper._coletar_links(page, "https://shopee.com.ar/loja"))
+
+        assert links == ["https://shopee.com.ar/product/1/10"]
+        assert page.eval_on_selector_all.await_count == 2
+
+
+@pytest.mark.skipif(not firefox_disponivel(), reason="Firefox do Playwright não instalado")
+def test_scrape_loja_contra_servidor_local(fixture_server, tmp_path, monkeypatch):
+    """Teste de integração contra a loja fake servida localmente."""
+    monkeypatch.chdir(tmp_path)
+    scraper = AsyncShopeeScraper(concorrencia=3, ritmo=0.01, salvar=False)
+
+    resultados = asyncio.run(scraper.scrape_loja(f"{fixture_server}/loja", limit=4))
+
+    assert len(resultados) == 4
+    assert all(r["nome"].startswith("Produto de teste") for r in resultados)
@@ -0,0 +1,86 @@
+import json
+import time
+import urllib.request
+
+import pytest
+
+from conftest import firefox_disponivel
+from scraper.http_fetcher import HttpFetcher, parse_html_produto
+from scripts import benchmark
+from scripts.loja_fake import LojaFake
+
+
+def _get(url):
+    with urllib.request.urlopen(url) as resp:
+        return resp.read().decode("utf-8")
+
+
+class TestLojaFake:
+    """Testes para a loja local usada no benchmark."""
+
+    def test_listagem_paginada(self):
+        """Verifica a paginação da listagem e os links com parâmetro de rastreamento."""
+        with LojaFake(produtos=5, por_pagina=2) as loja:
+            primeira = _get(f"{loja.url}/loja")
+            ultima = _get(f"{loja.url}/loja?page=2")
+            vazia = _get(f"{loja.url}/loja?page=3")
+
+        assert primeira.count("/product/1/") == 2
+        assert "/product/1/5?sp_atk=bench" in ultima
+        assert "/product/1/" not in vazia
+
+    def test_xhr_lento_e_preco_da_api(self):
+        """Verifica o atraso só na API e o preço no formato x100000."""
+        with LojaFake(produtos=3, xhr_atraso_ms=150) as loja:
+            inicio = time.perf_counter()
+            _get(f"{loja.url}/product/1/1")
+            pagina_s = time.perf_counter() - inicio
+            inicio = time.perf_counter()
+            item = json.loads(_get(f"{loja.url}/api/v4/item/get?itemid=2&shopid=1"))
+            api_s = time.perf_counter() - inicio
+
+        assert pagina_s < 0.15 <= api_s
+        assert item["data"]["price"] % 100000 == 0
+
+    def test_produtos_sem_seletor_e_overlay(self):
+        """Verifica as classes desconhecidas e o modal com botão de fechar."""
+        loja = LojaFake(produtos=10, fracao_sem_seletor=1.0, overlay=True)
+
+        html = loja.html_produto(1)
+        assert "_x9k2" in html and "product-title" not in html
+        assert "shopee-modal__close" in html
+        assert parse_html_produto(html)["nome"] == "Produto de teste 1"
+
+    def test_modo_http_contra_loja_fake(self):
+        """Verifica o HttpFetcher de ponta a ponta sem rede externa."""
+        with LojaFake(produtos=3) as loja:
+            fetcher = HttpFetcher(base_url=loja.url)
+            dados = fetcher.buscar_produto(f"{loja.url}/product/1/3?sp_atk=bench")
+
+        assert dados["nome"] == "Produto de teste 3"
+        assert dados["estoque"] == 3
+
+
+class TestBenchmark:
+    """Testes para o relatório do benchmark."""
+
+    def test_percentil(self):
+        """Verifica p50/p95 por interpolação."""
+        valores = [float(v) for v in range(1, 101)]
+
+        assert benchmark.percentil(valores, 50) == pytest.approx(50.5)
+        assert benchmark.percentil(valores, 95) == pytest.approx(95.05)
+        assert benchmark.percentil([], 95) == 0.0
+
+    @pytest.mark.skipif(not firefox_disponivel(), reason="Firefox do Playwright não instalado")
+    def test_benchmark_ponta_a_ponta(self, tmp_path):
+        """Roda o ShopeeScraper contra a loja fake e verifica o relatório gravado."""
+        resultado = tmp_path / "bench.jsonl"
+
+        benchmark.main(["--produtos", "2", "--latencia-ms", "0", "--xhr-atraso-ms", "0",
+                        "--espera-inteligente", "--resultado", str(resultado)])
+
+        linha = json.loads(resultado.read_text(encoding="utf-8"))
+        assert linha["produtos"] == 2
+        assert linha["produtos_por_min"] > 0
+        assert linha["p95_ms"] >= linha["p50_ms"]
@@ -0,0 +1,87 @@
+import pytest
+from unittest.mock import Mock
+
+from scraper.browser_pool import BrowserPool, rss_descendentes_mb
+
+
+def _playwright_fake():
+    """Playwright fake: cada launch devolve um navegador novo e conectado."""
+    p = Mock()
+    p.firefox.launch = Mock(side_effect=lambda **kwargs: Mock(is_connected=Mock(return_value=True)))
+    return p
+
+
+class TestBrowserPool:
+    """Testes para o pool de navegadores."""
+
+    def test_iniciar_aquece_navegadores_com_script(self):
+        """Verifica que iniciar lança todos os navegadores e instala o script no contexto."""
+        p = _playwright_fake()
+        pool = BrowserPool(tamanho=2, init_script="script", extra_headers={"DNT": "1"}, max_rss_mb=0)
+
+        pool.iniciar(p)
+
+        assert p.firefox.launch.call_count == 2
+        context = pool.checkout()
+        context.add_init_script.assert_called_once_with("script")
+        context.set_extra_http_headers.assert_called_once_with({"DNT": "1"})
+
+    def test_contexto_reutilizado_entre_checkouts(self):
+        """Verifica que o mesmo contexto volta ao pool sem relançar o navegador."""
+        p = _playwright_fake()
+        pool = BrowserPool(max_rss_mb=0)
+        pool.iniciar(p)
+
+        primeiro = pool.checkout()
+        pool.devolver(primeiro)
+        segundo = pool.checkout()
+
+        assert primeiro is segundo
+        assert p.firefox.launch.call_count == 1
+
+    def test_checkout_sem_contexto_livre(self):
+        """Verifica erro quando todos os contextos estão em uso."""
+        pool = BrowserPool(max_rss_mb=0)
+        pool.iniciar(_playwright_fake())
+        pool.checkout()
+
+        with pytest.raises(RuntimeError):
+            pool.checkout()
+
+    def test_recicla_apos_max_paginas(self):
+        """Verifica que o navegador é relançado ao atingir o limite de páginas."""
+        p = _playwright_fake()
+        pool = BrowserPool(max_paginas=2, max_rss_mb=0)
+        pool.iniciar(p)
+
+        context = pool.checkout()
+        pool.devolver(context, paginas=2)
+
+        assert p.firefox.launch.call_count == 2
+        assert pool.checkout() is not context
+
+    def test_health_check_relanca_navegador_desconectado(self):
+        """Verifica que checkout substitui um navegador que caiu."""
+        p = _playwright_fake()
+        pool = BrowserPool(max_rss_mb=0)
+        pool.iniciar(p)
+        pool._slots[0].browser.is_connected = Mock(return_value=False)
+
+        pool.checkout()
+
+        assert p.firefox.launch.call_count == 2
+
+    def test_pagina_fecha_pagina_e_devolve_contexto(self):
+        """Verifica que pagina() fecha a página e libera o contexto."""
+        pool = BrowserPool(max_rss_mb=0)
+        pool.iniciar(_playwright_fake())
+
+        with pool.pagina() as page:
+            pass
+
+        page.close.assert_called_once()
+        assert pool._slots[0].em_uso is False
+
+    def test_rss_descendentes_nao_negativo(self):
+        """Verifica que a medição de RSS funciona no sistema atual."""
+        assert rss_descendentes_mb() >= 0.0
@@ -0,0 +1,140 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+from scraper.captura_api import CapturaApi
+from scraper.shopee_scraper import ShopeeScraper
+
+
+LINK = "https://shopee.com.ar/Fone-Bluetooth-i.123.456"
+URL_ITEM = "https://shopee.com.ar/api/v4/item/get?itemid=456&shopid=123"
+URL_LOJA = "https://shopee.com.ar/api/v4/shop/get_shop_base?shopid=123"
+
+ITEM = {"data": {"itemid": 456, "name": "Fone Bluetooth", "price": 1299900000, "stock": 7,
+                 "item_rating": {"rating_star": 4.5}}}
+LOJA = {"data": {"shopid": 123, "name": "Topick Global"}}
+
+
+def _resposta(url, payload, status=200):
+    resp = Mock()
+    resp.url = url
+    resp.status = status
+    resp.json.return_value = payload
+    return resp
+
+
+class TestCapturaApi:
+    """Testes para a captura de dados das respostas XHR."""
+
+    def test_item_e_loja(self):
+        """Verifica que o item é associado ao link pelo itemid e recebe o nome da loja."""
+        captura = CapturaApi()
+        captura._on_response(_resposta(URL_LOJA, LOJA))
+        captura._on_response(_resposta(URL_ITEM, ITEM))
+
+        dados = captura.obter(LINK)
+
+        assert dados["nome"] == "Fone Bluetooth"
+        assert dados["preco"] == "$ 12.999"
+        assert dados["estoque"] == 7
+        assert dados["avaliacao"] == 4.5
+        assert dados["loja"] == "Topick Global"
+        # obter() retira o item
+        assert captura.obter(LINK) is None
+
+    def test_ignora_outras_rotas_e_erros(self):
+        """Verifica que respostas fora das rotas de item ou com status != 200 são ignoradas."""
+        captura = CapturaApi()
+        outra = _resposta("https://shopee.com.ar/api/v4/recommend/recommend?x=1", ITEM)
+        captura._on_response(outra)
+        captura._on_response(_resposta(URL_ITEM, ITEM, status=403))
+
+        assert captura.obter(LINK) is None
+        outra.json.assert_not_called()
+
+    def test_aguardar_resolve_quando_payload_chega(self):
+        """Verifica que aguardar() devolve assim que a resposta é despachada."""
+        captura = CapturaApi(timeout_ms=5000)
+        page = Mock()
+        page.url = LINK
+        page.wait_for_timeout.side_effect = lambda ms: captura._on_response(_resposta(URL_ITEM, ITEM))
+
+        dados = captura.aguardar(page)
+
+        assert dados["nome"] == "Fone Bluetooth"
+        assert page.wait_for_timeout.call_count == 1
+        assert captura.acertos == 1
+
+    def test_aguardar_timeout(self):
+        """Verifica None (fallback para o DOM) quando o payload não chega."""
+        captura = CapturaApi(timeout_ms=0)
+        page = Mock()
+        page.url = LINK
+
+        assert captura.aguardar(page) is None
+        assert captura.fallbacks == 1
+
+    def test_aguardar_async(self):
+        """Verifica a espera na API assíncrona."""
+        captura = CapturaApi(timeout_ms=1000, intervalo_ms=1)
+        page = Mock()
+        page.url = LINK
+
+        async def cenario():
+            espera = asyncio.create_task(captura.aguardar_async(page, LINK))
+            await asyncio.sleep(0.01)
+            captura.processar(URL_ITEM, ITEM)
+            return await espera
+
+        assert asyncio.run(cenario())["nome"] == "Fone Bluetooth"
+
+    def test_link_sem_ids_usa_o_ultimo_da_propria_pagina(self):
+        """Verifica que páginas que compartilham a captura não trocam produtos entre si."""
+        captura = CapturaApi()
+        pagina_a, pagina_b = Mock(), Mock()
+        captura.instalar_async(pagina_a)
+        captura.instalar_async(pagina_b)
+        ouvinte_a = pagina_a.on.call_args[0][1]
+        item_b = {"data": {"itemid": 9, "name": "Da página B", "price": 100000}}
+        resposta = _resposta(URL_ITEM, ITEM)
+        resposta.json = AsyncMock(return_value=ITEM)
+
+        asyncio.run(ouvinte_a(resposta))
+        captura.processar("https://shopee.com.ar/api/v4/item/get?itemid=9", item_b, pagina_b)
+
+        assert captura.obter("https://shopee.com.ar/oferta", pagina_b)["nome"] == "Da página B"
+        assert captura.obter("https://shopee.com.ar/oferta", pagina_b) is None
+        assert captura.obter("https://shopee.com.ar/oferta", pagina_a)["nome"] == "Fone Bluetooth"
+
+
+class TestCapturaNoScraper:
+    """Testes para o uso da captura XHR pelo ShopeeScraper."""
+
+    def test_visitar_produto_usa_api_sem_esperar_dom(self):
+        """Verifica que, com o payload capturado, não há espera nem extração pelo DOM."""
+        scraper = ShopeeScraper()
+        scraper.screenshots.modo = "desligado"
+        scraper.captura = CapturaApi()
+        page = Mock()
+        page.url = LINK
+        page.goto.side_effect = lambda *a, **k: scraper.captura.processar(URL_ITEM, ITEM)
+        scraper._aguardar = Mock()
+        scraper._extrair_dados = Mock()
+
+        dados = scraper._visitar_produto(page, LINK)
+
+        assert dados["nome"] == "Fone Bluetooth"
+        assert dados["link"] == LINK
+        scraper._aguardar.assert_not_called()
+        scraper._extrair_dados.assert_not_called()
+
+    def test_visitar_produto_fallback_dom(self):
+        """Verifica que os seletores do DOM são usados se a API não responder."""
+        scraper = ShopeeScraper()
+        scraper.captura = CapturaApi(timeout_ms=0)
+        page = Mock()
+        page.url = LINK
+        scraper._aguardar = Mock()
+        scraper._extrair_dados = Mock(return_value={"nome": "DOM", "preco": "$ 1", "link": LINK})
+
+        assert scraper._visitar_produto(page, LINK)["nome"] == "DOM"
+        scraper._aguardar.assert_called_once()
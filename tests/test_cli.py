@@ -0,0 +1,88 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+from conftest import PROJECT_ROOT
+from scraper.__main__ import COMANDOS, main
+from scripts import benchmark, run_scraper
+
+
+def _modulos_carregados(modulo):
+    """Importa o módulo num interpretador limpo e devolve os módulos pesados que vieram junto."""
+    codigo = (f"import sys, {modulo}; "
+              "print(sorted({m.split('.')[0] for m in sys.modules} & {'playwright', 'requests', 'lxml'}))")
+    saida = subprocess.run([sys.executable, "-c", codigo], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+    return json.loads(saida.stdout.replace("'", '"'))
+
+
+class TestImportPreguicoso:
+    """Testes para a partida sem o Playwright."""
+
+    def test_cli_nao_importa_o_motor(self):
+        """Verifica que a CLI parte sem Playwright, requests nem lxml."""
+        assert _modulos_carregados("scripts.run_scraper") == []
+
+    @pytest.mark.parametrize("modulo", ["scraper.shopee_scraper", "scraper.async_scraper", "scraper.ml_scraper"])
+    def test_scrapers_nao_importam_playwright(self, modulo):
+        """Verifica que o Playwright só é importado quando um navegador é lançado."""
+        assert "playwright" not in _modulos_carregados(modulo)
+
+
+class TestCli:
+    """Testes para o python -m scraper."""
+
+    def test_subcomandos(self):
+        """Verifica os subcomandos pedidos e a ajuda do processo real."""
+        assert {"scrape", "crawl", "export", "bench"} <= set(COMANDOS)
+        saida = subprocess.run([sys.executable, "-m", "scraper", "--help"], cwd=PROJECT_ROOT,
+                               capture_output=True, text=True, check=True).stdout
+        assert "crawl" in saida and "export" in saida
+
+    def test_dry_run_somente_http(self, tmp_path, capsys):
+        """Verifica o plano impresso sem executar nada."""
+        links = tmp_path / "links.txt"
+        links.write_text("https://shopee.com.ar/a-i.1.2\n# comentário\nhttps://shopee.com.ar/b-i.1.3\n",
+                         encoding="utf-8")
+
+        assert main(["scrape", "--links", str(links), "--somente-http", "--dry-run"]) == 0
+
+        saida = capsys.readouterr().out
+        assert "Modo: links" in saida and "Links: 2" in saida
+        assert "Navegador: não (somente HTTP)" in saida
+
+    def test_somente_http_requer_links(self):
+        """Verifica que crawl/listagem com --somente-http é recusado."""
+        with pytest.raises(SystemExit):
+            run_scraper.parse_args(["--somente-http", "--crawl"])
+        assert run_scraper.parse_args(["--somente-http", "--links", "l.txt"]).http
+
+    def test_export_normalizando(self, tmp_path):
+        """Verifica export de CSV legado para JSONL com preços normalizados."""
+        entrada = tmp_path / "produtos.csv"
+        entrada.write_text("Fone,$ 1.299,https://shopee.com.ar/fone-i.1.2\n", encoding="utf-8")
+        saida = tmp_path / "produtos.jsonl"
+
+        assert main(["export", str(entrada), "--saida", str(saida), "--normalizar-precos"]) == 0
+
+        linha = json.loads(saida.read_text(encoding="utf-8"))
+        assert (linha["nome"], linha["preco_valor"], linha["preco_moeda"]) == ("Fone", "1299", "ARS")
+
+
+class TestBenchImport:
+    """Testes para o tempo de import no benchmark."""
+
+    def test_tempo_import(self):
+        """Verifica a medição num interpretador limpo e o módulo ausente."""
+        assert benchmark.tempo_import("json") >= 0
+        assert benchmark.tempo_import("modulo_que_nao_existe") is None
+
+    def test_somente_import_grava_resultado(self, tmp_path):
+        """Verifica importacao_ms na linha JSON do benchmark."""
+        resultado = tmp_path / "bench.jsonl"
+
+        assert benchmark.main(["--somente-import", "--resultado", str(resultado)]) == 0
+
+        importacao = json.loads(resultado.read_text(encoding="utf-8"))["importacao_ms"]
+        assert importacao["cli"] > 0 and importacao["partida_cli"] > 0
@@ -0,0 +1,118 @@
+from unittest.mock import Mock
+
+import pytest
+
+from conftest import firefox_disponivel
+from scraper.extraction import (
+    NOME_NAO_ENCONTRADO,
+    PRECO_NAO_ENCONTRADO,
+    SELETOR_PRECO_TEXTO,
+    extrair_em_uma_passada,
+    extrair_nome_preco,
+)
+from scraper.shopee_scraper import ShopeeScraper
+
+
+class TestExtracaoEmUmaPassada:
+    """Testes para a extração de nome e preço num único page.evaluate."""
+
+    def test_caso_comum_um_round_trip(self):
+        """Verifica que, achando tudo, há um único evaluate e nenhuma espera."""
+        mock_page = Mock()
+        mock_page.evaluate = Mock(return_value={
+            "nome": "Fone Bluetooth", "preco": "$ 12.999", "seletorNome": "h1", "seletorPreco": "div.pmmxKx",
+        })
+
+        dados = extrair_nome_preco(mock_page, ["h1"], ["div.pmmxKx"])
+
+        assert dados == {
+            "nome": "Fone Bluetooth",
+            "preco": "$ 12.999",
+            "seletor_nome": "h1",
+            "seletor_preco": "div.pmmxKx",
+        }
+        assert mock_page.evaluate.call_count == 1
+        assert not mock_page.locator.called
+
+    def test_cascata_enviada_inteira_para_a_pagina(self):
+        """Verifica que todos os seletores vão como argumento do evaluate."""
+        mock_page = Mock()
+        mock_page.evaluate = Mock(return_value=None)
+
+        extrair_em_uma_passada(mock_page, ["h1", "span.t"], ["div.p"], max_por_seletor=3)
+
+        argumento = mock_page.evaluate.call_args[0][1]
+        assert argumento == {"nomeSelectors": ["h1", "span.t"], "precoSelectors": ["div.p"], "maxPorSeletor": 3}
+
+    def test_preco_via_texto_registra_seletor_de_texto(self):
+        """Verifica que o fallback por texto ($, AR$, ARS) é identificado."""
+        mock_page = Mock()
+        mock_page.evaluate = Mock(return_value={"nome": None, "preco": "$ 10", "viaTexto": True})
+
+        dados = extrair_em_uma_passada(mock_page, ["h1"], ["div.p"])
+
+        assert dados["seletor_preco"] == SELETOR_PRECO_TEXTO
+
+    def test_pior_caso_limitado_a_uma_espera(self):
+        """Verifica que campos faltando geram uma espera e só mais um evaluate."""
+        mock_page = Mock()
+        mock_page.evaluate = Mock(side_effect=[
+            {"nome": "Produto X", "seletorNome": "h1"},
+            {"nome": "Produto X", "seletorNome": "h1", "preco": "$ 5", "seletorPreco": "div.p"},
+        ])
+
+        dados = extrair_nome_preco(mock_page, ["h1"], ["div.p"], espera_ms=100)
+
+        assert dados["preco"] == "$ 5"
+        assert mock_page.evaluate.call_count == 2
+        mock_page.locator.assert_called_once_with("div.p:visible")
+
+    def test_nada_encontrado_usa_marcadores(self):
+        """Verifica os valores padrão quando nada é encontrado."""
+        mock_page = Mock()
+        mock_page.evaluate = Mock(return_value={})
+        mock_page.locator.return_value.first.wait_for = Mock(side_effect=Exception("Timeout"))
+
+        dados = extrair_nome_preco(mock_page, ["h1"], ["div.p"])
+
+        assert dados["nome"] == NOME_NAO_ENCONTRADO
+        assert dados["preco"] == PRECO_NAO_ENCONTRADO
+        assert mock_page.evaluate.call_count == 1
+
+    def test_scraper_cai_na_cascata_sequencial_se_evaluate_falhar(self, monkeypatch):
+        """Verifica o fallback para a cascata original."""
+        scraper = ShopeeScraper()
+        mock_page = Mock()
+        mock_page.evaluate = Mock(side_effect=Exception("Target closed"))
+        monkeypatch.setattr(scraper, "_extrair_nome_preco_sequencial", lambda page: ("Nome", "$ 1"))
+
+        assert scraper._extrair_nome_preco(mock_page) == ("Nome", "$ 1")
+
+    def test_scraper_aceita_preco_via_texto(self, monkeypatch):
+        """Verifica que o fallback por texto não derruba a extração em uma passada."""
+        scraper = ShopeeScraper()
+        mock_page = Mock()
+        mock_page.evaluate = Mock(return_value={"nome": "Fone", "seletorNome": "h1", "preco": "$ 10", "viaTexto": True})
+        sequencial = Mock()
+        monkeypatch.setattr(scraper, "_extrair_nome_preco_sequencial", sequencial)
+
+        assert scraper._extrair_nome_preco(mock_page) == ("Fone", "$ 10")
+        sequencial.assert_not_called()
+
+    @pytest.mark.skipif(not firefox_disponivel(), reason="Firefox do Playwright não instalado")
+    def test_fallback_por_texto_ignora_script_e_oculto(self):
+        """Verifica que "$" em script inline ou em nó oculto não vence o preço visível."""
+        from playwright.sync_api import sync_playwright
+
+        html = ('<html><body><script>var preco = "$ 999";</script>'
+                '<div style="display:none">$ 555</div>'
+                '<h1>Fone</h1><span>$ 10</span></body></html>')
+        with sync_playwright() as p:
+            browser = p.firefox.launch(headless=True)
+            page = browser.new_page()
+            page.set_content(html)
+            dados = extrair_em_uma_passada(page, ["h1"], ["div.preco-inexistente"])
+            browser.close()
+
+        assert dados["preco"] == "$ 10"
+        assert dados["seletor_preco"] == SELETOR_PRECO_TEXTO
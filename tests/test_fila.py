@@ -0,0 +1,109 @@
+import json
+import threading
+
+from scraper.fila import FALHOU, FEITO, FilaTrabalhos
+from scraper.sinks import ler_resultados
+from scripts import run_fleet
+
+
+URLS = [f"https://shopee.com.ar/product/1/{n}" for n in range(1, 4)]
+
+
+class TestFilaTrabalhos:
+    """Testes para a fila durável da frota."""
+
+    def test_adicionar_ignora_repetidas(self, tmp_path):
+        """Verifica que URLs já enfileiradas não entram de novo."""
+        fila = FilaTrabalhos(str(tmp_path / "f.db"))
+
+        assert fila.adicionar(URLS) == 3
+        assert fila.adicionar(URLS[:1] + ["https://shopee.com.ar/product/1/9"]) == 1
+
+    def test_reserva_ack(self, tmp_path):
+        """Verifica que cada URL é reservada uma vez e o ack a finaliza."""
+        fila = FilaTrabalhos(str(tmp_path / "f.db"))
+        fila.adicionar(URLS)
+
+        reservados = [fila.reservar("w1") for _ in range(4)]
+        assert [r[1] for r in reservados[:3]] == URLS
+        assert reservados[3] is None
+
+        for id_trabalho, _ in reservados[:3]:
+            fila.ack(id_trabalho)
+        assert fila.ativos() == 0
+        assert fila.resumo()[FEITO] == 3
+
+    def test_nack_retenta_e_depois_falha(self, tmp_path):
+        """Verifica a volta para a fila até max_tentativas."""
+        fila = FilaTrabalhos(str(tmp_path / "f.db"), max_tentativas=2)
+        fila.adicionar(URLS[:1])
+
+        id_trabalho, _ = fila.reservar("w1")
+        fila.nack(id_trabalho, "timeout")
+        assert fila.reservar("w1")[0] == id_trabalho
+        fila.nack(id_trabalho, "timeout")
+
+        assert fila.reservar("w1") is None
+        assert fila.resumo()[FALHOU] == 1
+
+    def test_reserva_vencida_volta_para_fila(self, tmp_path):
+        """Verifica que a URL de um worker morto é entregue de novo após o prazo."""
+        fila = FilaTrabalhos(str(tmp_path / "f.db"), visibilidade_s=-1)
+        fila.adicionar(URLS[:1])
+
+        primeiro = fila.reservar("morto")
+        assert fila.reservar("w2") == primeiro
+
+    def test_workers_concorrentes_sem_duplicar(self, tmp_path):
+        """Verifica que várias conexões reservando ao mesmo tempo nunca pegam a mesma URL."""
+        caminho = str(tmp_path / "f.db")
+        urls = [f"https://shopee.com.ar/product/1/{n}" for n in range(200)]
+        FilaTrabalhos(caminho).adicionar(urls)
+        pegos = []
+        lock = threading.Lock()
+
+        def worker(nome):
+            fila = FilaTrabalhos(caminho)
+            while True:
+                trabalho = fila.reservar(nome)
+                if trabalho is None:
+                    break
+                with lock:
+                    pegos.append(trabalho[1])
+                fila.ack(trabalho[0])
+            fila.fechar()
+
+        threads = [threading.Thread(target=worker, args=(f"w{i}",)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert sorted(pegos) == sorted(urls)
+
+
+class TestMesclarFrota:
+    """Testes para a mescla das partes da frota."""
+
+    def _parte(self, diretorio, nome, links):
+        diretorio.mkdir(exist_ok=True)
+        with open(diretorio / f"parte-{nome}.jsonl", "w", encoding="utf-8") as f:
+            for link in links:
+                f.write(json.dumps({"nome": link, "preco": "$ 1", "link": link}) + "\n")
+
+    def test_execucoes_seguidas_nao_repetem_partes(self, tmp_path):
+        """Verifica que a segunda execução só acrescenta as partes novas."""
+        partes = tmp_path / "partes"
+        saida = tmp_path / "produtos.jsonl"
+        args = run_fleet.parse_args(["--partes", str(partes), "--saida", str(saida)])
+
+        self._parte(partes, "host-1", ["https://shopee.com.ar/a-i.1.1", "https://shopee.com.ar/a-i.1.2"])
+        assert run_fleet.mesclar(args) == 2
+        self._parte(partes, "host-2", ["https://shopee.com.ar/a-i.1.3"])
+        assert run_fleet.mesclar(args) == 1
+
+        links = [linha["link"] for linha in ler_resultados(str(saida))]
+        assert len(links) == len(set(links)) == 3
+        assert list(partes.glob("parte-*.jsonl")) == []
+        assert len(list((partes / "mescladas").iterdir())) == 2
+        assert run_fleet.mesclar(args) == 0
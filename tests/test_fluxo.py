@@ -0,0 +1,119 @@
+import asyncio
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from scraper.fluxo import Esteira, Produto
+from scraper.shopee_scraper import ShopeeScraper
+
+
+def _gerador(n, estado):
+    """Produtor de teste: conta o que já gerou e em que thread foi fechado."""
+    try:
+        for i in range(n):
+            estado["gerados"] = i + 1
+            yield {"nome": f"P{i}", "preco": "$ 1", "link": f"https://shopee.com.ar/p-i.1.{i}"}
+    finally:
+        estado["fechado_em"] = threading.current_thread().name
+
+
+class TestProduto:
+    """Testes para o registro de resultado."""
+
+    def test_ida_e_volta_do_dicionario(self):
+        """Verifica campos conhecidos, extras e o formato dos sinks."""
+        dados = {"nome": "Fone", "preco": "$ 10", "link": "x", "estoque": 3, "vendidos": 7}
+
+        produto = Produto.de_dados(dados)
+
+        assert (produto.nome, produto.estoque, produto.extras) == ("Fone", 3, {"vendidos": 7})
+        assert produto.como_dict() == dados
+        assert produto.completo
+        assert not hasattr(produto, "__dict__")
+
+    def test_incompleto(self):
+        """Verifica que campos ausentes viram NÃO ENCONTRADO."""
+        assert not Produto.de_dados({"link": "x"}).completo
+
+
+class TestEsteira:
+    """Testes para o buffer limitado entre crawler e consumidor."""
+
+    def test_contrapressao_limita_o_produtor(self):
+        """Verifica que o produtor para quando o buffer enche."""
+        estado = {}
+        esteira = Esteira(lambda: _gerador(1000, estado), capacidade=4)
+
+        itens = iter(esteira)
+        next(itens)
+        time.sleep(0.2)
+
+        assert estado["gerados"] <= 4 + 2
+        assert len(list(itens)) == 999
+
+    def test_consumidor_desiste_fecha_o_produtor(self):
+        """Verifica que parar o consumo fecha o gerador na thread produtora."""
+        estado = {}
+        itens = iter(Esteira(lambda: _gerador(1000, estado), capacidade=2))
+        next(itens)
+
+        itens.close()
+
+        assert estado["fechado_em"] == "esteira-produtos"
+        assert estado["gerados"] < 10
+
+    def test_erro_do_produtor_chega_ao_consumidor(self):
+        """Verifica que a exceção do crawler sobe no for do consumidor."""
+        def produtor():
+            yield {"nome": "a", "preco": "$ 1", "link": "x"}
+            raise RuntimeError("navegador caiu")
+
+        itens = iter(Esteira(produtor))
+
+        assert next(itens).nome == "a"
+        with pytest.raises(RuntimeError, match="navegador caiu"):
+            next(itens)
+
+    def test_async_for(self):
+        """Verifica o consumo assíncrono e o uso único da esteira."""
+        estado = {}
+        esteira = Esteira(lambda: _gerador(5, estado), capacidade=2)
+
+        async def consumir():
+            return [p.nome async for p in esteira]
+
+        assert asyncio.run(consumir()) == ["P0", "P1", "P2", "P3", "P4"]
+        with pytest.raises(ValueError):
+            list(esteira)
+
+
+class TestIterProdutos:
+    """Testes para ShopeeScraper.iter_produtos."""
+
+    def test_links_via_http(self):
+        """Verifica registros Produto entregues sem gravar nada."""
+        scraper = ShopeeScraper()
+        scraper.http = Mock()
+        scraper.http.buscar_produto = Mock(side_effect=lambda link: {"nome": "Fone", "preco": "$ 10", "link": link})
+        scraper._salvar = Mock()
+        links = [f"https://shopee.com.ar/p-i.1.{i}" for i in range(5)]
+
+        produtos = list(scraper.iter_produtos(links=links, limit=3))
+
+        assert [p.link for p in produtos] == links[:3]
+        scraper._salvar.assert_not_called()
+
+    def test_com_pool_roda_na_thread_do_consumidor(self):
+        """Verifica que com pool compartilhado o crawler não muda de thread."""
+        scraper = ShopeeScraper(pool=Mock())
+        threads = []
+        scraper.http = Mock()
+        scraper.http.buscar_produto = Mock(side_effect=lambda link: threads.append(
+            threading.current_thread()) or {"nome": "Fone", "preco": "$ 10", "link": link})
+
+        esteira = scraper.iter_produtos(links=["https://shopee.com.ar/p-i.1.1"])
+
+        assert len(list(esteira)) == 1
+        assert threads == [threading.current_thread()]
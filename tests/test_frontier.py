@@ -0,0 +1,110 @@
+from unittest.mock import Mock
+
+from scraper.frontier import FALHOU, FEITO, Frontier, normalizar_url
+from scraper.shopee_scraper import ShopeeScraper, url_pagina
+
+
+class TestNormalizarUrl:
+    """Testes para a normalização de URLs da fronteira."""
+
+    def test_remove_rastreamento_e_fragmento(self):
+        """Verifica que parâmetros de rastreamento e #fragmento são removidos."""
+        url = normalizar_url("/Fone-i.1.2?sp_atk=abc&xptdk=z&utm_source=x#reviews", "https://Shopee.com.ar/loja")
+
+        assert url == "https://shopee.com.ar/Fone-i.1.2"
+
+    def test_mantem_parametros_relevantes_ordenados(self):
+        """Verifica que a query restante é ordenada (mesma URL em qualquer ordem)."""
+        a = normalizar_url("https://shopee.com.ar/busca?b=2&a=1&gclid=x")
+        b = normalizar_url("https://shopee.com.ar/busca?a=1&b=2")
+
+        assert a == b == "https://shopee.com.ar/busca?a=1&b=2"
+
+    def test_url_pagina(self):
+        """Verifica o parâmetro page da listagem (a primeira página mantém a URL)."""
+        assert url_pagina("https://shopee.com.ar/loja", 0) == "https://shopee.com.ar/loja"
+        assert url_pagina("https://shopee.com.ar/loja?page=1&x=y", 3) == "https://shopee.com.ar/loja?x=y&page=3"
+
+
+class TestFrontier:
+    """Testes para a fronteira persistida."""
+
+    def test_dedupe_e_estados(self):
+        """Verifica dedupe por URL normalizada e a transição dos estados."""
+        f = Frontier(None, max_tentativas=2)
+
+        assert f.adicionar(["/product/1/1", "/product/1/1?sp_atk=a", "/product/1/2"]) == 2
+        f.concluir("https://shopee.com.ar/product/1/1")
+        f.falhar("https://shopee.com.ar/product/1/2")
+        assert f.pendentes() == ["https://shopee.com.ar/product/1/2"]
+        f.falhar("https://shopee.com.ar/product/1/2")
+
+        assert f.pendentes() == []
+        assert f.resumo() == {"pendente": 0, FEITO: 1, FALHOU: 1}
+
+    def test_retoma_do_arquivo(self, tmp_path):
+        """Verifica que uma nova instância retoma URLs pendentes e a página da listagem."""
+        caminho = str(tmp_path / "frontier.json")
+        f = Frontier(caminho)
+        f.adicionar(["/product/1/1", "/product/1/2"])
+        f.concluir("https://shopee.com.ar/product/1/1")
+        f.pagina_listagem = 3
+        f.salvar()
+
+        retomada = Frontier(caminho)
+
+        assert retomada.pendentes() == ["https://shopee.com.ar/product/1/2"]
+        assert retomada.pagina_listagem == 3
+        assert not retomada.listagem_concluida
+
+
+class TestCrawl:
+    """Testes para o crawl completo da loja."""
+
+    def _scraper(self):
+        scraper = ShopeeScraper()
+        page = Mock()
+        page.url = "https://shopee.com.ar/loja"
+        sessao = Mock()
+        sessao.__enter__ = Mock(return_value=page)
+        sessao.__exit__ = Mock(return_value=False)
+        scraper._sessao = Mock(return_value=sessao)
+        scraper._abrir_loja = Mock()
+        scraper._pausa = Mock()
+        scraper._salvar = Mock()
+        return scraper, page
+
+    def test_rola_ate_parar_de_aparecer_link(self, monkeypatch):
+        """Verifica que a rolagem para depois de rodadas sem links novos."""
+        monkeypatch.setattr("scraper.shopee_scraper.human_scroll", Mock())
+        scraper, page = self._scraper()
+        page.eval_on_selector_all.side_effect = [
+            ["/product/1/1"],
+            ["/product/1/1", "/product/1/2"],
+            ["/product/1/1", "/product/1/2"],
+            ["/product/1/1", "/product/1/2"],
+        ]
+
+        links = scraper._rolar_listagem(page, paradas=2)
+
+        assert links == ["https://shopee.com.ar/product/1/1", "https://shopee.com.ar/product/1/2"]
+        assert page.eval_on_selector_all.call_count == 4
+
+    def test_pagina_listagem_e_visita_fronteira(self, tmp_path):
+        """Verifica a paginação até uma página sem links novos e a visita de cada produto."""
+        scraper, page = self._scraper()
+        paginas = [["/product/1/1", "/product/1/2"], ["/product/1/2", "/product/1/3"], ["/product/1/3"]]
+        scraper._rolar_listagem = Mock(side_effect=paginas)
+        scraper._visitar_produto = Mock(side_effect=lambda p, link: None if link.endswith("/2") else
+                                        {"nome": "P", "preco": "$ 1", "link": link})
+        frontier = Frontier(str(tmp_path / "f.json"))
+
+        resultados = scraper.crawl_loja("https://shopee.com.ar/loja", frontier=frontier)
+
+        visitados = [c.args[1] for c in scraper._abrir_loja.call_args_list]
+        assert visitados == ["https://shopee.com.ar/loja", "https://shopee.com.ar/loja?page=1",
+                             "https://shopee.com.ar/loja?page=2"]
+        assert len(resultados) == 2
+        retomada = Frontier(str(tmp_path / "f.json"))
+        assert retomada.listagem_concluida
+        assert retomada.pendentes() == ["https://shopee.com.ar/product/1/2"]
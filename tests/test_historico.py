@@ -0,0 +1,114 @@
+import json
+
+from scraper.historico import HistoricoPrecos, chave_item
+from scripts import historico_precos
+
+
+DIA = 86400
+
+
+def _linha(item, preco, ts, nome="Fone"):
+    return {"nome": nome, "preco": f"$ {preco}", "link": f"https://shopee.com.ar/fone-i.1.{item}", "coletado_em": ts}
+
+
+class TestChaveItem:
+    """Testes para a chave estável dos produtos."""
+
+    def test_ids_dos_adaptadores_e_url_normalizada(self):
+        """Verifica o id do marketplace e a URL normalizada como alternativa."""
+        assert chave_item("https://shopee.com.ar/Fone-i.12.34?sp_atk=x") == "shopee:12.34"
+        assert chave_item("https://shopee.com.ar/product/12/34") == "shopee:12.34"
+        assert chave_item("https://produto.mercadolivre.com.br/MLB-987-fone-_JM") == "mercadolivre:MLB987"
+        assert chave_item("https://loja.com/p?utm_source=x&b=2&a=1") == "https://loja.com/p?a=1&b=2"
+
+
+class TestHistoricoPrecos:
+    """Testes para o histórico de preços."""
+
+    def test_ultimo_e_linhas_sem_preco(self, tmp_path):
+        """Verifica o último preço e que linhas sem preço são ignoradas."""
+        historico = HistoricoPrecos(str(tmp_path / "h.db"))
+        gravadas = historico.registrar_lote([
+            _linha(1, "1.000", 100), _linha(1, "900", 200),
+            {"nome": "x", "preco": "NÃO ENCONTRADO", "link": "https://shopee.com.ar/x-i.1.2"},
+        ])
+
+        ultimo = historico.ultimo("https://shopee.com.ar/outro-nome-i.1.1")
+
+        assert gravadas == 2 and historico.ignoradas == 1
+        assert (ultimo["centavos"], ultimo["moeda"], ultimo["ts"]) == (90000, "ARS", 200)
+        assert historico.ultimo("shopee:9.9") is None
+
+    def test_mesmo_segundo_vale_a_primeira_nas_duas_tabelas(self, tmp_path):
+        """Verifica que último preço e quedas concordam com duas observações no mesmo ts."""
+        historico = HistoricoPrecos(str(tmp_path / "h.db"))
+        historico.registrar_lote([_linha(1, 100, 1000), _linha(1, 50, 1000)])
+
+        assert historico.ultimo("shopee:1.1")["centavos"] == 10000
+        assert historico.maiores_quedas(0) == []
+
+    def test_faixa_inclui_preco_vigente_no_inicio(self, tmp_path):
+        """Verifica que o preço anterior à janela conta como vigente nela."""
+        historico = HistoricoPrecos(str(tmp_path / "h.db"))
+        historico.registrar_lote([_linha(1, 500, 0), _linha(1, 300, 10 * DIA)])
+
+        faixa = historico.faixa("shopee:1.1", desde=5 * DIA, ate=20 * DIA)
+
+        assert (faixa["minimo"], faixa["maximo"]) == (30000, 50000)
+        assert historico.faixa("shopee:1.1", desde=0, ate=DIA)["maximo"] == 50000
+
+    def test_maiores_quedas(self, tmp_path):
+        """Verifica a ordem pela queda percentual e a janela."""
+        historico = HistoricoPrecos(str(tmp_path / "h.db"))
+        historico.registrar_lote([
+            _linha(1, 1000, 0), _linha(1, 800, 9 * DIA),
+            _linha(2, 100, 8 * DIA), _linha(2, 50, 9 * DIA),
+            _linha(3, 100, 8 * DIA), _linha(3, 120, 9 * DIA),
+        ])
+
+        quedas = historico.maiores_quedas(desde=7 * DIA)
+
+        assert [(q["chave"], q["queda_pct"]) for q in quedas] == [("shopee:1.2", 50.0), ("shopee:1.1", 20.0)]
+
+    def test_compactar_nao_muda_as_consultas(self, tmp_path):
+        """Verifica que a compactação remove repetições sem mudar nenhuma resposta."""
+        historico = HistoricoPrecos(str(tmp_path / "h.db"), compactar_a_cada=0)
+        historico.registrar_lote([_linha(1, p, i * DIA) for i, p in enumerate([10, 10, 10, 8, 8, 12, 12])])
+        antes = (historico.ultimo("shopee:1.1"), historico.faixa("shopee:1.1", 2.5 * DIA, 10 * DIA)["maximo"],
+                 historico.maiores_quedas(1.5 * DIA))
+
+        assert historico.compactar() == 3
+
+        assert len(historico) == 4
+        depois = (historico.ultimo("shopee:1.1"), historico.faixa("shopee:1.1", 2.5 * DIA, 10 * DIA)["maximo"],
+                  historico.maiores_quedas(1.5 * DIA))
+        assert depois == antes
+
+    def test_compactacao_automatica_e_importacao_fora_de_ordem(self, tmp_path):
+        """Verifica a compactação periódica e que observações antigas não viram o preço atual."""
+        historico = HistoricoPrecos(str(tmp_path / "h.db"), compactar_a_cada=3)
+        historico.registrar_lote([_linha(1, 10, 100), _linha(1, 10, 200), _linha(1, 10, 300)])
+        historico.registrar(_linha(1, 99, 50))
+
+        assert len(historico) == 3
+        assert historico.maiores_quedas(0)[0]["atual"] == 1000
+
+
+class TestCli:
+    """Testes para o script de consulta."""
+
+    def test_importar_e_consultar(self, tmp_path, capsys):
+        """Verifica importar um JSONL e listar as quedas."""
+        entrada = tmp_path / "produtos.jsonl"
+        entrada.write_text("\n".join(json.dumps(_linha(1, p, ts, nome="Fone X"))
+                                     for p, ts in (("2.000", "2026-10-01T00:00:00+00:00"),
+                                                   ("1.500", "2030-01-01T00:00:00+00:00"))))
+        banco = str(tmp_path / "h.db")
+
+        assert historico_precos.main(["--banco", banco, "importar", str(entrada)]) == 0
+        assert historico_precos.main(["--banco", banco, "quedas", "--dias", "3650"]) == 0
+        assert historico_precos.main(["--banco", banco, "ultimo", "shopee:9.9"]) == 1
+
+        saida = capsys.readouterr().out
+        assert "2 observações gravadas" in saida
+        assert "- 25.0% | ARS 2.000,00 -> ARS 1.500,00 | Fone X" in saida
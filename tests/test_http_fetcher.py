@@ -0,0 +1,184 @@
+from unittest.mock import Mock
+
+import pytest
+import requests_mock
+
+from scraper.http_fetcher import BloqueadoError, HttpFetcher, ids_do_link, parse_item_shopee
+from scraper.shopee_scraper import ShopeeScraper
+
+
+LINK = "https://shopee.com.ar/Fone-Bluetooth-i.123.456"
+API = "https://shopee.com.ar/api/v4/item/get"
+
+ITEM = {
+    "error": None,
+    "data": {
+        "name": "Fone Bluetooth",
+        "price": 1299900000,
+        "price_min": 1299900000,
+        "price_max": 1299900000,
+        "stock": 7,
+        "item_rating": {"rating_star": 4.8},
+        "models": [{"name": "Preto", "price": 1299900000, "stock": 3}],
+    },
+}
+
+HTML_JSON_LD = """<html><head>
+<script type="application/ld+json">{"@type": "Product", "name": "Mouse Gamer",
+ "offers": {"@type": "Offer", "price": "5.499"}}</script>
+</head><body></body></html>"""
+
+
+class TestIdsDoLink:
+    """Testes para a extração de shopid/itemid da URL."""
+
+    def test_formatos_de_url(self):
+        """Verifica os dois formatos de URL de produto da Shopee."""
+        assert ids_do_link(LINK) == ("123", "456")
+        assert ids_do_link("https://shopee.com.ar/product/1/2?sp_atk=x") == ("1", "2")
+        assert ids_do_link("https://shopee.com.ar/topick_global_ar.ar") is None
+
+
+class TestParseItem:
+    """Testes para a interpretação do JSON de item."""
+
+    def test_preco_dividido_e_campos_extras(self):
+        """Verifica o fator 100000 do preço, estoque, avaliação e variantes."""
+        dados = parse_item_shopee(ITEM)
+
+        assert dados["nome"] == "Fone Bluetooth"
+        assert dados["preco"] == "$ 12.999"
+        assert dados["estoque"] == 7
+        assert dados["avaliacao"] == 4.8
+        assert dados["variantes"] == [{"nome": "Preto", "preco": "$ 12.999", "estoque": 3}]
+
+    def test_faixa_de_preco(self):
+        """Verifica que price_min != price_max vira uma faixa."""
+        payload = {"data": {"name": "X", "price_min": 100000000, "price_max": 150050000}}
+
+        assert parse_item_shopee(payload)["preco"] == "$ 1.000 - $ 1.500,50"
+
+    def test_payload_sem_item(self):
+        """Verifica None para payload sem dados."""
+        assert parse_item_shopee({"error": 90309999, "data": None}) is None
+
+
+class TestHttpFetcher:
+    """Testes para a camada HTTP (com requests-mock)."""
+
+    def test_api_json(self):
+        """Verifica que a API é consultada com os ids do link."""
+        fetcher = HttpFetcher()
+        with requests_mock.Mocker() as m:
+            m.get(API, json=ITEM)
+            dados = fetcher.buscar_produto(LINK)
+
+        assert dados["nome"] == "Fone Bluetooth"
+        assert dados["link"] == LINK
+        assert m.last_request.qs == {"itemid": ["456"], "shopid": ["123"]}
+        assert fetcher.acertos == 1
+
+    def test_fallback_html_json_ld(self):
+        """Verifica que o HTML é usado quando a API não serve."""
+        fetcher = HttpFetcher()
+        with requests_mock.Mocker() as m:
+            m.get(API, status_code=404)
+            m.get(LINK, text=HTML_JSON_LD)
+            dados = fetcher.buscar_produto(LINK)
+
+        assert dados == {"nome": "Mouse Gamer", "preco": "$ 5.499", "link": LINK}
+
+    def test_html_meta_tags(self):
+        """Verifica a extração pelas meta tags og/product."""
+        html = ('<html><head><meta property="og:title" content="Teclado">'
+                '<meta property="product:price:amount" content="8.000"></head></html>')
+        fetcher = HttpFetcher()
+        with requests_mock.Mocker() as m:
+            m.get("https://shopee.com.ar/product/9/9", text=html)
+            m.get(API, status_code=404)
+            dados = fetcher.buscar_produto("https://shopee.com.ar/product/9/9")
+
+        assert dados["nome"] == "Teclado"
+        assert dados["preco"] == "$ 8.000"
+
+    @pytest.mark.parametrize("status", [403, 429])
+    def test_status_de_bloqueio(self, status):
+        """Verifica que 403/429 levantam BloqueadoError."""
+        fetcher = HttpFetcher()
+        with requests_mock.Mocker() as m:
+            m.get(API, status_code=status)
+            with pytest.raises(BloqueadoError):
+                fetcher.buscar_produto(LINK)
+        assert fetcher.bloqueios == 1
+
+    def test_api_com_erro_anti_bot(self):
+        """Verifica que a API respondendo 200 com "error" conta como bloqueio."""
+        fetcher = HttpFetcher()
+        with requests_mock.Mocker() as m:
+            m.get(API, json={"error": 90309999, "data": None})
+            with pytest.raises(BloqueadoError):
+                fetcher.buscar_produto(LINK)
+
+    def test_resposta_ininterpretavel(self):
+        """Verifica None (escalar ao navegador) quando nada é reconhecido."""
+        fetcher = HttpFetcher()
+        with requests_mock.Mocker() as m:
+            m.get(API, text="<html>captcha</html>")
+            m.get(LINK, text="<html><body>Carregando...</body></html>")
+            assert fetcher.buscar_produto(LINK) is None
+        assert fetcher.falhas == 1
+
+
+class TestHttpFirst:
+    """Testes para o uso da camada HTTP pelo ShopeeScraper."""
+
+    def test_scrape_links_so_abre_navegador_para_bloqueados(self):
+        """Verifica que só os links recusados pelo HTTP vão para o navegador."""
+        scraper = ShopeeScraper()
+        scraper.http = Mock()
+        scraper.http.buscar_produto.side_effect = [
+            {"nome": "A", "preco": "$ 1", "link": "https://shopee.com.ar/product/1/1"},
+            BloqueadoError("403"),
+        ]
+        page = Mock()
+        sessao = Mock()
+        sessao.__enter__ = Mock(return_value=page)
+        sessao.__exit__ = Mock(return_value=False)
+        scraper._sessao = Mock(return_value=sessao)
+        scraper._visitar_produto = Mock(return_value={"nome": "B", "preco": "$ 2",
+                                                      "link": "https://shopee.com.ar/product/1/2"})
+        scraper._salvar = Mock()
+
+        resultados = scraper.scrape_links([
+            "https://shopee.com.ar/product/1/1",
+            "https://shopee.com.ar/product/1/2",
+        ])
+
+        assert [r["nome"] for r in resultados] == ["A", "B"]
+        scraper._visitar_produto.assert_called_once_with(page, "https://shopee.com.ar/product/1/2")
+
+    def test_scrape_links_sem_navegador_quando_http_resolve(self):
+        """Verifica que nenhuma sessão do navegador é aberta se o HTTP resolveu tudo."""
+        scraper = ShopeeScraper()
+        scraper.http = Mock()
+        scraper.http.buscar_produto.return_value = {"nome": "A", "preco": "$ 1", "link": "x"}
+        scraper._sessao = Mock()
+        scraper._salvar = Mock()
+
+        scraper.scrape_links(["https://shopee.com.ar/product/1/1"])
+
+        scraper._sessao.assert_not_called()
+
+    def test_somente_http_pula_links_sem_abrir_navegador(self):
+        """Verifica que o perfil somente HTTP descarta os bloqueados em vez de abrir o navegador."""
+        scraper = ShopeeScraper()
+        scraper.somente_http = True
+        scraper.http = Mock()
+        scraper.http.buscar_produto.side_effect = [{"nome": "A", "preco": "$ 1", "link": "x"}, BloqueadoError("403")]
+        scraper._sessao = Mock()
+        scraper._salvar = Mock()
+
+        resultados = scraper.scrape_links(["https://shopee.com.ar/product/1/1", "https://shopee.com.ar/product/1/2"])
+
+        assert [r["nome"] for r in resultados] == ["A"]
+        scraper._sessao.assert_not_called()
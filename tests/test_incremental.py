@@ -0,0 +1,95 @@
+from unittest.mock import Mock
+
+from scraper.incremental import EstadoIncremental, impressao_digital
+from scraper.shopee_scraper import ShopeeScraper
+
+
+LINK = "https://shopee.com.ar/product/1/1"
+
+
+def _dados(preco="$ 10", link=LINK):
+    return {"nome": "Fone", "preco": preco, "link": link}
+
+
+class TestEstadoIncremental:
+    """Testes para a detecção de mudanças e a agenda de revisita."""
+
+    def test_impressao_digital(self):
+        """Verifica que só nome e preço normalizado entram no hash."""
+        assert impressao_digital(_dados()) == impressao_digital(dict(_dados(), coletado_em="x", estoque=3))
+        assert impressao_digital(_dados()) != impressao_digital(_dados("$ 11"))
+        assert impressao_digital(_dados("$ 1.299")) == impressao_digital(_dados("$\n1.299\n,00"))
+
+    def test_troca_de_via_nao_conta_como_mudanca(self, tmp_path):
+        """Verifica que API (com estoque) e DOM (sem estoque) do mesmo produto não mudam a impressão."""
+        estado = EstadoIncremental(str(tmp_path / "e.db"))
+
+        assert estado.registrar(dict(_dados("$ 1.299,00"), estoque=5), agora=0)
+        assert not estado.registrar(_dados("$\n1.299"), agora=10)
+        assert not estado.registrar(dict(_dados("$ 1.299"), estoque=5), agora=20)
+        assert estado.registrar(dict(_dados("$ 1.299"), estoque=4), agora=30)
+
+    def test_so_mudancas_sao_gravadas(self, tmp_path):
+        """Verifica novo -> mudou, repetido -> não mudou."""
+        estado = EstadoIncremental(str(tmp_path / "e.db"))
+
+        assert estado.registrar(_dados(), agora=0)
+        assert not estado.registrar(_dados(), agora=10)
+        assert estado.registrar(_dados("$ 12"), agora=20)
+        assert (estado.mudados, estado.inalterados) == (2, 1)
+
+    def test_intervalo_adapta_a_volatilidade(self, tmp_path):
+        """Verifica que o produto volátil é agendado antes do estático."""
+        estado = EstadoIncremental(str(tmp_path / "e.db"), intervalo_inicial_s=100,
+                                   intervalo_min_s=10, intervalo_max_s=1000)
+        estavel = "https://shopee.com.ar/product/1/2"
+        for t, preco in enumerate(["$ 1", "$ 2", "$ 3"]):
+            estado.registrar(_dados(preco), agora=t)
+            estado.registrar(_dados("$ 5", estavel), agora=t)
+
+        # volátil: 100 -> 50 -> 25; estático: 100 -> 150 -> 225
+        assert estado.vencidos(agora=100) == [LINK]
+        assert estado.vencidos(agora=1000) == [LINK, estavel]
+
+    def test_adicionar_e_persistencia(self, tmp_path):
+        """Verifica que URLs novas vencem já e que o estado sobrevive à reabertura."""
+        caminho = str(tmp_path / "e.db")
+        estado = EstadoIncremental(caminho)
+        assert estado.adicionar([LINK, LINK]) == 1
+        assert estado.vencidos() == [LINK]
+        estado.registrar(_dados())
+        estado.fechar()
+
+        reaberto = EstadoIncremental(caminho)
+        assert reaberto.vencidos() == []
+        assert not reaberto.registrar(_dados())
+
+
+class TestScrapeIncremental:
+    """Testes para o modo incremental do ShopeeScraper."""
+
+    def test_grava_so_alterados_e_adia_falhas(self, tmp_path):
+        """Verifica que produtos inalterados não são gravados e falhas são reagendadas."""
+        estado = EstadoIncremental(str(tmp_path / "e.db"))
+        falho = "https://shopee.com.ar/product/1/9"
+        estado.adicionar([LINK, falho])
+        estado.registrar(_dados(), agora=0)
+        estado._conn.execute("UPDATE urls SET proxima_visita = 0")
+
+        scraper = ShopeeScraper()
+        scraper.http = Mock()
+        scraper.http.buscar_produto.side_effect = lambda link: _dados() if link == LINK else None
+        page = Mock()
+        sessao = Mock()
+        sessao.__enter__ = Mock(return_value=page)
+        sessao.__exit__ = Mock(return_value=False)
+        scraper._sessao = Mock(return_value=sessao)
+        scraper._visitar_produto = Mock(return_value=None)
+        scraper._salvar = Mock()
+
+        gravados = scraper.scrape_incremental("https://shopee.com.ar/loja", estado)
+
+        assert gravados == []
+        scraper._salvar.assert_not_called()
+        scraper._visitar_produto.assert_called_once_with(page, falho)
+        assert estado.vencidos() == []
@@ -0,0 +1,69 @@
+from unittest.mock import Mock
+
+from scraper.interceptor import RequestInterceptor
+
+
+def _route(tipo, url):
+    route = Mock()
+    route.request.resource_type = tipo
+    route.request.url = url
+    return route
+
+
+class TestRequestInterceptor:
+    """Testes para a camada de interceptação de requisições."""
+
+    def test_bloqueia_por_tipo_e_por_padrao(self):
+        """Verifica bloqueio de imagens/fontes e de rastreadores."""
+        interceptor = RequestInterceptor()
+
+        assert interceptor.deve_bloquear("image", "https://cf.shopee.com.ar/file/x.jpg")
+        assert interceptor.deve_bloquear("font", "https://shopee.com.ar/font.woff2")
+        assert interceptor.deve_bloquear("script", "https://www.googletagmanager.com/gtm.js")
+        assert not interceptor.deve_bloquear("script", "https://shopee.com.ar/app.js")
+        assert not interceptor.deve_bloquear("document", "https://shopee.com.ar/analytics")
+
+    def test_permitir_vence_bloqueio(self):
+        """Verifica que a lista de permissões e permitir_imagens liberam requisições."""
+        interceptor = RequestInterceptor(permitir_padroes=[r"/logo\.png$"], permitir_imagens=False)
+
+        assert not interceptor.deve_bloquear("image", "https://shopee.com.ar/logo.png")
+        assert not RequestInterceptor(permitir_imagens=True).deve_bloquear("image", "https://x/a.jpg")
+
+    def test_rota_aborta_ou_continua_e_conta(self):
+        """Verifica que _rota chama abort/continue_ e soma as estatísticas."""
+        interceptor = RequestInterceptor()
+        bloqueada = _route("image", "https://x/a.jpg")
+        liberada = _route("document", "https://x/produto")
+
+        interceptor._rota(bloqueada)
+        interceptor._rota(liberada)
+
+        bloqueada.abort.assert_called_once()
+        liberada.continue_.assert_called_once()
+        relatorio = interceptor.relatorio()
+        assert relatorio["bloqueadas"] == 1
+        assert relatorio["bloqueadas_por_tipo"] == {"image": 1}
+        assert relatorio["bytes_economizados"] > 0
+
+    def test_estimativa_usa_respostas_observadas(self):
+        """Verifica que a economia estimada usa a média das respostas do mesmo tipo."""
+        interceptor = RequestInterceptor()
+        response = Mock()
+        response.headers = {"content-length": "1000"}
+        response.request.resource_type = "image"
+        interceptor._registrar_resposta(response)
+
+        interceptor._rota(_route("image", "https://x/b.jpg"))
+
+        assert interceptor.bytes_baixados == 1000
+        assert interceptor.bytes_economizados == 1000
+
+    def test_imprimir_relatorio_reinicia(self):
+        """Verifica que o relatório por página zera as estatísticas."""
+        interceptor = RequestInterceptor()
+        interceptor._rota(_route("font", "https://x/f.woff"))
+
+        interceptor.imprimir_relatorio()
+
+        assert interceptor.relatorio()["bloqueadas"] == 0
@@ -0,0 +1,144 @@
+import asyncio
+import subprocess
+import sys
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from scraper.async_scraper import AsyncShopeeScraper
+from scraper.http_fetcher import HttpFetcher
+from scraper.marketplaces import marketplace_do_link, nome_do_link, obter_marketplace
+from scraper.selector_registry import SelectorRegistry
+from scraper.shopee_scraper import ShopeeScraper
+from scraper.site_mercadolivre import MercadoLivre, formatar_preco_ml
+from scraper.site_shopee import Shopee
+
+
+class TestRegistro:
+    """Testes para o registro de adaptadores."""
+
+    def test_modulos_carregados_sob_demanda(self):
+        """Verifica que o adaptador só é importado quando um link do site aparece."""
+        codigo = (
+            "import sys\n"
+            "from scraper.marketplaces import marketplace_do_link, nome_do_link\n"
+            "assert nome_do_link('https://www.mercadolivre.com.br/ofertas') == 'mercadolivre'\n"
+            "assert 'scraper.site_mercadolivre' not in sys.modules\n"
+            "marketplace_do_link('https://produto.mercadolivre.com.br/MLB-1-x')\n"
+            "assert 'scraper.site_mercadolivre' in sys.modules\n"
+        )
+        subprocess.run([sys.executable, "-c", codigo], check=True)
+
+    def test_roteamento_por_dominio(self):
+        """Verifica o adaptador escolhido pelo domínio (com subdomínios)."""
+        assert isinstance(marketplace_do_link("https://shopee.com.ar/p-i.1.2"), Shopee)
+        assert isinstance(marketplace_do_link("https://produto.mercadolivre.com.br/MLB-1-x"), MercadoLivre)
+        assert marketplace_do_link("http://127.0.0.1:8000/loja") is None
+        assert marketplace_do_link("https://www.mercadolibre.com.ar/ofertas") is None
+        assert nome_do_link("https://notshopee.com.ar/") is None
+        assert obter_marketplace("shopee") is obter_marketplace("shopee")
+
+    def test_nome_desconhecido(self):
+        """Verifica o KeyError para marketplace não registrado."""
+        with pytest.raises(KeyError):
+            obter_marketplace("amazon")
+
+
+class TestMercadoLivre:
+    """Testes para o adaptador do Mercado Livre."""
+
+    def test_requisicao_api(self):
+        """Verifica a rota de catálogo, de anúncio e a ausência de id."""
+        ml = MercadoLivre()
+
+        assert ml.requisicao_api("https://www.mercadolivre.com.br/fone/p/MLB1234") == (
+            "https://api.mercadolibre.com/products/MLB1234", {})
+        assert ml.requisicao_api("https://produto.mercadolivre.com.br/MLB-987-fone-_JM") == (
+            "https://api.mercadolibre.com/items/MLB987", {})
+        assert ml.requisicao_api("https://www.mercadolivre.com.br/ofertas") is None
+
+    def test_parse_api(self):
+        """Verifica item (price) e produto de catálogo (buy_box_winner)."""
+        ml = MercadoLivre()
+
+        item = ml.parse_api({"title": "Fone", "price": 1299.9, "available_quantity": 3})
+        produto = ml.parse_api({"name": "Fone", "buy_box_winner": {"price": 19.66}})
+
+        assert item["nome"] == "Fone" and item["preco"] == "R$ 1.299,90" and item["estoque"] == 3
+        assert produto["preco"] == "R$ 19,66"
+        assert ml.parse_api({"title": "Sem preço"}) is None
+        assert formatar_preco_ml(None) is None
+
+    def test_http_usa_api_do_adaptador(self):
+        """Verifica que o HttpFetcher usa a rota e o parser do adaptador do link."""
+        fetcher = HttpFetcher()
+        fetcher._get = Mock(return_value=Mock(status_code=200, json=Mock(return_value={"title": "Fone", "price": 10})))
+
+        dados = fetcher.buscar_api("https://produto.mercadolivre.com.br/MLB-987-fone")
+
+        assert fetcher._get.call_args.args[0] == "https://api.mercadolibre.com/items/MLB987"
+        assert dados["preco"] == "R$ 10,00"
+
+
+class TestMotorCompartilhado:
+    """Testes para o ShopeeScraper como motor de vários marketplaces."""
+
+    def test_adaptador_segue_a_url(self):
+        """Verifica que o mesmo scraper troca de seletores conforme a URL visitada."""
+        scraper = ShopeeScraper()
+        assert isinstance(scraper.site, Shopee)
+
+        scraper._entrar("https://www.mercadolivre.com.br/ofertas")
+        assert scraper.site.nome_selectors[0] == "h1.ui-pdp-title"
+        assert scraper.site.absoluto("/p/MLB1") == "https://www.mercadolivre.com.br/p/MLB1"
+
+        scraper._entrar("http://127.0.0.1:8000/loja")
+        assert isinstance(scraper.site, Shopee)
+
+    def test_contexto_do_marketplace_padrao(self):
+        """Verifica que o pool e o HTTP usam o locale do marketplace padrão."""
+        scraper = ShopeeScraper(marketplace=MercadoLivre())
+
+        assert scraper.criar_pool().context_args["locale"] == "pt-BR"
+        assert scraper.criar_http().base_url == "https://www.mercadolivre.com.br"
+
+    def test_cascatas_separadas_por_site(self, tmp_path):
+        """Verifica que as estatísticas de seletores de cada site não se misturam."""
+        scraper = ShopeeScraper()
+        scraper.registro_seletores = SelectorRegistry(str(tmp_path / "seletores.json"))
+        scraper._entrar("https://www.mercadolivre.com.br/ofertas")
+
+        scraper._registrar("nome", ["h1"], "h1", 0.01)
+
+        assert scraper.registro_seletores.ordenar("mercadolivre:nome", ["x", "h1"])[0] == "h1"
+        assert scraper.registro_seletores.ordenar("nome", ["x", "h1"])[0] == "x"
+
+    def test_async_usa_o_adaptador_da_url(self, monkeypatch):
+        """Verifica que o motor assíncrono extrai com os seletores do site de cada URL."""
+        seletores = {}
+
+        async def extrair(page, nomes, precos):
+            seletores["nome"] = nomes
+            return {"nome": "Fone", "preco": "R$ 10"}
+
+        monkeypatch.setattr("scraper.async_scraper.extrair_em_uma_passada_async", extrair)
+        scraper = AsyncShopeeScraper(ritmo=0)
+        scraper.screenshots = Mock(capturar_async=AsyncMock())
+        page = Mock(url="https://produto.mercadolivre.com.br/MLB-1-fone")
+        page.mouse.wheel = AsyncMock()
+
+        asyncio.run(scraper._extrair_dados(page))
+
+        assert seletores["nome"] == MercadoLivre.nome_selectors
+        assert AsyncShopeeScraper(marketplace=MercadoLivre()).marketplace.context_args["locale"] == "pt-BR"
+
+    def test_captura_xhr_so_no_site_que_a_suporta(self):
+        """Verifica que a captura (formato da Shopee) não é esperada em outros sites."""
+        scraper = AsyncShopeeScraper()
+        scraper.captura = Mock(aguardar_async=AsyncMock(return_value=None))
+
+        ml = asyncio.run(scraper._dados_da_api(Mock(), "https://produto.mercadolivre.com.br/MLB-1-fone"))
+        shopee = asyncio.run(scraper._dados_da_api(Mock(), "https://shopee.com.ar/fone-i.1.2"))
+
+        assert ml is None and shopee is None
+        assert scraper.captura.aguardar_async.await_count == 1
@@ -0,0 +1,111 @@
+import json
+import urllib.request
+from unittest.mock import Mock
+
+import pytest
+
+from scraper.metricas import METRICAS, Metricas, contar_bytes_resposta, servir_metricas
+from scraper.shopee_scraper import ShopeeScraper, human_scroll
+
+
+class TestMetricas:
+    """Testes para os tempos por etapa e contadores."""
+
+    def test_etapa_histograma_e_resumo(self):
+        """Verifica contagem, buckets cumulativos e o resumo ordenado por tempo total."""
+        m = Metricas()
+        m.observar("goto", 0.2)
+        m.observar("goto", 3.0)
+        m.observar("gravacao", 0.01)
+
+        texto = m.texto_prometheus()
+        assert 'scraper_etapa_segundos_bucket{etapa="goto",le="0.25"} 1' in texto
+        assert 'scraper_etapa_segundos_bucket{etapa="goto",le="+Inf"} 2' in texto
+        assert 'scraper_etapa_segundos_count{etapa="goto"} 2' in texto
+        assert list(m.etapas()) == ["goto", "gravacao"]
+
+    def test_etapa_registra_mesmo_com_excecao(self):
+        """Verifica que uma etapa que falhou também é cronometrada."""
+        m = Metricas()
+        with pytest.raises(ValueError):
+            with m.etapa("clique"):
+                raise ValueError("falhou")
+
+        assert m.etapas()["clique"]["contagem"] == 1
+
+    def test_contadores_com_rotulos_escapados(self):
+        """Verifica contadores por seletor e o escape de aspas nos rótulos."""
+        m = Metricas()
+        m.contar("seletor_timeouts_total", cascata="nome", seletor="div[class='x']")
+        m.contar("seletor_timeouts_total", cascata="nome", seletor="div[class='x']")
+        m.contar("seletor_timeouts_total", cascata="preco", seletor='a"b')
+
+        texto = m.texto_prometheus()
+        assert "# TYPE scraper_seletor_timeouts_total counter" in texto
+        assert "scraper_seletor_timeouts_total{cascata=\"nome\",seletor=\"div[class='x']\"} 2" in texto
+        assert 'seletor="a\\"b"' in texto
+
+    def test_log_json(self, tmp_path):
+        """Verifica uma linha JSON por etapa no log."""
+        m = Metricas()
+        caminho = tmp_path / "etapas.jsonl"
+        m.configurar_log(str(caminho))
+        m.observar("screenshot", 0.5, modo="viewport")
+        m.configurar_log(None)
+
+        evento = json.loads(caminho.read_text(encoding="utf-8"))
+        assert evento["evento"] == "etapa"
+        assert evento["etapa"] == "screenshot"
+        assert evento["duracao_ms"] == 500.0
+        assert evento["modo"] == "viewport"
+
+    def test_endpoint_metrics(self):
+        """Verifica que /metrics serve o texto Prometheus."""
+        m = Metricas()
+        m.contar("bytes_recebidos_total", 1234)
+        servidor = servir_metricas(0, metricas=m)
+        try:
+            porta = servidor.server_address[1]
+            with urllib.request.urlopen(f"http://127.0.0.1:{porta}/metrics") as resp:
+                corpo = resp.read().decode("utf-8")
+        finally:
+            servidor.shutdown()
+            servidor.server_close()
+
+        assert "scraper_bytes_recebidos_total 1234" in corpo
+
+
+class TestInstrumentacao:
+    """Testes para a instrumentação do ShopeeScraper."""
+
+    def setup_method(self):
+        METRICAS.reiniciar()
+
+    def test_bytes_por_content_length(self):
+        """Verifica a soma de Content-Length das respostas."""
+        contar_bytes_resposta(Mock(headers={"content-length": "100"}))
+        contar_bytes_resposta(Mock(headers={}))
+
+        assert METRICAS.contador("bytes_recebidos_total") == 100
+
+    def test_helpers_humanos_cronometrados(self, monkeypatch):
+        """Verifica que o scroll humano vira uma etapa."""
+        monkeypatch.setattr("scraper.shopee_scraper.time.sleep", lambda s: None)
+        human_scroll(Mock(), distance=300)
+
+        assert METRICAS.etapas()["humano_scroll"]["contagem"] == 1
+
+    def test_timeout_e_falha_por_seletor(self):
+        """Verifica seletor_timeouts_total na cascata sequencial e seletor_falhas_total."""
+        class TimeoutError(Exception):
+            pass
+
+        scraper = ShopeeScraper()
+        page = Mock()
+        page.locator.return_value.first.inner_text.side_effect = TimeoutError("timeout")
+
+        scraper._extrair_nome_sequencial(page)
+
+        assert METRICAS.contador("seletor_timeouts_total", cascata="nome", seletor="h1") == 1
+        assert METRICAS.contador("seletor_falhas_total", cascata="nome", seletor="h1") == 1
+        assert METRICAS.etapas() == {}
@@ -0,0 +1,116 @@
+import asyncio
+import random
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from scraper.metricas import METRICAS
+from scraper.movimento import (
+    MODO_PADRAO, PAUSA_MOUSE_S, agrupar, curva, mover_mouse, mover_mouse_async, rajadas_scroll, rolar, rolar_async,
+    trajetoria,
+)
+
+
+@pytest.fixture(autouse=True)
+def sem_espera(monkeypatch):
+    monkeypatch.setattr("scraper.movimento.time.sleep", Mock())
+
+
+class TestTrajetoria:
+    """Testes para o cálculo antecipado dos gestos."""
+
+    def test_curva_em_cache(self):
+        """Verifica que o template da curva é reaproveitado entre gestos."""
+        assert curva(20) is curva(20)
+        assert curva(20)[-1] == 1.0
+        assert list(curva(20)) == sorted(curva(20))
+
+    def test_trajetoria_segue_a_curva_com_jitter(self):
+        """Verifica pontos dentro de ±1.5px da curva e pausas de 5-20ms."""
+        pontos = trajetoria((0, 0), (100, 200), passos=10, rng=random.Random(3))
+
+        assert len(pontos) == 10
+        for (x, y, pausa), e in zip(pontos, curva(10)):
+            assert abs(x - 100 * e) <= 1.5 and abs(y - 200 * e) <= 1.5
+            assert 0.005 <= pausa <= 0.02
+
+    def test_rajadas_somam_a_distancia(self):
+        """Verifica rajadas de 50-200px (ou o resto) que somam a distância nos dois sentidos."""
+        rng = random.Random(7)
+        for distancia in (10, 500, 1337, -420):
+            rajadas = rajadas_scroll(distancia, rng)
+            assert sum(d for d, _ in rajadas) == distancia
+            assert all(abs(d) <= 200 and 0.05 <= p <= 0.25 for d, p in rajadas)
+            assert all(abs(d) >= 50 for d, _ in rajadas[:-1])
+
+    def test_agrupar_preserva_passos_e_duracao(self):
+        """Verifica que os pontos-chave somam os passos e as pausas do gesto."""
+        pontos = trajetoria((0, 0), (50, 50), passos=21)
+
+        chaves = agrupar(pontos, pontos_chave=4)
+
+        assert len(chaves) == 4
+        assert sum(n for _, _, n, _ in chaves) == 21
+        assert sum(p for *_, p in chaves) == pytest.approx(sum(p for *_, p in pontos))
+        assert chaves[-1][:2] == pontos[-1][:2]
+
+
+class TestDespacho:
+    """Testes para o envio dos gestos ao navegador."""
+
+    def test_modos_do_mouse(self):
+        """Verifica um comando por passo, poucos no agrupado e um evaluate na página."""
+        page = Mock()
+        assert mover_mouse(page, (0, 0), (100, 100), passos=20, modo="passo") == 20
+        assert page.mouse.move.call_count == 20
+
+        page = Mock()
+        assert mover_mouse(page, (0, 0), (100, 100), passos=20, modo="agrupado") == 4
+        assert sum(c.kwargs["steps"] for c in page.mouse.move.call_args_list) == 20
+
+        page = Mock()
+        assert mover_mouse(page, (0, 0), (100, 100), passos=20, modo="pagina") == 1
+        page.mouse.move.assert_not_called()
+        assert len(page.evaluate.call_args.args[1]["mouse"]) == 20
+
+    def test_padrao_mantem_a_cadencia_por_passo(self, monkeypatch):
+        """Verifica que o modo padrão envia cada passo com sua própria pausa (5-20 ms, com jitter)."""
+        alvos = []
+        monkeypatch.setattr("scraper.movimento.time.perf_counter", lambda: 0.0)
+        monkeypatch.setattr("scraper.movimento._aguardar_ate", alvos.append)
+        page = Mock()
+
+        assert MODO_PADRAO == "passo"
+        assert mover_mouse(page, (0, 0), (100, 100), passos=20) == 20
+
+        pausas = [b - a for a, b in zip([0.0] + alvos, alvos)]
+        assert all("steps" not in c.kwargs for c in page.mouse.move.call_args_list)
+        assert len(pausas) == 20 and all(PAUSA_MOUSE_S[0] <= p <= PAUSA_MOUSE_S[1] for p in pausas)
+        assert len(set(pausas)) > 1
+
+    def test_falha_interrompe_o_gesto(self):
+        """Verifica que a página fechada encerra o gesto e conta o erro."""
+        page = Mock()
+        page.mouse.wheel.side_effect = Exception("Target closed")
+        antes = METRICAS.contador("erros_total", tipo="navegacao", etapa="scroll")
+
+        assert rolar(page, 600, modo="passo") == 0
+
+        assert page.mouse.wheel.call_count == 1
+        assert METRICAS.contador("erros_total", tipo="navegacao", etapa="scroll") == antes + 1
+
+    def test_async_em_pipeline(self, monkeypatch):
+        """Verifica o envio assíncrono sem esperar a resposta de cada comando."""
+        monkeypatch.setattr("scraper.movimento.asyncio.sleep", AsyncMock())
+        page = Mock()
+        page.mouse.move = AsyncMock()
+        page.mouse.wheel = AsyncMock()
+
+        async def gestos():
+            return (await mover_mouse_async(page, (0, 0), (10, 10), passos=8, modo="agrupado"),
+                    await rolar_async(page, 500))
+
+        mouse, scroll = asyncio.run(gestos())
+
+        assert mouse == page.mouse.move.await_count == 4
+        assert scroll == page.mouse.wheel.await_count >= 3
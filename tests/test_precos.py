@@ -0,0 +1,108 @@
+from decimal import Decimal
+
+import pytest
+
+from scraper.precos import converter_numero, locale_do_link, normalizar_linhas, normalizar_preco
+from scraper.sinks import JsonlSink
+from scraper.site_shopee import Shopee
+
+
+class TestConverterNumero:
+    """Testes para a conversão de números com separadores locais."""
+
+    @pytest.mark.parametrize("texto,esperado", [
+        ("19,66", Decimal("19.66")),
+        ("12.999", Decimal("12999")),
+        ("1.500,50", Decimal("1500.50")),
+        ("1,234.56", Decimal("1234.56")),
+        ("12.99", Decimal("12.99")),
+        ("250", Decimal("250")),
+    ])
+    def test_separadores(self, texto, esperado):
+        """Verifica milhar/decimal no formato latino e no americano."""
+        assert converter_numero(texto, "es-AR") == esperado
+
+
+class TestNormalizarPreco:
+    """Testes para a normalização de textos de preço."""
+
+    def test_preco_quebrado_em_linhas_do_mercado_livre(self):
+        """Verifica o formato que aparece no produtos.csv ("R$\\n19\\n,\\n66")."""
+        p = normalizar_preco("R$\n61\n,\n06\n10% OFF", "pt-BR")
+
+        assert p.valor == Decimal("61.06")
+        assert p.centavos == 6106
+        assert p.moeda == "BRL"
+        assert p.desconto_pct == 10
+
+    def test_faixa_da_shopee(self):
+        """Verifica que "a - b" vira valor mínimo e máximo."""
+        p = normalizar_preco("$5.385 - $7.955", "es-AR")
+
+        assert (p.valor, p.valor_maximo, p.moeda) == (Decimal("5385"), Decimal("7955"), "ARS")
+        assert p.valor_original is None
+
+    def test_preco_original_e_com_desconto(self):
+        """Verifica preço riscado + preço atual."""
+        p = normalizar_preco("R$ 39,90 R$ 19,66 50% OFF", "pt-BR")
+
+        assert p.valor == Decimal("19.66")
+        assert p.valor_original == Decimal("39.90")
+
+    @pytest.mark.parametrize("texto,esperado", [
+        ("$ 8.000 100% OFF", 100),
+        ("R$ 19,66 5 % de desconto", 5),
+        ("R$ 19,66 15%", None),
+        ("R$ 19,66 150% OFF", None),
+        ("R$ 19,66 2025% OFF", None),
+    ])
+    def test_desconto(self, texto, esperado):
+        """Verifica o desconto de até 100% e só com o sufixo OFF/desconto."""
+        assert normalizar_preco(texto, "pt-BR").desconto_pct == esperado
+
+    def test_parcelas(self):
+        """Verifica parcelas em português e em espanhol."""
+        br = normalizar_preco("R$ 120,00 12x R$ 10,00 sem juros", "pt-BR")
+        ar = normalizar_preco("$ 6.000 6 cuotas sin interés de $ 1.000", "es-AR")
+
+        assert (br.valor, br.parcelas, br.valor_parcela) == (Decimal("120.00"), 12, Decimal("10.00"))
+        assert (ar.valor, ar.parcelas, ar.valor_parcela) == (Decimal("6000"), 6, Decimal("1000"))
+
+    def test_texto_sem_preco(self):
+        """Verifica o marcador de preço não encontrado."""
+        p = normalizar_preco("PREÇO NÃO ENCONTRADO")
+
+        assert p.valor is None and p.centavos is None
+
+
+class TestNormalizarLinhas:
+    """Testes para a normalização em lote."""
+
+    def test_locale_pelo_dominio(self):
+        """Verifica que o locale vem do domínio do link."""
+        assert locale_do_link("https://www.mercadolivre.com.br/x") == "pt-BR"
+        assert locale_do_link("https://shopee.com.ar/x") == "es-AR"
+        assert locale_do_link("https://www.mercadolibre.com.ar/x") == "es-AR"
+
+    def test_locale_do_adaptador(self, monkeypatch):
+        """Verifica que o locale_preco do adaptador vale sobre o sufixo do domínio."""
+        monkeypatch.setattr(Shopee, "locale_preco", "pt-BR")
+
+        assert locale_do_link("https://shopee.com.ar/x") == "pt-BR"
+
+    def test_sink_normaliza_lote(self, tmp_path):
+        """Verifica normalizar_linhas como transformação de um sink."""
+        caminho = tmp_path / "p.jsonl"
+        with JsonlSink(str(caminho), transformar=normalizar_linhas) as sink:
+            sink.escrever({"nome": "A", "preco": "$7.344", "link": "https://shopee.com.ar/a"})
+
+        texto = caminho.read_text(encoding="utf-8")
+        assert '"preco_centavos": 734400' in texto
+        assert '"preco_moeda": "ARS"' in texto
+
+    def test_linhas_ganham_colunas(self):
+        """Verifica que todas as colunas de preço são acrescentadas."""
+        linhas = normalizar_linhas([{"preco": "R$\n19\n,\n66", "link": "https://www.mercadolivre.com.br/p"}])
+
+        assert linhas[0]["preco_valor"] == Decimal("19.66")
+        assert linhas[0]["preco_parcelas"] is None
@@ -0,0 +1,225 @@
+from unittest.mock import Mock
+
+import pytest
+
+from scraper.browser_pool import BrowserPool
+from scraper.http_fetcher import BloqueadoError, HttpFetcher
+from scraper.proxies import BaldeTokens, PoolProxies, proxy_de_url
+from scripts.loja_fake import LojaFake, ProxyFake
+
+
+class Relogio:
+    """Relógio manual: dormir() avança o tempo em vez de esperar."""
+
+    def __init__(self):
+        self.agora = 0.0
+        self.dormido = []
+
+    def __call__(self):
+        return self.agora
+
+    def dormir(self, segundos):
+        self.dormido.append(segundos)
+        self.agora += segundos
+
+
+def _pool(urls, relogio, **kwargs):
+    kwargs.setdefault("taxa_por_proxy", 0)
+    kwargs.setdefault("taxa_por_dominio", 0)
+    return PoolProxies(urls, semente=1, relogio=relogio, dormir=relogio.dormir, **kwargs)
+
+
+class TestBaldeTokens:
+    """Testes para o token bucket."""
+
+    def test_rajada_e_depois_ritmo(self):
+        """Verifica que a rajada sai sem espera e o resto na taxa configurada."""
+        relogio = Relogio()
+        balde = BaldeTokens(taxa=2.0, capacidade=2, relogio=relogio)
+
+        esperas = [balde.reservar() for _ in range(4)]
+
+        assert esperas == [0.0, 0.0, 0.5, 1.0]
+
+    def test_tokens_repostos_com_o_tempo(self):
+        """Verifica a reposição até a capacidade."""
+        relogio = Relogio()
+        balde = BaldeTokens(taxa=1.0, capacidade=1, relogio=relogio)
+        balde.reservar()
+
+        relogio.agora += 10
+
+        assert balde.reservar() == 0.0
+        assert balde.reservar() == 1.0
+
+
+class TestPoolProxies:
+    """Testes para a pontuação, o resfriamento e os limites do pool."""
+
+    def test_proxy_de_url(self):
+        """Verifica a conversão para o formato do Playwright, com e sem credenciais."""
+        assert proxy_de_url("http://u:s@10.0.0.1:3128") == {
+            "server": "http://10.0.0.1:3128", "username": "u", "password": "s"}
+        assert proxy_de_url("socks5://proxy") == {"server": "socks5://proxy"}
+
+    def test_lista_vazia(self):
+        """Verifica erro sem proxies."""
+        with pytest.raises(ValueError):
+            PoolProxies([])
+
+    def test_bloqueio_resfria_e_escolha_evita(self):
+        """Verifica que um proxy bloqueado sai de circulação até o resfriamento vencer."""
+        relogio = Relogio()
+        pool = _pool(["http://a:1", "http://b:2"], relogio, resfriamento_s=60)
+        a, b = pool.proxies
+
+        pool.registrar(a, False, bloqueado=True)
+
+        assert pool.disponiveis() == [b]
+        assert {pool.escolher() for _ in range(20)} == {b}
+        relogio.agora += 61
+        assert a in pool.disponiveis()
+
+    def test_falhas_seguidas_resfriam_com_backoff(self):
+        """Verifica o resfriamento após N falhas e que ele dobra na reincidência."""
+        relogio = Relogio()
+        pool = _pool(["http://a:1"], relogio, falhas_para_resfriar=2, resfriamento_s=10)
+        a = pool.proxies[0]
+
+        pool.registrar(a, False)
+        assert not pool.resfriado(a)
+        pool.registrar(a, False)
+        assert a.resfriado_ate == 10
+
+        relogio.agora = 10
+        pool.registrar(a, False, bloqueado=True)
+        assert a.resfriado_ate == 30
+
+        pool.registrar(a, True, 0.1)
+        assert a.resfriamentos_seguidos == 0
+
+    def test_todos_resfriados_degrada_em_vez_de_parar(self):
+        """Verifica que, com todos resfriados, o pool entrega o que volta primeiro."""
+        relogio = Relogio()
+        pool = _pool(["http://a:1", "http://b:2"], relogio, resfriamento_s=60)
+        a, b = pool.proxies
+        pool.registrar(a, False, bloqueado=True)
+        relogio.agora += 30
+        pool.registrar(b, False, bloqueado=True)
+
+        assert pool.disponiveis() == []
+        assert pool.escolher() is a
+
+    def test_pontuacao_favorece_rapido_e_saudavel(self):
+        """Verifica que o sorteio manda mais tráfego para o proxy mais rápido."""
+        relogio = Relogio()
+        pool = _pool(["http://rapido:1", "http://lento:2"], relogio)
+        rapido, lento = pool.proxies
+        for _ in range(5):
+            pool.registrar(rapido, True, 0.1)
+            pool.registrar(lento, True, 3.0)
+
+        escolhas = [pool.escolher() for _ in range(400)]
+
+        assert escolhas.count(rapido) > 2 * escolhas.count(lento) > 0
+
+    def test_limite_por_dominio_soma_proxies(self):
+        """Verifica que o balde do domínio vale para todos os proxies juntos."""
+        relogio = Relogio()
+        pool = _pool(["http://a:1", "http://b:2"], relogio, taxa_por_dominio=1.0, rajada_por_dominio=1)
+        a, b = pool.proxies
+
+        pool.aguardar(a, "shopee.com.ar")
+        pool.aguardar(b, "shopee.com.ar")
+        pool.aguardar(b, "outra.com")
+
+        assert relogio.dormido == [1.0]
+
+    def test_limite_por_proxy(self):
+        """Verifica o balde de cada proxy."""
+        relogio = Relogio()
+        pool = _pool(["http://a:1"], relogio, taxa_por_proxy=0.5, rajada_por_proxy=1)
+
+        pool.adquirir("x.com")
+        pool.adquirir("y.com")
+
+        assert relogio.dormido == [2.0]
+
+
+class TestProxiesLocais:
+    """Testes com a loja fake atrás de proxies locais."""
+
+    def test_http_contorna_proxy_bloqueado(self):
+        """Verifica que a vazão continua com um dos dois proxies banido."""
+        with LojaFake(produtos=6) as loja, ProxyFake(bloquear=True) as banido, ProxyFake() as bom:
+            pool = PoolProxies([banido.url, bom.url], taxa_por_proxy=0, taxa_por_dominio=0, semente=0)
+            fetcher = HttpFetcher(base_url=loja.url, proxies=pool)
+
+            resultados = [fetcher.buscar_produto(f"{loja.url}/product/1/{n}") for n in range(1, 7)]
+
+        assert all(r and r["nome"] == f"Produto de teste {n}" for n, r in enumerate(resultados, 1))
+        assert banido.requisicoes == 1
+        assert pool.resfriado(pool.proxies[0])
+        assert bom.requisicoes == 6
+
+    def test_todos_bloqueados_levanta_bloqueio(self):
+        """Verifica que BloqueadoError só aparece quando nenhum proxy passa."""
+        with LojaFake(produtos=1) as loja, ProxyFake(bloquear=True) as p1, ProxyFake(bloquear=True) as p2:
+            pool = PoolProxies([p1.url, p2.url], taxa_por_proxy=0, taxa_por_dominio=0)
+            fetcher = HttpFetcher(base_url=loja.url, proxies=pool)
+
+            with pytest.raises(BloqueadoError):
+                fetcher.buscar_api(f"{loja.url}/product/1/1")
+
+        assert p1.requisicoes == p2.requisicoes == 1
+
+
+class TestBrowserPoolComProxies:
+    """Testes para o proxy por contexto no BrowserPool."""
+
+    def _pool(self):
+        relogio = Relogio()
+        proxies = _pool(["http://a:1", "http://b:2"], relogio)
+        browser = Mock(is_connected=Mock(return_value=True))
+        browser.new_context = Mock(side_effect=lambda **kwargs: Mock(proxy=kwargs.get("proxy")))
+        p = Mock()
+        p.firefox.launch = Mock(return_value=browser)
+        pool = BrowserPool(max_rss_mb=0, proxies=proxies)
+        pool.iniciar(p)
+        return pool, proxies, browser
+
+    def test_contexto_sai_pelo_proxy_do_slot(self):
+        """Verifica que o contexto é criado com o proxy escolhido e sem proxy no launch."""
+        pool, proxies, _ = self._pool()
+
+        context = pool.checkout()
+
+        assert context.proxy == pool._slots[0].proxy.playwright
+        assert "proxy" not in pool._p.firefox.launch.call_args.kwargs
+
+    def test_proxy_bloqueado_troca_contexto_sem_relancar(self):
+        """Verifica a rotação do contexto quando o proxy do slot entra em resfriamento."""
+        pool, proxies, browser = self._pool()
+        context = pool.checkout()
+        page = Mock(context=context)
+        usado = pool._slots[0].proxy
+
+        pool.reportar(page, False, bloqueado=True)
+        pool.devolver(context)
+
+        novo = pool.checkout()
+        assert novo is not context
+        context.close.assert_called_once()
+        assert pool._slots[0].proxy is not usado
+        assert novo.proxy == pool._slots[0].proxy.playwright
+        assert pool._p.firefox.launch.call_count == 1
+
+    def test_limitar_usa_dominio_da_url(self):
+        """Verifica que limitar repassa o proxy do slot e o domínio."""
+        pool, proxies, _ = self._pool()
+        context = pool.checkout()
+        proxies.aguardar = Mock(return_value=0.0)
+
+        pool.limitar(Mock(context=context), "https://shopee.com.ar/produto-i.1.2")
+
+        proxies.aguardar.assert_called_once_with(pool._slots[0].proxy, "shopee.com.ar")
@@ -0,0 +1,182 @@
+from unittest.mock import Mock
+
+import pytest
+import requests
+
+from scraper.http_fetcher import BloqueadoError
+from scraper.metricas import METRICAS
+from scraper.resiliencia import (
+    Disjuntor, PaginaBloqueada, Prazo, PrazoEsgotado, SeletorAusente, classificar_erro, repetir,
+)
+from scraper.shopee_scraper import ShopeeScraper
+
+
+class TimeoutError(Exception):
+    """Mesmo nome do TimeoutError do Playwright."""
+
+
+class Relogio:
+    """Relógio manual: dormir() avança o tempo em vez de esperar."""
+
+    def __init__(self):
+        self.agora = 0.0
+        self.dormido = []
+
+    def __call__(self):
+        return self.agora
+
+    def dormir(self, segundos):
+        self.dormido.append(segundos)
+        self.agora += segundos
+
+
+class TestClassificacao:
+    """Testes para a classificação dos erros."""
+
+    def test_classes(self):
+        """Verifica timeout, bloqueio, seletor, navegação e o resto."""
+        assert classificar_erro(TimeoutError("Timeout 5000ms exceeded")) == "timeout"
+        assert classificar_erro(requests.ReadTimeout()) == "timeout"
+        assert classificar_erro(PrazoEsgotado("x")) == "timeout"
+        assert classificar_erro(BloqueadoError("403")) == "bloqueado"
+        assert classificar_erro(PaginaBloqueada("429")) == "bloqueado"
+        assert classificar_erro(SeletorAusente("nome")) == "seletor"
+        assert classificar_erro(Exception("page.goto: NS_ERROR_CONNECTION_REFUSED")) == "navegacao"
+        assert classificar_erro(requests.ConnectionError()) == "navegacao"
+        assert classificar_erro(ValueError("outra coisa")) == "outro"
+
+
+class TestPrazo:
+    """Testes para o orçamento de tempo por produto."""
+
+    def test_fracao_do_restante_por_etapa(self):
+        """Verifica que cada etapa recebe no máximo sua fração do que resta."""
+        relogio = Relogio()
+        prazo = Prazo(40, relogio)
+
+        assert prazo.timeout_ms("goto", 60000) == 20000
+        assert prazo.timeout_ms("seletor", 2000) == 2000
+        relogio.agora = 38
+        assert prazo.timeout_ms("goto", 60000) == 1000
+
+    def test_prazo_esgotado(self):
+        """Verifica a exceção quando não resta tempo."""
+        relogio = Relogio()
+        prazo = Prazo(1, relogio)
+        relogio.agora = 1
+
+        with pytest.raises(PrazoEsgotado):
+            prazo.timeout_ms("goto", 60000)
+
+
+class TestRepetir:
+    """Testes para as novas tentativas com backoff."""
+
+    def test_repete_timeout_com_backoff_crescente(self):
+        """Verifica as esperas crescentes até o sucesso."""
+        relogio = Relogio()
+        funcao = Mock(side_effect=[TimeoutError("t"), TimeoutError("t"), "ok"])
+
+        resultado = repetir(funcao, tentativas=3, base_s=1, dormir=relogio.dormir)
+
+        assert resultado == "ok"
+        assert 0.5 <= relogio.dormido[0] <= 1 < relogio.dormido[1] <= 2
+
+    def test_bloqueio_nao_repete(self):
+        """Verifica que bloqueio sobe na primeira tentativa."""
+        funcao = Mock(side_effect=PaginaBloqueada("403"))
+
+        with pytest.raises(PaginaBloqueada):
+            repetir(funcao, tentativas=3, dormir=Mock())
+
+        assert funcao.call_count == 1
+
+    def test_nao_espera_alem_do_prazo(self):
+        """Verifica que não há nova tentativa se a espera passaria do prazo."""
+        relogio = Relogio()
+        funcao = Mock(side_effect=TimeoutError("t"))
+
+        with pytest.raises(TimeoutError):
+            repetir(funcao, tentativas=3, base_s=5, prazo=Prazo(2, relogio), dormir=relogio.dormir)
+
+        assert funcao.call_count == 1
+        assert relogio.dormido == []
+
+
+class TestDisjuntor:
+    """Testes para o circuit breaker por domínio."""
+
+    def _disjuntor(self, relogio):
+        return Disjuntor(janela=4, min_amostras=4, limiar=0.5, pausa_s=10, relogio=relogio, dormir=relogio.dormir)
+
+    def test_abre_com_taxa_de_erro_e_pausa(self):
+        """Verifica a abertura pela taxa de erro e a pausa do domínio."""
+        relogio = Relogio()
+        disjuntor = self._disjuntor(relogio)
+        for sucesso in (True, True, False):
+            disjuntor.registrar("a.com", sucesso)
+        assert not disjuntor.aberto("a.com")
+
+        disjuntor.registrar("a.com", False)
+
+        assert disjuntor.aberto("a.com")
+        assert not disjuntor.aberto("b.com")
+        assert disjuntor.aguardar("a.com") == 10
+        assert not disjuntor.aberto("a.com")
+
+    def test_teste_apos_pausa_fecha_ou_reabre_dobrado(self):
+        """Verifica o meio-aberto: falha reabre com pausa dobrada, sucesso fecha."""
+        relogio = Relogio()
+        disjuntor = self._disjuntor(relogio)
+        for _ in range(4):
+            disjuntor.registrar("a.com", False)
+        relogio.agora = 10
+
+        disjuntor.registrar("a.com", False)
+        assert disjuntor.pausa_restante("a.com") == 20
+
+        relogio.agora = 30
+        disjuntor.registrar("a.com", True)
+        disjuntor.registrar("a.com", False)
+        assert not disjuntor.aberto("a.com")
+
+
+class TestVisitaResiliente:
+    """Testes para o prazo, as tentativas e o disjuntor no ShopeeScraper."""
+
+    def _scraper(self):
+        scraper = ShopeeScraper()
+        scraper._aguardar = Mock()
+        scraper._extrair_dados = Mock(return_value={"nome": "Fone", "preco": "$ 10", "link": "x"})
+        scraper.disjuntor = Mock()
+        return scraper
+
+    def test_timeout_no_goto_tenta_de_novo(self, monkeypatch):
+        """Verifica a nova tentativa depois de um timeout e o timeout limitado pelo prazo."""
+        monkeypatch.setattr("scraper.resiliencia.time.sleep", Mock())
+        scraper = self._scraper()
+        page = Mock()
+        page.goto.side_effect = [TimeoutError("Timeout 20000ms exceeded"), Mock(status=200)]
+        antes = METRICAS.contador("retentativas_total", etapa="produto", tipo="timeout")
+
+        dados = scraper._visitar_produto(page, "https://shopee.com.ar/p-i.1.2")
+
+        assert dados["nome"] == "Fone"
+        assert page.goto.call_count == 2
+        assert page.goto.call_args.kwargs["timeout"] <= scraper.prazo_produto_s * 1000 / 2
+        assert METRICAS.contador("retentativas_total", etapa="produto", tipo="timeout") == antes + 1
+        scraper.disjuntor.registrar.assert_called_once_with("shopee.com.ar", True)
+        assert scraper._prazo is None
+
+    def test_bloqueio_falha_sem_nova_tentativa(self):
+        """Verifica que página bloqueada devolve None e conta no disjuntor."""
+        scraper = self._scraper()
+        page = Mock()
+        page.goto.return_value = Mock(status=403)
+
+        assert scraper._visitar_produto(page, "https://shopee.com.ar/p-i.1.2") is None
+
+        assert page.goto.call_count == 1
+        scraper._extrair_dados.assert_not_called()
+        scraper.disjuntor.aguardar.assert_called_once_with("shopee.com.ar")
+        scraper.disjuntor.registrar.assert_called_once_with("shopee.com.ar", False)
@@ -0,0 +1,105 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from scraper.screenshots import ScreenshotManager
+
+
+class TestScreenshotManager:
+    """Testes para o subsistema de screenshots."""
+
+    def test_desligado_nao_captura(self, tmp_path):
+        """Verifica que o modo desligado não toca na página."""
+        mock_page = Mock()
+        manager = ScreenshotManager(modo="desligado", diretorio=str(tmp_path))
+
+        assert manager.capturar(mock_page) is None
+        assert not mock_page.screenshot.called
+
+    def test_nome_por_hash_e_dedupe(self, tmp_path):
+        """Verifica nome pelo conteúdo e que capturas iguais não são regravadas."""
+        mock_page = Mock()
+        mock_page.screenshot = Mock(return_value=b"imagem")
+        manager = ScreenshotManager(modo="viewport", diretorio=str(tmp_path))
+
+        primeiro = manager.capturar(mock_page).result()
+        segundo = manager.capturar(mock_page).result()
+        manager.fechar()
+
+        assert primeiro == segundo
+        assert primeiro.endswith(".png")
+        assert manager.salvos == 1 and manager.duplicados == 1
+        mock_page.screenshot.assert_called_with(full_page=False, type="png")
+
+    def test_jpeg_com_qualidade_e_pagina_completa(self, tmp_path):
+        """Verifica as opções de captura repassadas ao Playwright."""
+        mock_page = Mock()
+        mock_page.screenshot = Mock(return_value=b"jpeg")
+        manager = ScreenshotManager(modo="completa", formato="jpeg", qualidade=60, diretorio=str(tmp_path))
+
+        caminho = manager.capturar(mock_page).result()
+
+        assert caminho.endswith(".jpg")
+        mock_page.screenshot.assert_called_once_with(full_page=True, type="jpeg", quality=60)
+
+    def test_elemento_cai_para_viewport(self, tmp_path):
+        """Verifica o recorte do elemento e o fallback quando ele não existe."""
+        mock_page = Mock()
+        mock_page.locator.return_value.count = Mock(return_value=1)
+        mock_page.locator.return_value.first.screenshot = Mock(side_effect=Exception("Timeout"))
+        mock_page.screenshot = Mock(return_value=b"viewport")
+        manager = ScreenshotManager(modo="elemento", diretorio=str(tmp_path))
+
+        manager.capturar(mock_page, ["div.product-briefing", "main"]).result()
+
+        assert [c.args[0] for c in mock_page.locator.call_args_list] == ["div.product-briefing", "main"]
+        mock_page.screenshot.assert_called_once_with(full_page=False, type="png")
+
+    def test_elemento_respeita_a_prioridade(self, tmp_path):
+        """Verifica que o seletor preferido vence mesmo aninhado dentro do fallback."""
+        # no documento, <main> vem antes do div.product-briefing que está dentro dele
+        alvos = {"div.product-briefing": Mock(), "main": Mock()}
+        alvos["div.product-briefing"].count = Mock(return_value=1)
+        alvos["div.product-briefing"].first.screenshot = Mock(return_value=b"produto")
+        alvos["main"].count = Mock(return_value=1)
+        mock_page = Mock()
+        mock_page.locator = Mock(side_effect=alvos.get)
+        manager = ScreenshotManager(modo="elemento", diretorio=str(tmp_path))
+
+        manager.capturar(mock_page, ["div.product-briefing", "main"]).result()
+
+        alvos["div.product-briefing"].first.screenshot.assert_called_once()
+        assert not alvos["main"].first.screenshot.called
+        assert not mock_page.screenshot.called
+
+    def test_elemento_async_pula_seletor_ausente(self, tmp_path):
+        """Verifica que, no modo assíncrono, um seletor sem elementos cede ao próximo."""
+        alvos = {"div.product-briefing": Mock(), "main": Mock()}
+        alvos["div.product-briefing"].count = AsyncMock(return_value=0)
+        alvos["main"].count = AsyncMock(return_value=1)
+        alvos["main"].first.screenshot = AsyncMock(return_value=b"main")
+        mock_page = Mock()
+        mock_page.locator = Mock(side_effect=alvos.get)
+        mock_page.screenshot = AsyncMock()
+        manager = ScreenshotManager(modo="elemento", diretorio=str(tmp_path))
+
+        asyncio.run(manager.capturar_async(mock_page, ["div.product-briefing", "main"])).result()
+
+        alvos["main"].first.screenshot.assert_awaited_once()
+        assert not mock_page.screenshot.called
+
+    def test_captura_async(self, tmp_path):
+        """Verifica a captura com a API assíncrona."""
+        mock_page = Mock()
+        mock_page.screenshot = AsyncMock(return_value=b"async")
+        manager = ScreenshotManager(modo="viewport", diretorio=str(tmp_path))
+
+        futuro = asyncio.run(manager.capturar_async(mock_page))
+
+        assert futuro.result().startswith(str(tmp_path))
+
+    def test_modo_invalido(self):
+        """Verifica a validação de modo."""
+        with pytest.raises(ValueError):
+            ScreenshotManager(modo="tela-cheia")
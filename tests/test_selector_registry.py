@@ -0,0 +1,68 @@
+import json
+from unittest.mock import Mock
+
+from scraper.selector_registry import SelectorRegistry
+from scraper.shopee_scraper import ShopeeScraper
+
+
+class TestSelectorRegistry:
+    """Testes para o registro adaptativo de seletores."""
+
+    def test_vencedor_recente_vai_para_frente(self, tmp_path):
+        """Verifica que a cascata é reordenada pelo seletor que está acertando."""
+        registro = SelectorRegistry(str(tmp_path / "s.json"))
+        for _ in range(3):
+            registro.registrar_cascata("preco", ["div.pmmxKx", "div[class*='price']"], "div[class*='price']")
+
+        ordem = registro.ordenar("preco", ["div.pmmxKx", "div[class*='price']", "div.price"])
+
+        assert ordem[0] == "div[class*='price']"
+        assert ordem[-1] == "div.pmmxKx"
+
+    def test_sem_historico_mantem_ordem_original(self, tmp_path):
+        """Verifica que seletores desconhecidos preservam a ordem original."""
+        registro = SelectorRegistry(str(tmp_path / "s.json"))
+
+        assert registro.ordenar("nome", ["a", "b", "c"]) == ["a", "b", "c"]
+
+    def test_obsoletos_apos_erros_seguidos(self, tmp_path):
+        """Verifica que um seletor é sinalizado depois de limite_obsoleto erros seguidos."""
+        registro = SelectorRegistry(str(tmp_path / "s.json"), limite_obsoleto=3)
+        for _ in range(3):
+            registro.registrar_cascata("nome", ["span.qaNIZv", "h1"], "h1")
+
+        assert registro.obsoletos() == {"nome": ["span.qaNIZv"]}
+
+        registro.registrar("nome", "span.qaNIZv", True)
+        assert registro.obsoletos() == {}
+
+    def test_persistencia(self, tmp_path):
+        """Verifica que as estatísticas sobrevivem entre execuções."""
+        caminho = str(tmp_path / "s.json")
+        registro = SelectorRegistry(caminho)
+        registro.registrar("listagem", "a[href*='/product/']", True, 0.05)
+        registro.salvar()
+
+        novo = SelectorRegistry(caminho)
+
+        stat = novo.stats["listagem"]["a[href*='/product/']"]
+        assert stat["acertos"] == 1
+        assert stat["latencia_media_ms"] == 50.0
+        with open(caminho) as f:
+            assert "listagem" in json.load(f)
+
+    def test_scraper_registra_listagem(self, tmp_path):
+        """Verifica que _encontrar_produtos registra erros e o vencedor."""
+        scraper = ShopeeScraper()
+        scraper.registro_seletores = SelectorRegistry(str(tmp_path / "s.json"))
+        mock_page = Mock()
+        mock_page.locator = Mock(side_effect=lambda sel: Mock(all=Mock(
+            return_value=[Mock()] if sel == "div[data-sqe='item']" else []
+        )))
+
+        scraper._encontrar_produtos(mock_page)
+
+        stats = scraper.registro_seletores.stats["listagem"]
+        assert stats["a[href*='/product/']"]["erros"] == 1
+        assert stats["div[data-sqe='item']"]["acertos"] == 1
+        assert ".shop-search-result-view__item" not in stats
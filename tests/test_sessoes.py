@@ -0,0 +1,132 @@
+import os
+from unittest.mock import Mock
+
+from scraper.browser_pool import BrowserPool
+from scraper.sessoes import SEM_PROXY, ArmazemSessoes
+from scraper.shopee_scraper import ShopeeScraper
+
+
+ESTADO = {
+    "cookies": [
+        {"name": "SPC_F", "value": "a", "domain": ".shopee.com.ar", "expires": 2000.0},
+        {"name": "velho", "value": "b", "domain": ".shopee.com.ar", "expires": 500.0},
+        {"name": "sessao", "value": "c", "domain": ".shopee.com.ar", "expires": -1},
+    ],
+    "origins": [{"origin": "https://shopee.com.ar", "localStorage": [{"name": "regiao", "value": "AR"}]}],
+}
+
+
+class TestArmazemSessoes:
+    """Testes para o armazenamento de storage_state por identidade."""
+
+    def test_salvar_e_carregar_sem_cookies_vencidos(self, tmp_path):
+        """Verifica o ciclo salvar/carregar e a remoção de cookies vencidos."""
+        armazem = ArmazemSessoes(str(tmp_path))
+        armazem.salvar("10.0.0.1:3128", ESTADO, agora=1000)
+
+        estado = armazem.carregar("10.0.0.1:3128", agora=1000)
+
+        assert [c["name"] for c in estado["cookies"]] == ["SPC_F", "sessao"]
+        assert estado["origins"] == ESTADO["origins"]
+        assert os.listdir(tmp_path) == ["10.0.0.1_3128.json"]
+
+    def test_sessao_vencida_e_apagada(self, tmp_path):
+        """Verifica que a validade conta desde a criação, mesmo com regravações."""
+        armazem = ArmazemSessoes(str(tmp_path), validade_s=100)
+        armazem.salvar(SEM_PROXY, ESTADO, agora=0)
+        armazem.salvar(SEM_PROXY, ESTADO, agora=90)
+
+        assert armazem.carregar(SEM_PROXY, agora=99) is not None
+        assert armazem.carregar(SEM_PROXY, agora=101) is None
+        assert os.listdir(tmp_path) == []
+
+    def test_renovacao_respeita_intervalo(self, tmp_path):
+        """Verifica que a sessão só é regravada depois de renovar_s."""
+        armazem = ArmazemSessoes(str(tmp_path), renovar_s=60)
+
+        assert armazem.precisa_salvar("p", agora=0)
+        armazem.salvar("p", ESTADO, agora=0)
+        assert not armazem.precisa_salvar("p", agora=59)
+        assert armazem.precisa_salvar("p", agora=60)
+
+    def test_compartilhada_entre_processos(self, tmp_path):
+        """Verifica que uma sessão gravada por um worker é carregada por outro."""
+        ArmazemSessoes(str(tmp_path)).salvar("proxy:1", ESTADO, agora=1000)
+
+        outro = ArmazemSessoes(str(tmp_path))
+
+        assert outro.carregar("proxy:1", agora=1000) is not None
+        assert outro.precisa_salvar("proxy:1", agora=1000)
+
+    def test_descartar_e_arquivo_corrompido(self, tmp_path):
+        """Verifica o descarte e que arquivo inválido vale como sessão ausente."""
+        armazem = ArmazemSessoes(str(tmp_path))
+        armazem.salvar("p", ESTADO)
+        armazem.descartar("p")
+        armazem.descartar("p")
+        (tmp_path / "q.json").write_text("{quebrado")
+
+        assert armazem.carregar("p") is None
+        assert armazem.carregar("q") is None
+        assert armazem.descartadas == 1
+
+
+class TestBrowserPoolComSessoes:
+    """Testes para o uso das sessões pelo BrowserPool."""
+
+    def _pool(self, armazem):
+        browser = Mock(is_connected=Mock(return_value=True))
+        browser.new_context = Mock(side_effect=lambda **kwargs: Mock(
+            args=kwargs, storage_state=Mock(return_value=ESTADO)))
+        p = Mock()
+        p.firefox.launch = Mock(return_value=browser)
+        pool = BrowserPool(max_rss_mb=0, sessoes=armazem)
+        pool.iniciar(p)
+        return pool
+
+    def test_contexto_nasce_com_sessao_salva(self, tmp_path):
+        """Verifica que o contexto recebe o storage_state da identidade."""
+        armazem = ArmazemSessoes(str(tmp_path))
+        armazem.salvar(SEM_PROXY, ESTADO)
+
+        pool = self._pool(armazem)
+
+        assert pool.checkout().args["storage_state"]["origins"] == ESTADO["origins"]
+
+    def test_devolucao_grava_sessao_aquecida(self, tmp_path):
+        """Verifica que a primeira devolução grava a sessão e as seguintes respeitam a renovação."""
+        armazem = ArmazemSessoes(str(tmp_path))
+        pool = self._pool(armazem)
+        context = pool.checkout()
+        assert "storage_state" not in context.args
+
+        pool.devolver(context)
+        pool.devolver(pool.checkout())
+
+        context.storage_state.assert_called_once()
+        assert armazem.carregar(SEM_PROXY) is not None
+
+    def test_bloqueio_descarta_sessao_e_troca_contexto(self, tmp_path):
+        """Verifica que um contexto bloqueado não grava, apaga a sessão e é trocado."""
+        armazem = ArmazemSessoes(str(tmp_path))
+        armazem.salvar(SEM_PROXY, ESTADO)
+        pool = self._pool(armazem)
+        context = pool.checkout()
+
+        pool.reportar(Mock(context=context), False, bloqueado=True)
+        pool.devolver(context)
+
+        context.storage_state.assert_not_called()
+        context.close.assert_called_once()
+        novo = pool.checkout()
+        assert novo is not context
+        assert "storage_state" not in novo.args
+
+    def test_scraper_usa_storage_state_path(self, tmp_path):
+        """Verifica que storage_state_path liga o armazém no pool do scraper."""
+        scraper = ShopeeScraper()
+        assert scraper.criar_pool().sessoes is None
+
+        scraper.storage_state_path = str(tmp_path / "sessoes")
+
+        assert scraper.criar_pool().sessoes.diretorio == str(tmp_path / "sessoes")
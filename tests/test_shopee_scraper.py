@@ -1,6 +1,6 @@
 import pytest
 from unittest.mock import Mock
-from scraper.shopee_scraper import ShopeeScraper, human_pause, human_scroll
+from scraper.shopee_scraper import ShopeeScraper, dedupe_links, human_pause, human_scroll
 
 
 class TestHumanHelpers:
@@ -55,3 +55,89 @@ class TestShopeeScraper:
         result = scraper._close_overlay_if_present(mock_page)
         
         assert result is True
+
+
+class TestBatchMode:
+    """Testes para o modo em lote (scrape_produtos)."""
+
+    def test_dedupe_links_resolve_relativos_e_remove_repetidos(self):
+        """Verifica que hrefs relativos viram absolutos e duplicados são removidos."""
+        hrefs = [
+            "/product/1/10",
+            "https://shopee.com.ar/product/1/10",
+            "/product/1/11#reviews",
+            "/product/1/11",
+            "",
+            None,
+        ]
+
+        links = dedupe_links(hrefs, base_url="https://shopee.com.ar/loja")
+
+        assert links == [
+            "https://shopee.com.ar/product/1/10",
+            "https://shopee.com.ar/product/1/11",
+        ]
+
+    def test_coletar_links_ignora_erros_de_atributo(self):
+        """Verifica que _coletar_links pula produtos cujo href não pode ser lido."""
+        scraper = ShopeeScraper()
+        mock_page = Mock()
+        mock_page.url = "https://shopee.com.ar/loja"
+
+        ok = Mock()
+        ok.evaluate = Mock(return_value="/product/1/10")
+        quebrado = Mock()
+        quebrado.evaluate = Mock(side_effect=Exception("detached"))
+
+        links = scraper._coletar_links(mock_page, [ok, quebrado, ok])
+
+        assert links == ["https://shopee.com.ar/product/1/10"]
+
+    def test_coletar_links_de_cards_sem_href(self):
+        """Verifica que cards em div (sem href próprio) usam o link mais próximo."""
+        scraper = ShopeeScraper()
+        mock_page = Mock()
+        mock_page.url = "https://shopee.com.ar/loja"
+        card = Mock()
+        card.get_attribute = Mock(return_value=None)
+        card.evaluate = Mock(return_value="/product/1/12")
+
+        links = scraper._coletar_links(mock_page, [card])
+
+        assert links == ["https://shopee.com.ar/product/1/12"]
+        assert "closest('a[href]')" in card.evaluate.call_args.args[0]
+
+
+class TestPoolIntegration:
+    """Testes para o uso do BrowserPool pelo ShopeeScraper."""
+
+    def test_criar_pool_usa_configuracao_da_shopee(self):
+        """Verifica que o pool recebe contexto argentino, script e proxy do scraper."""
+        scraper = ShopeeScraper()
+        scraper.proxy = {"server": "http://proxy:8080"}
+
+        pool = scraper.criar_pool(tamanho=2)
+
+        assert pool.tamanho == 2
+        assert pool.proxy == {"server": "http://proxy:8080"}
+        assert pool.context_args["locale"] == "es-AR"
+        assert "webdriver" in pool.init_script
+
+    def test_visita_reporta_bloqueio_ao_pool(self):
+        """Verifica que a página de produto limita a taxa e reporta o status ao proxy do contexto."""
+        scraper = ShopeeScraper()
+        scraper.proxies = Mock()
+        pool = scraper.criar_pool()
+        assert pool.proxies is scraper.proxies
+        pool = Mock()
+        page = Mock()
+        page.goto.return_value = Mock(status=429)
+        scraper._pool_ativo = pool
+        scraper._aguardar = Mock()
+        scraper._extrair_dados = Mock(return_value={})
+
+        scraper._visitar_produto(page, "https://shopee.com.ar/p-i.1.2")
+
+        pool.limitar.assert_called_once_with(page, "https://shopee.com.ar/p-i.1.2")
+        args, _ = pool.reportar.call_args
+        assert args[0] is page and args[1] is False and args[3] is True
@@ -0,0 +1,184 @@
+import csv
+import json
+import sqlite3
+import threading
+
+import pytest
+
+from scraper.sinks import CsvSink, JsonlSink, SqliteSink, _LockArquivo, criar_sink, ler_resultados, mesclar_jsonl
+
+
+def _produto(n, preco="$ 10"):
+    return {"nome": f"Produto {n}", "preco": preco, "link": f"https://shopee.com.ar/product/1/{n}"}
+
+
+class TestSinks:
+    """Testes para os destinos de saída em lote."""
+
+    def test_csv_cabecalho_uma_vez_e_lote(self, tmp_path):
+        """Verifica cabeçalho só no arquivo novo e gravação apenas ao encher o lote."""
+        caminho = tmp_path / "p.csv"
+        sink = CsvSink(str(caminho), tamanho_lote=2, intervalo_s=3600)
+
+        sink.escrever(_produto(1))
+        assert not caminho.exists()
+        sink.escrever(_produto(2))
+        sink.escrever(_produto(3))
+        sink.fechar()
+
+        with open(caminho, newline="", encoding="utf-8") as f:
+            linhas = list(csv.reader(f))
+        assert linhas[0] == ["nome", "preco", "link"]
+        assert [l[0] for l in linhas[1:]] == ["Produto 1", "Produto 2", "Produto 3"]
+
+    def test_csv_sem_cabecalho_em_arquivo_existente(self, tmp_path):
+        """Verifica que um produtos.csv legado (sem cabeçalho) não ganha cabeçalho no meio."""
+        caminho = tmp_path / "p.csv"
+        caminho.write_text("Antigo,$ 1,https://x\n", encoding="utf-8")
+
+        with CsvSink(str(caminho)) as sink:
+            sink.escrever(_produto(1))
+
+        assert caminho.read_text(encoding="utf-8").count("nome,preco,link") == 0
+
+    def test_csv_cabecalho_decidido_depois_do_lock(self, tmp_path, monkeypatch):
+        """Verifica que o worker que esperou o lock não repete o cabeçalho de quem criou o arquivo."""
+        caminho = str(tmp_path / "p.csv")
+        primeiro, segundo = CsvSink(caminho), CsvSink(caminho)
+        entrar = _LockArquivo.__enter__
+        esperando = [True]
+
+        def entrar_depois_do_outro(lock):
+            # enquanto este worker espera o lock, o outro cria o arquivo com cabeçalho
+            if esperando:
+                esperando.pop()
+                segundo.escrever(_produto(2))
+                segundo.flush()
+            return entrar(lock)
+
+        monkeypatch.setattr(_LockArquivo, "__enter__", entrar_depois_do_outro)
+        primeiro.escrever(_produto(1))
+        primeiro.flush()
+
+        with open(caminho, newline="", encoding="utf-8") as f:
+            linhas = list(csv.reader(f))
+        assert [l[0] for l in linhas] == ["nome", "Produto 2", "Produto 1"]
+
+    def test_jsonl_dedupe_no_lote_e_timestamp(self, tmp_path):
+        """Verifica que o mesmo link no lote vira uma linha e recebe coletado_em."""
+        caminho = tmp_path / "p.jsonl"
+        with JsonlSink(str(caminho), intervalo_s=3600) as sink:
+            sink.escrever(_produto(1, "$ 10"))
+            sink.escrever(_produto(1, "$ 12"))
+
+        linhas = [json.loads(l) for l in caminho.read_text(encoding="utf-8").splitlines()]
+        assert len(linhas) == 1
+        assert linhas[0]["preco"] == "$ 12"
+        assert "coletado_em" in linhas[0]
+
+    def test_lote_fica_no_buffer_se_a_gravacao_falhar(self, tmp_path, monkeypatch):
+        """Verifica que um erro de gravação não perde o lote e o próximo flush o grava."""
+        caminho = tmp_path / "p.jsonl"
+        sink = JsonlSink(str(caminho), tamanho_lote=2, intervalo_s=3600)
+        gravar = sink._gravar
+        falhas = [OSError("disco cheio")]
+
+        def gravar_falhando(linhas):
+            if falhas:
+                raise falhas.pop()
+            gravar(linhas)
+
+        monkeypatch.setattr(sink, "_gravar", gravar_falhando)
+        sink.escrever(_produto(1))
+        with pytest.raises(OSError):
+            sink.escrever(_produto(2))
+        sink.escrever(_produto(3))
+        sink.fechar()
+
+        nomes = [json.loads(l)["nome"] for l in caminho.read_text(encoding="utf-8").splitlines()]
+        assert nomes == ["Produto 1", "Produto 2", "Produto 3"]
+        assert sink.gravadas == 3
+
+    def test_sqlite_upsert_por_link(self, tmp_path):
+        """Verifica o modo WAL e o upsert pelo link entre lotes."""
+        caminho = str(tmp_path / "p.db")
+        with SqliteSink(caminho, tamanho_lote=1) as sink:
+            sink.escrever(_produto(1, "$ 10"))
+            sink.escrever({**_produto(1, "$ 8"), "estoque": 3})
+
+        conn = sqlite3.connect(caminho)
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        linhas = conn.execute("SELECT preco, extras FROM produtos").fetchall()
+        assert linhas == [("$ 8", '{"estoque": 3}')]
+
+    def test_escrita_concorrente(self, tmp_path):
+        """Verifica que várias threads escrevendo não perdem linhas."""
+        caminho = tmp_path / "p.jsonl"
+        sink = JsonlSink(str(caminho), tamanho_lote=7)
+
+        def trabalhar(base):
+            for n in range(50):
+                sink.escrever(_produto(base * 100 + n))
+
+        threads = [threading.Thread(target=trabalhar, args=(t,)) for t in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        sink.fechar()
+
+        assert len(caminho.read_text(encoding="utf-8").splitlines()) == 200
+
+    def test_criar_sink_por_extensao(self, tmp_path):
+        """Verifica a escolha do sink pela extensão."""
+        assert isinstance(criar_sink(str(tmp_path / "a.csv")), CsvSink)
+        assert isinstance(criar_sink(str(tmp_path / "a.jsonl")), JsonlSink)
+        sink = criar_sink(str(tmp_path / "a.db"))
+        assert isinstance(sink, SqliteSink)
+        sink.fechar()
+        with pytest.raises(ValueError):
+            criar_sink(str(tmp_path / "a.xlsx"))
+
+    def test_parquet(self, tmp_path):
+        """Verifica o sink Parquet quando pyarrow está instalado."""
+        pq = pytest.importorskip("pyarrow.parquet")
+        diretorio = tmp_path / "pq.parquet"
+        with criar_sink(str(diretorio)) as sink:
+            sink.escrever(_produto(1))
+
+        partes = list(diretorio.iterdir())
+        assert len(partes) == 1
+        assert pq.read_table(str(partes[0])).column("nome").to_pylist() == ["Produto 1"]
+
+    def test_mesclar_partes_jsonl(self, tmp_path):
+        """Verifica que a mescla das partes mantém a linha mais recente de cada link."""
+        parte1 = tmp_path / "parte-a.jsonl"
+        parte2 = tmp_path / "parte-b.jsonl"
+        parte1.write_text(json.dumps(dict(_produto(1, "$ 10"), coletado_em="2024-01-01T00:00:00")) + "\n"
+                          + json.dumps(_produto(2)) + "\n{cortad", encoding="utf-8")
+        parte2.write_text(json.dumps(dict(_produto(1, "$ 12"), coletado_em="2024-01-02T00:00:00")) + "\n",
+                          encoding="utf-8")
+        caminho = str(tmp_path / "final.db")
+
+        with SqliteSink(caminho) as destino:
+            total = mesclar_jsonl([str(parte1), str(parte2)], destino)
+
+        assert total == 2
+        conn = sqlite3.connect(caminho)
+        assert conn.execute("SELECT preco FROM produtos WHERE link LIKE '%/1'").fetchone()[0] == "$ 12"
+
+    def test_ler_resultados_de_volta(self, tmp_path):
+        """Verifica a leitura do que cada sink gravou, com extras e CSV legado."""
+        with criar_sink(str(tmp_path / "p.db")) as sink:
+            sink.escrever(dict(_produto(1), estoque=3))
+        with criar_sink(str(tmp_path / "p.jsonl")) as sink:
+            sink.escrever(_produto(2))
+        (tmp_path / "legado.csv").write_text("Produto 3,$ 10,https://shopee.com.ar/product/1/3\n", encoding="utf-8")
+
+        banco = list(ler_resultados(str(tmp_path / "p.db")))
+        jsonl = list(ler_resultados(str(tmp_path / "p.jsonl")))
+        legado = list(ler_resultados(str(tmp_path / "legado.csv")))
+
+        assert banco[0]["estoque"] == 3 and banco[0]["nome"] == "Produto 1"
+        assert jsonl[0]["link"].endswith("/2") and jsonl[0]["coletado_em"]
+        assert legado[0]["nome"] == "Produto 3" and legado[0]["coletado_em"]
@@ -0,0 +1,76 @@
+from unittest.mock import Mock
+
+from scraper.shopee_scraper import ShopeeScraper
+from scraper.waits import esperar_rede_ociosa, esperar_seletores, espera_inteligente
+
+
+class TestWaits:
+    """Testes para as esperas baseadas em sinais da página."""
+
+    def test_esperar_seletores_usa_uma_unica_espera(self):
+        """Verifica que os seletores são esperados juntos numa única chamada."""
+        mock_page = Mock()
+
+        assert esperar_seletores(mock_page, ["h1", "div.price"], "visible", 1000) is True
+
+        mock_page.locator.assert_called_once_with("h1:visible, div.price:visible")
+        mock_page.locator.return_value.first.wait_for.assert_called_once_with(state="visible", timeout=1000)
+
+    def test_esperar_seletores_attached_sem_filtro(self):
+        """Verifica que só a espera por visibilidade descarta os nós ocultos."""
+        mock_page = Mock()
+
+        esperar_seletores(mock_page, ["h1"], "attached", 1000)
+
+        mock_page.locator.assert_called_once_with("h1")
+
+    def test_esperar_seletores_timeout(self):
+        """Verifica que timeout vira False em vez de exceção."""
+        mock_page = Mock()
+        mock_page.locator.return_value.first.wait_for = Mock(side_effect=Exception("Timeout"))
+
+        assert esperar_seletores(mock_page, ["h1"]) is False
+
+    def test_esperar_rede_ociosa_respeita_limite(self):
+        """Verifica que networkidle é esperado com o limite configurado."""
+        mock_page = Mock()
+        mock_page.wait_for_load_state = Mock(side_effect=Exception("Timeout"))
+
+        assert esperar_rede_ociosa(mock_page, limite_ms=500) is False
+        mock_page.wait_for_load_state.assert_called_once_with("networkidle", timeout=500)
+
+    def test_espera_inteligente_sem_rede(self):
+        """Verifica que limite_rede_ms=0 pula a espera por networkidle."""
+        mock_page = Mock()
+
+        espera_inteligente(mock_page, ["h1"], limite_rede_ms=0)
+
+        assert not mock_page.wait_for_load_state.called
+
+
+class TestEsperaInteligenteScraper:
+    """Testes para o modo espera inteligente do ShopeeScraper."""
+
+    def test_aguardar_usa_jitter_no_lugar_da_pausa_fixa(self, monkeypatch):
+        """Verifica que, no modo inteligente, a pausa longa vira jitter."""
+        pausas = []
+        monkeypatch.setattr("scraper.shopee_scraper.human_pause", lambda a, b: pausas.append((a, b)))
+        scraper = ShopeeScraper()
+        scraper.espera_inteligente = True
+        scraper.jitter = (0.01, 0.02)
+
+        scraper._aguardar(Mock(), ["h1"], "visible", 3, 5)
+        scraper._pausa(1, 2)
+
+        assert pausas == [(0.01, 0.02), (0.01, 0.02)]
+
+    def test_aguardar_modo_padrao_mantem_pausa_fixa(self, monkeypatch):
+        """Verifica que sem o modo inteligente a pausa original é mantida."""
+        pausas = []
+        monkeypatch.setattr("scraper.shopee_scraper.human_pause", lambda a, b: pausas.append((a, b)))
+        mock_page = Mock()
+
+        ShopeeScraper()._aguardar(mock_page, ["h1"], "visible", 3, 5)
+
+        assert pausas == [(3, 5)]
+        assert not mock_page.locator.called